@@ -0,0 +1,20 @@
+"""
+Development server for the Flask app. Run from the backend directory:
+
+    python -m app
+
+The app is wired up when app.main is imported. Keeping that import out of
+the __main__ module matters: extraction workers spawned on Python 3.11+
+import __main__ again, and would otherwise rebuild the whole app.
+"""
+
+from app.main import analyzer_warm_up, app
+
+
+def main() -> None:
+    analyzer_warm_up.run()
+    app.run(host="0.0.0.0", port=8000, debug=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,794 @@
+"""
+ASGI entry point serving the API from an event loop.
+
+Run from the backend directory with any ASGI server, e.g.:
+
+    uvicorn app.asgi:app --host 0.0.0.0 --port 8000
+    gunicorn app.asgi:app -k uvicorn.workers.UvicornWorker --preload
+
+Uploads are parsed as their bytes arrive, and extraction and matching run
+on a bounded thread pool (extraction itself in the extraction process pool
+when it is enabled), so slow clients and large documents never block
+/health, /skills or /analyze. Routes without an async handler here are
+served by the Flask app on a thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+from .main import (
+    ANALYZE_ECHOED_FIELDS, SSE_RETRY_MS, UPLOAD_EXTENSIONS, RequestValidationError, allowed_origins,
+    analyzer_warm_up, app as flask_app, batch_lines, extraction_pool, job_event, job_extraction_timeout,
+    job_runner, max_upload_bytes, process_upload, queued_upload, read_analyze_request, read_batch_request,
+    read_last_event_id, read_text_mode, response_compressor, resume_analyzer, run_upload_job, server_timing,
+    upload_extension
+)
+from services.job_descriptions import JobDescriptionNotFoundError
+from services.job_queue import FINISHED_STATES, JobQueueFullError
+from utils.extraction_pool import ExtractionBusyError, ExtractionTimeoutError
+from utils.metrics import metrics, start_request_timings, finish_request_timings, server_timing_header
+from utils.multipart import MultipartFileReader, UploadTooLargeError
+from utils.responses import ResponseCompressor, StreamCompressor, etag_matches, select_fields
+from utils.upload_guard import DocumentTooLargeError
+
+_END = object()
+
+
+class ServerBusyError(Exception):
+    """Raised when too many requests are already waiting for a CPU thread."""
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client goes away before its request body is read."""
+
+
+class HTTPError(Exception):
+    """Ends a request with a JSON error response."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Request:
+    """Incoming HTTP request whose body is read on demand."""
+
+    def __init__(self, scope: Dict, receive: Callable):
+        self.scope = scope
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        self.args = {
+            name: values[0] for name, values in parse_qs(scope["query_string"].decode("latin-1")).items()
+        }
+        self._receive = receive
+
+    @property
+    def content_length(self) -> Optional[int]:
+        try:
+            return int(self.headers["content-length"])
+        except (KeyError, ValueError):
+            return None
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Yield the request body chunk by chunk as the client sends it.
+
+        Raises:
+            ClientDisconnected: If the client disconnects first
+        """
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnected()
+            if message.get("body"):
+                yield message["body"]
+            if not message.get("more_body"):
+                return
+
+    async def body(self, max_bytes: Optional[int]) -> bytes:
+        """
+        Read the whole request body.
+
+        Args:
+            max_bytes: Maximum body size
+
+        Raises:
+            UploadTooLargeError: If the body is larger than max_bytes
+        """
+        if max_bytes is not None and (self.content_length or 0) > max_bytes:
+            raise UploadTooLargeError(f"Request body is larger than {max_bytes} bytes")
+        chunks = []
+        size = 0
+        async for chunk in self.stream():
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLargeError(f"Request body is larger than {max_bytes} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def json(self, max_bytes: Optional[int]) -> Dict:
+        """
+        Read the request body as a JSON object.
+
+        Raises:
+            HTTPError: If the body is not a JSON object
+        """
+        try:
+            payload = flask_app.json.loads(await self.body(max_bytes))
+        except ValueError:
+            raise HTTPError(400, "Request body must be valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+
+class Response:
+    """Outgoing HTTP response with a complete or streamed body."""
+
+    def __init__(self, body: Union[bytes, AsyncIterator[bytes]], status: int = 200,
+                 headers: Optional[Dict[str, str]] = None, media_type: str = "application/json"):
+        self.body = body
+        self.status = status
+        self.headers = {"Content-Type": media_type, **(headers or {})}
+
+
+def json_response(payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize payload the same way the Flask app does."""
+    return Response((flask_app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8"), status, headers)
+
+
+def error_response(message: str, status: int, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON error body, as returned by the Flask routes."""
+    return json_response({"error": message}, status, headers)
+
+
+class AsyncApp:
+    """
+    Minimal ASGI application: async routes, a bounded CPU thread pool and
+    graceful shutdown, with every other request handed to a WSGI app.
+    """
+
+    def __init__(self, wsgi_app: Callable, cpu_workers: int = 4, max_pending: int = 32,
+                 max_body_bytes: Optional[int] = None, shutdown_timeout: float = 30.0,
+                 cors_origins: Optional[List[str]] = None, compressor: Optional[ResponseCompressor] = None):
+        """
+        Args:
+            wsgi_app: WSGI application serving the routes not defined here
+            cpu_workers: Threads running extraction and matching
+            max_pending: Maximum requests waiting for or holding a CPU thread;
+                further requests get a 429
+            max_body_bytes: Maximum request body size
+            shutdown_timeout: Seconds to wait for in-flight requests and
+                background jobs on shutdown
+            cors_origins: Origins allowed to read responses of the async routes
+            compressor: Compresses responses of the async routes for clients
+                that accept it; the WSGI app compresses its own
+        """
+        self.wsgi_app = wsgi_app
+        self.cpu_workers = cpu_workers
+        self.max_pending = max_pending
+        self.max_body_bytes = max_body_bytes
+        self.shutdown_timeout = shutdown_timeout
+        self.cors_origins = set(cors_origins or [])
+        self.compressor = compressor
+
+        self.in_flight = 0
+        self.pending_cpu = 0
+        self.draining = False
+
+        self._routes: List[Tuple[re.Pattern, Tuple[str, ...], Callable]] = []
+        self._startup_hooks: List[Callable[[], Any]] = []
+        self._shutdown_hooks: List[Callable[[], None]] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    def route(self, path: str, methods: Tuple[str, ...] = ("GET",)) -> Callable:
+        """
+        Register an async handler, called as handler(request, **path_params).
+
+        Args:
+            path: URL path; <name> segments become keyword arguments
+            methods: HTTP methods handled; other methods go to the WSGI app
+        """
+        pattern = re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path) + "$")
+
+        def decorator(handler: Callable) -> Callable:
+            self._routes.append((pattern, methods, handler))
+            return handler
+
+        return decorator
+
+    def on_startup(self, hook: Callable[[], Any]) -> None:
+        """Run a blocking setup function before the server starts taking requests."""
+        self._startup_hooks.append(hook)
+
+    def on_shutdown(self, hook: Callable[[], None]) -> None:
+        """Run a blocking cleanup function once requests have drained."""
+        self._shutdown_hooks.append(hook)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork, so build the pool in the process using it
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="asgi-cpu")
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    async def run_cpu(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking function on the CPU thread pool.
+
+        Raises:
+            ServerBusyError: If max_pending calls are already waiting or running
+        """
+        if self.pending_cpu >= self.max_pending:
+            raise ServerBusyError("Too many requests are waiting to be processed. Please retry shortly.")
+        self.pending_cpu += 1
+        try:
+            # Carry the request's context (stage timings) into the thread
+            call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+        finally:
+            self.pending_cpu -= 1
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    for hook in self._startup_hooks:
+                        await asyncio.to_thread(hook)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def drain(self) -> None:
+        """Refuse new requests, then wait for in-flight requests and run the shutdown hooks."""
+        self.draining = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.shutdown_timeout
+        while self.in_flight and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        if self.in_flight:
+            print(f"Warning: Shutting down with {self.in_flight} requests still running")
+
+        for hook in self._shutdown_hooks:
+            try:
+                await asyncio.wait_for(asyncio.to_thread(hook), max(deadline - loop.time(), 0.1))
+            except asyncio.TimeoutError:
+                print(f"Warning: {getattr(hook, '__qualname__', hook)} did not finish before the shutdown timeout")
+
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _http(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        request = Request(scope, receive)
+        if self.draining:
+            await self._send(send, error_response("Server is shutting down", 503, {"Connection": "close"}))
+            return
+
+        self.in_flight += 1
+        try:
+            handler, params = self._match(request)
+            if handler is None:
+                await self._call_wsgi(request, send)
+            else:
+                await self._call_handler(handler, params, request, send)
+        except ClientDisconnected:
+            pass
+        finally:
+            self.in_flight -= 1
+
+    def _match(self, request: Request) -> Tuple[Optional[Callable], Dict[str, str]]:
+        for pattern, methods, handler in self._routes:
+            match = pattern.match(request.path)
+            if match and request.method in methods:
+                return handler, match.groupdict()
+        return None, {}
+
+    async def _call_handler(self, handler: Callable, params: Dict[str, str], request: Request,
+                            send: Callable) -> None:
+        start = time.perf_counter()
+        token = start_request_timings()
+        try:
+            response = await handler(request, **params)
+        except HTTPError as e:
+            response = error_response(e.message, e.status, e.headers)
+        except UploadTooLargeError as e:
+            response = error_response(str(e), 413)
+        except ServerBusyError as e:
+            metrics.count_error(handler.__name__, e)
+            response = error_response(str(e), 429, {"Retry-After": "1"})
+        except ClientDisconnected:
+            raise
+        except Exception as e:
+            metrics.count_error(handler.__name__, e)
+            response = error_response(f"Internal server error: {str(e)}", 500)
+        finally:
+            duration = time.perf_counter() - start
+            timings = finish_request_timings(token)
+            metrics.observe_stage(f"request:{handler.__name__}", duration)
+
+        if server_timing:
+            response.headers["Server-Timing"] = server_timing_header(timings, duration)
+        origin = request.headers.get("origin")
+        if origin in self.cors_origins:
+            response.headers.update({
+                "Access-Control-Allow-Origin": origin,
+                "Access-Control-Allow-Credentials": "true",
+                "Vary": "Origin"
+            })
+        if self.compressor is not None:
+            self._compress(request, response)
+        await self._send(send, response)
+
+    def _compress(self, request: Request, response: Response) -> None:
+        media_type = response.headers["Content-Type"].split(";", 1)[0].strip()
+        if response.status < 200 or response.status in (204, 304) or "Content-Encoding" in response.headers \
+                or not self.compressor.compressible(media_type):
+            return
+        vary = response.headers.get("Vary")
+        response.headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        encoding = self.compressor.negotiate(request.headers.get("accept-encoding"))
+        if encoding is None:
+            return
+
+        if isinstance(response.body, bytes):
+            if len(response.body) < self.compressor.min_bytes:
+                return
+            with metrics.timed("compress_response"):
+                response.body = self.compressor.compress(response.body, encoding)
+        else:
+            response.body = _compress_stream(response.body, self.compressor.stream(encoding))
+        response.headers["Content-Encoding"] = encoding
+
+    @staticmethod
+    async def _send(send: Callable, response: Response) -> None:
+        headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                   for name, value in response.headers.items()]
+        await send({"type": "http.response.start", "status": response.status, "headers": headers})
+        if isinstance(response.body, bytes):
+            await send({"type": "http.response.body", "body": response.body})
+            return
+        async for chunk in response.body:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _call_wsgi(self, request: Request, send: Callable) -> None:
+        try:
+            body = await request.body(self.max_body_bytes)
+        except UploadTooLargeError as e:
+            await self._send(send, error_response(str(e), 413))
+            return
+
+        loop = asyncio.get_running_loop()
+        environ = wsgi_environ(request.scope, body)
+        started: Dict[str, Any] = {}
+
+        async def send_body(chunk: bytes) -> None:
+            if not started.get("sent"):
+                started["sent"] = True
+                await send({
+                    "type": "http.response.start",
+                    "status": started["status"],
+                    "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                                for name, value in started["headers"]]
+                })
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        def write(data: bytes) -> None:
+            # Legacy WSGI write(): called from the app's thread, so hand the
+            # data to the loop and wait until it is sent
+            asyncio.run_coroutine_threadsafe(send_body(data), loop).result()
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None) -> Callable:
+            if exc_info is not None and started.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = headers
+            return write
+
+        # Flask handlers block, so they run on the loop's default thread pool,
+        # one body chunk at a time in case the response is streamed
+        iterable = await loop.run_in_executor(None, self.wsgi_app, environ, start_response)
+        iterator = iter(iterable)
+        try:
+            chunk = await loop.run_in_executor(None, next, iterator, _END)
+            while chunk is not _END:
+                await send_body(chunk)
+                chunk = await loop.run_in_executor(None, next, iterator, _END)
+            await send_body(b"")
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(iterable, "close"):
+                await loop.run_in_executor(None, iterable.close)
+
+
+async def _compress_stream(chunks: AsyncIterator[bytes], stream: StreamCompressor) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def wsgi_environ(scope: Dict, body: bytes) -> Dict[str, Any]:
+    """
+    Build the WSGI environ of an ASGI HTTP request.
+
+    Args:
+        scope: ASGI connection scope
+        body: Complete request body
+
+    Returns:
+        WSGI environ dictionary
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False
+    }
+    for name, value in scope["headers"]:
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[name] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+# Threads running extraction and matching; requests beyond ASYNC_MAX_PENDING get a 429
+cpu_workers = int(os.getenv("ASYNC_CPU_WORKERS", "4"))
+app = AsyncApp(
+    flask_app.wsgi_app,
+    cpu_workers=cpu_workers,
+    max_pending=int(os.getenv("ASYNC_MAX_PENDING", str(cpu_workers * 8))),
+    max_body_bytes=flask_app.config["MAX_CONTENT_LENGTH"],
+    shutdown_timeout=float(os.getenv("ASYNC_SHUTDOWN_TIMEOUT", "30")),
+    cors_origins=allowed_origins,
+    compressor=response_compressor
+)
+
+# Warm up before taking requests; a no-op in workers forked from a warm master
+app.on_startup(analyzer_warm_up.run)
+
+# Finish queued background jobs before the worker exits
+app.on_shutdown(job_runner.shutdown)
+if extraction_pool is not None:
+    app.on_shutdown(extraction_pool.shutdown)
+
+metrics.register_collector(lambda: {
+    "async_in_flight_requests": app.in_flight,
+    "async_pending_cpu_tasks": app.pending_cpu
+})
+
+
+@app.route("/health")
+async def health_check(request: Request) -> Response:
+    """Health check endpoint, answered on the event loop."""
+    return json_response({"status": "healthy", "message": "AI Resume Analyzer API is running"})
+
+
+@app.route("/ready")
+async def readiness_check(request: Request) -> Response:
+    """
+    Readiness check: whether this worker has warmed up and can take traffic
+    without a cold first request. Like every route, it answers 503 once the
+    server is shutting down.
+
+    Returns:
+        Warm-up state (200), or the same with a 503 before warm-up
+    """
+    status = analyzer_warm_up.status()
+    return json_response(status, 200 if status["ready"] else 503)
+
+
+@app.route("/skills")
+async def get_skills(request: Request) -> Response:
+    """
+    Get all available skills organized by category.
+
+    The ETag is the taxonomy version: clients revalidating with
+    If-None-Match get an empty 304 until the taxonomy changes.
+
+    Args:
+        fields: Optional comma-separated keys of the result to return
+
+    Returns:
+        Dictionary of skills by category, aliases, the skill names by skill
+        ID (vocabulary) and the taxonomy version
+    """
+    taxonomy = resume_analyzer.taxonomy
+    headers = {"ETag": f'W/"{taxonomy.version}"', "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(b"", 304, headers)
+
+    def build() -> Response:
+        return json_response(select_fields({
+            "skills": taxonomy.skills_database,
+            "aliases": taxonomy.aliases,
+            "vocabulary": list(taxonomy.matcher.skills),
+            "taxonomy_version": taxonomy.version
+        }, request.args), headers=headers)
+
+    try:
+        return await app.run_cpu(build)
+    except ServerBusyError:
+        raise
+    except Exception as e:
+        metrics.count_error("skills", e)
+        return error_response(f"Error retrieving skills: {str(e)}", 500)
+
+
+@app.route("/upload_resume", methods=("POST",))
+async def upload_resume(request: Request) -> Response:
+    """
+    Upload and extract skills from resume file, reading the body as it streams in.
+
+    Args:
+        file: Resume file (PDF or DOCX)
+        async: When "1", queue the upload and return a job ID immediately
+        text: How much extracted text to return, one of TEXT_MODES
+            (default "preview", or "none" with compact=1)
+        fields: Optional comma-separated keys of the result to return
+
+    Returns:
+        Extracted skills with their evidence spans and text from resume, or
+        the queued job (202)
+    """
+    try:
+        text_mode = read_text_mode(request.args)
+    except RequestValidationError as e:
+        return error_response(str(e), e.status)
+    if (request.content_length or 0) > app.max_body_bytes:
+        return error_response(f"Request body is larger than {app.max_body_bytes} bytes", 413)
+    try:
+        reader = MultipartFileReader(request.headers.get("content-type", ""), max_bytes=max_upload_bytes)
+    except ValueError:
+        return error_response("No file provided", 400)
+
+    try:
+        async for chunk in request.stream():
+            reader.feed(chunk)
+            # Reject unsupported files as soon as the part headers arrive
+            if reader.filename and os.path.splitext(reader.filename)[1].lower() not in UPLOAD_EXTENSIONS:
+                break
+        else:
+            reader.feed(None)
+    except UploadTooLargeError as e:
+        return error_response(str(e), 413)
+    except ValueError as e:
+        return error_response(f"Invalid upload: {str(e)}", 400)
+
+    try:
+        file_extension = upload_extension(reader.filename)
+    except RequestValidationError as e:
+        return error_response(str(e), e.status)
+
+    file_content = reader.content
+    if len(file_content) == 0:
+        return error_response("Empty file provided", 400)
+
+    try:
+        if request.args.get("async") == "1":
+            job_id = await asyncio.to_thread(
+                job_runner.submit, run_upload_job, file_content, file_extension, reader.filename, text_mode
+            )
+            payload, headers = queued_upload(job_id)
+            return json_response(payload, 202, headers)
+
+        result = await app.run_cpu(process_upload, file_content, file_extension, reader.filename, text_mode)
+        return json_response(select_fields(result, request.args))
+
+    except (ExtractionBusyError, JobQueueFullError, ServerBusyError) as e:
+        metrics.count_error("upload_resume", e)
+        return error_response(str(e), 429, {"Retry-After": "1"})
+    except ExtractionTimeoutError as e:
+        metrics.count_error("upload_resume", e)
+        return error_response(str(e), 504)
+    except DocumentTooLargeError as e:
+        metrics.count_error("upload_resume", e)
+        return error_response(str(e), 413)
+    except Exception as e:
+        metrics.count_error("upload_resume", e)
+        return error_response(f"Error processing resume: {str(e)}", 500)
+
+
+@app.route("/analyze", methods=("POST",))
+async def analyze_resume(request: Request) -> Response:
+    """
+    Analyze candidate skills against job description.
+
+    Args:
+        compact: When "1", leave the candidate skills out of the result
+        fields: Optional comma-separated keys of the result to return
+
+    Returns:
+        Analysis results with match score and suggestions
+    """
+    payload = await request.json(app.max_body_bytes)
+    try:
+        analysis = read_analyze_request(payload, resume_analyzer.taxonomy)
+    except RequestValidationError as e:
+        return error_response(str(e), e.status)
+
+    try:
+        result = await app.run_cpu(
+            resume_analyzer.analyze_match, analysis.candidate_skills, payload.get("job_description"),
+            scoring=analysis.scoring, jd_id=payload.get("jd_id"), skill_sections=payload.get("skill_sections")
+        )
+        return json_response(select_fields(result, request.args, ANALYZE_ECHOED_FIELDS))
+    except JobDescriptionNotFoundError:
+        return error_response("Job description not found", 404)
+    except ServerBusyError:
+        raise
+    except Exception as e:
+        metrics.count_error("analyze", e)
+        return error_response(f"Error analyzing resume: {str(e)}", 500)
+
+
+@app.route("/analyze/batch", methods=("POST",))
+async def analyze_batch(request: Request) -> Response:
+    """
+    Rank many candidates against one job description.
+
+    Args:
+        fields: Optional comma-separated keys of each result to return
+
+    Returns:
+        Newline-delimited JSON stream of analysis results, best match first
+    """
+    payload = await request.json(app.max_body_bytes)
+    try:
+        batch = read_batch_request(payload, resume_analyzer.taxonomy)
+    except RequestValidationError as e:
+        return error_response(str(e), e.status)
+
+    try:
+        results = await app.run_cpu(
+            resume_analyzer.analyze_many, payload.get("job_description"), batch.candidate_skills,
+            top_k=batch.top_k, scoring=batch.scoring, jd_id=payload.get("jd_id"),
+            skill_sections=batch.candidate_sections
+        )
+    except JobDescriptionNotFoundError:
+        return error_response("Job description not found", 404)
+    except ServerBusyError:
+        raise
+    except Exception as e:
+        metrics.count_error("analyze_batch", e)
+        return error_response(f"Error analyzing candidates: {str(e)}", 500)
+
+    lines = batch_lines(results, batch.candidate_ids, request.args)
+
+    def next_chunk() -> bytes:
+        return "".join(itertools.islice(lines, 256)).encode("utf-8")
+
+    async def generate() -> AsyncIterator[bytes]:
+        # Scoring is done; results are built and serialized as the client
+        # reads them, 256 lines at a time on the CPU pool. The stream has
+        # started, so it does not compete with new requests for a slot.
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(app._get_executor(), next_chunk)
+            if not chunk:
+                return
+            yield chunk
+
+    return Response(generate(), media_type="application/x-ndjson")
+
+
+@app.route("/jobs/<job_id>")
+async def get_job(request: Request, job_id: str) -> Response:
+    """
+    Get the state of a background job, long-polling without holding a thread.
+
+    Args:
+        job_id: Job ID returned by POST /upload_resume?async=1
+        wait: Optional seconds (up to 30) to long-poll until the job finishes
+
+    Returns:
+        Job status, progress, and result or error once finished
+    """
+    try:
+        wait = min(float(request.args.get("wait", 0)), 30.0)
+    except ValueError:
+        return error_response("wait must be a number of seconds", 400)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    job = await asyncio.to_thread(job_runner.store.get, job_id)
+    while job is not None and job["status"] not in FINISHED_STATES and loop.time() < deadline:
+        await asyncio.sleep(0.1)
+        job = await asyncio.to_thread(job_runner.store.get, job_id)
+
+    if job is None:
+        return error_response("Job not found", 404)
+    return json_response(job)
+
+
+@app.route("/jobs/<job_id>/events")
+async def job_events(request: Request, job_id: str) -> Response:
+    """
+    Stream job progress as server-sent events. A reconnecting client resumes
+    after the last state it saw, and gets 204 once it has seen the finished
+    one, which stops EventSource.
+
+    Args:
+        job_id: Job ID returned by POST /upload_resume?async=1
+        Last-Event-ID: Header sent by reconnecting clients
+
+    Returns:
+        text/event-stream of job states, ending once the job finishes
+    """
+    job = await asyncio.to_thread(job_runner.store.get, job_id)
+    if job is None:
+        return error_response("Job not found", 404)
+    since = read_last_event_id(request.headers.get("last-event-id"))
+    if job["status"] in FINISHED_STATES and job["updated_at"] == since:
+        return Response(b"", 204)
+
+    async def generate() -> AsyncIterator[bytes]:
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode("utf-8")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + job_extraction_timeout + 60
+        last_update = since
+        # Streams end early on shutdown so that they do not hold up draining;
+        # the client reconnects to another worker
+        while loop.time() < deadline and not app.draining:
+            job = await asyncio.to_thread(job_runner.store.get, job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield job_event(job).encode("utf-8")
+            if job["status"] in FINISHED_STATES:
+                return
+            await asyncio.sleep(0.25)
+
+    return Response(generate(), headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                    media_type="text/event-stream")
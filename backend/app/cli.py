@@ -0,0 +1,519 @@
+"""
+Command line tools for the AI Resume Analyzer.
+
+Run from the backend directory:
+
+    python -m app.cli ingest resumes/ --output skills.jsonl
+    python -m app.cli ingest backfill.tar.gz --output skills.jsonl --workers 16
+    python -m app.cli ingest resumes.zip --output skills.parquet --format parquet
+
+ingest extracts the skills of every PDF and DOCX resume in a directory, a
+zip archive or a tar archive (archives found inside a directory are read
+too) with ResumeAnalyzer, across a pool of worker processes. Archives are
+read one member at a time, so a backfill never holds more than a few files
+in memory. Everything runs offline against the local skills taxonomy.
+
+The content hash of every file written to the output is appended to a
+checkpoint file (OUTPUT.checkpoint by default). Running the same command
+again skips those files, so an interrupted backfill resumes where it
+stopped; files identical to one already ingested are skipped as well.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Add the app directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.resume_analyzer import ResumeAnalyzer
+from services.taxonomy import DEFAULT_ALIASES_PATH, DEFAULT_SKILLS_PATH, TaxonomyManager
+from utils.cache import content_hash
+from utils.private_dir import default_private_dir
+from utils.upload_guard import UploadGuard
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+OUTPUT_FORMATS = ("jsonl", "parquet")
+
+
+class InputFile(NamedTuple):
+    """A file found in the input, read on demand."""
+    source: str
+    extension: str
+    size: int
+    read: Callable[[], bytes]
+
+
+def _archive_kind(path: str) -> Optional[str]:
+    lower = path.lower()
+    if lower.endswith('.zip'):
+        return "zip"
+    if lower.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _iter_zip(path: str, source: str) -> Iterator[InputFile]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir():
+                yield InputFile(
+                    f"{source}:{info.filename}", _extension(info.filename), info.file_size,
+                    lambda info=info: archive.read(info)
+                )
+
+
+def _iter_tar(path: str, source: str) -> Iterator[InputFile]:
+    # Stream mode reads members in order without seeking, compressed or not
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            if member.isfile():
+                yield InputFile(
+                    f"{source}:{member.name}", _extension(member.name), member.size,
+                    lambda member=member: archive.extractfile(member).read()
+                )
+
+
+def iter_inputs(path: str) -> Iterator[InputFile]:
+    """
+    Walk a directory, zip or tar archive lazily.
+
+    Each file must be read (or skipped) before the next one is requested,
+    since tar archives are read as a stream.
+
+    Args:
+        path: Directory, zip archive or tar archive (optionally compressed)
+
+    Yields:
+        Every regular file, in a stable order
+    """
+    kind = _archive_kind(path)
+    if kind == "zip":
+        yield from _iter_zip(path, path)
+    elif kind == "tar":
+        yield from _iter_tar(path, path)
+    elif os.path.isdir(path):
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                file_path = os.path.join(directory, name)
+                if _archive_kind(name):
+                    yield from iter_inputs(file_path)
+                elif os.path.isfile(file_path):
+                    yield InputFile(
+                        file_path, _extension(name), os.path.getsize(file_path),
+                        lambda file_path=file_path: _read_file(file_path)
+                    )
+    elif os.path.isfile(path):
+        yield InputFile(path, _extension(path), os.path.getsize(path), lambda: _read_file(path))
+    else:
+        raise FileNotFoundError(f"No such file or directory: {path}")
+
+
+class Checkpoint:
+    """
+    Append-only file of the content hashes already ingested.
+
+    Hashes are added only after their record reached the output, so a crash
+    can at worst repeat a few records on the next run, never lose one.
+    """
+
+    def __init__(self, path: str, sync_interval: float = 5.0):
+        """
+        Args:
+            path: Checkpoint file, created if missing
+            sync_interval: Seconds between fsyncs of the file
+        """
+        self.path = path
+        self.sync_interval = sync_interval
+        self.hashes: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="ascii") as f:
+                self.hashes.update(line.strip() for line in f if line.strip())
+        self._file = open(path, "a", encoding="ascii")
+        self._synced_at = time.monotonic()
+
+    def add(self, hashes: List[str]) -> None:
+        """
+        Args:
+            hashes: Content hashes whose records are in the output
+        """
+        if not hashes:
+            return
+        self._file.write("".join(f"{content_hash}\n" for content_hash in hashes))
+        self._file.flush()
+        if time.monotonic() - self._synced_at > self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._synced_at = time.monotonic()
+
+    def close(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+class JsonlWriter:
+    """Appends one JSON record per line, flushed as it is written."""
+
+    def __init__(self, path: str, include_text: bool = False):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict) -> List[str]:
+        """
+        Args:
+            record: Ingestion record
+
+        Returns:
+            Content hashes now safely in the output
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        return [record["content_hash"]]
+
+    def close(self) -> List[str]:
+        self._file.close()
+        return []
+
+
+class ParquetWriter:
+    """
+    Writes records as Parquet row groups through pyarrow, an optional
+    dependency. A Parquet file cannot be appended to, so a resumed run
+    writes the next free OUTPUT.N.parquet next to the first one.
+    """
+
+    def __init__(self, path: str, include_text: bool = False, row_group_size: int = 1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("--format parquet needs pyarrow: pip install pyarrow")
+
+        stem, suffix = os.path.splitext(path)
+        part = 0
+        while os.path.exists(path):
+            part += 1
+            path = f"{stem}.{part}{suffix or '.parquet'}"
+        self.path = path
+
+        self._pa = pyarrow
+        fields = [
+            ("source", pyarrow.string()),
+            ("content_hash", pyarrow.string()),
+            ("format", pyarrow.string()),
+            ("bytes", pyarrow.int64()),
+            ("skills", pyarrow.list_(pyarrow.string())),
+            ("chars", pyarrow.int64()),
+            ("taxonomy_version", pyarrow.string()),
+            ("error", pyarrow.string())
+        ]
+        if include_text:
+            fields.append(("text", pyarrow.string()))
+        self._schema = pyarrow.schema(fields)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._rows: List[Dict] = []
+        self.row_group_size = row_group_size
+
+    def write(self, record: Dict) -> List[str]:
+        """
+        Args:
+            record: Ingestion record
+
+        Returns:
+            Content hashes now safely in the output; records are buffered
+            until a row group is full
+        """
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            return self._flush()
+        return []
+
+    def _flush(self) -> List[str]:
+        if not self._rows:
+            return []
+        columns = {name: [row.get(name) for row in self._rows] for name in self._schema.names}
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+        hashes = [row["content_hash"] for row in self._rows]
+        self._rows = []
+        return hashes
+
+    def close(self) -> List[str]:
+        hashes = self._flush()
+        self._writer.close()
+        return hashes
+
+
+class Progress:
+    """Single-line progress display with throughput and per-format error counts."""
+
+    def __init__(self, stream: IO[str], enabled: bool = True, interval: float = 0.5):
+        self.stream = stream
+        self.enabled = enabled
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self._shown_at = 0.0
+        self.processed = 0
+        self.skipped = 0
+        self.ignored = 0
+        self.errors: Counter = Counter()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def render(self) -> str:
+        errors = ", ".join(f"{name} {count}" for name, count in sorted(self.errors.items())) or "0"
+        return (f"{self.processed} processed ({self.rate:.1f} files/s), {self.skipped} already done, "
+                f"{self.ignored} ignored, errors: {errors}")
+
+    def update(self, force: bool = False) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if force or now - self._shown_at >= self.interval:
+            self._shown_at = now
+            self.stream.write(f"\r\033[K{self.render()}")
+            self.stream.flush()
+
+    def log(self, message: str) -> None:
+        if self.enabled:
+            self.stream.write("\r\033[K")
+        self.stream.write(message + "\n")
+        self.update(force=True)
+
+
+# Analyzer of each worker process, built by _init_worker
+_analyzer: Optional[ResumeAnalyzer] = None
+
+
+def _init_worker(skills_path: str, aliases_path: Optional[str], snapshot_dir: str,
+                 max_pages: Optional[int], max_chars: Optional[int], fast_layout: bool,
+                 fuzzy_matching: bool) -> None:
+    global _analyzer
+    # Every worker maps the snapshot compiled by the parent, sharing one copy
+    _analyzer = ResumeAnalyzer(
+        max_pages=max_pages,
+        max_chars=max_chars,
+        fast_layout=fast_layout,
+        fuzzy_matching=fuzzy_matching,
+        # Files beyond the default page and zip limits are recorded as errors
+        upload_guard=UploadGuard(),
+        taxonomy_manager=TaxonomyManager(skills_path, aliases_path, snapshot_dir=snapshot_dir, mapped=True)
+    )
+
+
+def _extract(content: bytes, extension: str, include_text: bool) -> Dict:
+    """Worker task: extract the skills of one file."""
+    taxonomy = _analyzer.taxonomy
+    record = {"skills": [], "chars": 0, "taxonomy_version": taxonomy.version, "error": None}
+    try:
+        skills, text = _analyzer.extract_skills_from_resume(content, extension, taxonomy=taxonomy)
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+    record["skills"] = skills
+    record["chars"] = len(text)
+    if include_text:
+        record["text"] = text
+    return record
+
+
+def _new_executor(args: argparse.Namespace, snapshot_dir: str) -> ProcessPoolExecutor:
+    initargs = (args.skills, args.aliases, snapshot_dir, args.max_pages, args.max_chars, args.fast_layout,
+                args.fuzzy)
+    if sys.version_info >= (3, 11):
+        # Replace workers periodically to cap pdfminer's memory growth
+        return ProcessPoolExecutor(
+            max_workers=args.workers, initializer=_init_worker, initargs=initargs,
+            max_tasks_per_child=args.max_jobs_per_worker
+        )
+    return ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=initargs)
+
+
+def ingest(args: argparse.Namespace) -> int:
+    """
+    Run the ingest command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit status
+    """
+    snapshot_dir = args.snapshot_dir or default_private_dir("resume-analyzer-taxonomy")
+    # Compile the taxonomy snapshot once, before the workers map it
+    TaxonomyManager(args.skills, args.aliases, snapshot_dir=snapshot_dir, mapped=True).get()
+
+    writer_class = ParquetWriter if args.format == "parquet" else JsonlWriter
+    writer = writer_class(args.output, include_text=args.text)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint")
+    progress = Progress(sys.stderr, enabled=not args.quiet and sys.stderr.isatty())
+    # Hashes submitted in this run or finished in an earlier one
+    seen = set(checkpoint.hashes)
+    pending: Dict[Future, Tuple[str, str, int, str]] = {}
+    executor = _new_executor(args, snapshot_dir)
+    if checkpoint.hashes:
+        progress.log(f"Resuming: {len(checkpoint.hashes)} files already ingested ({checkpoint.path})")
+
+    def collect(futures) -> None:
+        nonlocal executor
+        for future in futures:
+            source, extension, size, file_hash = pending.pop(future)
+            file_format = extension.lstrip('.')
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # A worker died (crash or out of memory); the file is not
+                # checkpointed, so the next run retries it
+                progress.errors[file_format] += 1
+                progress.log(f"Worker crashed on {source}; it will be retried on the next run")
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                    executor = None
+                continue
+
+            if result["error"] is not None:
+                progress.errors[file_format] += 1
+            else:
+                progress.processed += 1
+            record = {"source": source, "content_hash": file_hash, "format": file_format, "bytes": size, **result}
+            checkpoint.add(writer.write(record))
+        progress.update()
+
+    try:
+        for item in iter_inputs(args.path):
+            if item.extension not in SUPPORTED_EXTENSIONS:
+                progress.ignored += 1
+                continue
+            if item.size > args.max_file_size:
+                progress.errors[item.extension.lstrip('.')] += 1
+                progress.log(f"Skipping {item.source}: larger than {args.max_file_size} bytes")
+                continue
+
+            content = item.read()
+            file_hash = content_hash(content)
+            if file_hash in seen:
+                progress.skipped += 1
+                progress.update()
+                continue
+            seen.add(file_hash)
+
+            while len(pending) >= args.workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            if executor is None:
+                executor = _new_executor(args, snapshot_dir)
+            future = executor.submit(_extract, content, item.extension, args.text)
+            pending[future] = (item.source, item.extension, len(content), file_hash)
+
+        collect(list(wait(pending).done))
+    except KeyboardInterrupt:
+        progress.log(f"Interrupted; run the same command again to resume from {checkpoint.path}")
+        return 130
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        checkpoint.add(writer.close())
+        checkpoint.close()
+        progress.update(force=True)
+        if progress.enabled:
+            progress.stream.write("\n")
+
+    elapsed = time.monotonic() - progress.started_at
+    print(f"Ingested {progress.processed} files in {elapsed:.1f}s ({progress.rate:.1f} files/s) into {writer.path}; "
+          f"{sum(progress.errors.values())} errors, {progress.skipped} already done, {progress.ignored} ignored")
+    return 0
+
+
+def download_nltk(args: argparse.Namespace) -> int:
+    """
+    Run the download-nltk command: install the NLTK stopwords corpus. The
+    servers never download it themselves and fall back to a bundled copy.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit status
+    """
+    import nltk
+
+    return 0 if nltk.download("stopwords", download_dir=args.download_dir, quiet=args.quiet) else 1
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="resume-analyzer", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="extract skills from a directory or archive of resumes",
+        description=__doc__.split("\n\n", 3)[3].strip(), formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    ingest_parser.add_argument("path", help="directory, .zip or .tar[.gz|.bz2|.xz] of PDF and DOCX resumes")
+    ingest_parser.add_argument("--output", "-o", required=True, help="output file")
+    ingest_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl",
+                               help="output format (parquet needs pyarrow; default: jsonl)")
+    ingest_parser.add_argument("--checkpoint", help="checkpoint file (default: OUTPUT.checkpoint)")
+    ingest_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                               help="worker processes (default: one per core)")
+    ingest_parser.add_argument("--text", action="store_true", help="include the extracted text in the output")
+    ingest_parser.add_argument("--max-file-size", type=int,
+                               default=int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024))),
+                               help="skip larger files (default: MAX_FILE_SIZE or 10 MB)")
+    ingest_parser.add_argument("--max-pages", type=int, default=int(os.getenv("PDF_MAX_PAGES", "0")) or None,
+                               help="only parse the first pages of each PDF")
+    ingest_parser.add_argument("--max-chars", type=int, default=int(os.getenv("MAX_TEXT_CHARS", "0")) or None,
+                               help="stop extracting each file after this many characters")
+    ingest_parser.add_argument("--fast-layout", action="store_true",
+                               default=os.getenv("PDF_FAST_LAYOUT", "false").lower() == "true",
+                               help="use cheaper PDF layout analysis")
+    ingest_parser.add_argument("--fuzzy", action="store_true",
+                               default=os.getenv("FUZZY_MATCHING", "false").lower() == "true",
+                               help="also match misspelled and oddly spaced skill names")
+    ingest_parser.add_argument("--max-jobs-per-worker", type=int, default=100,
+                               help="files a worker process handles before it is replaced")
+    ingest_parser.add_argument("--skills", default=os.getenv("SKILLS_PATH", DEFAULT_SKILLS_PATH),
+                               help="skills taxonomy JSON")
+    ingest_parser.add_argument("--aliases", default=os.getenv("SKILL_ALIASES_PATH", DEFAULT_ALIASES_PATH),
+                               help="skill aliases JSON")
+    ingest_parser.add_argument("--snapshot-dir", default=os.getenv("TAXONOMY_SNAPSHOT_DIR"),
+                               help="directory for the compiled taxonomy snapshot")
+    ingest_parser.add_argument("--quiet", "-q", action="store_true", help="no progress display")
+    ingest_parser.set_defaults(handler=ingest)
+
+    nltk_parser = commands.add_parser("download-nltk", help="install the NLTK stopwords corpus (a setup step)")
+    nltk_parser.add_argument("--download-dir", help="NLTK data directory (default: NLTK's own choice)")
+    nltk_parser.add_argument("--quiet", "-q", action="store_true", help="no download progress")
+    nltk_parser.set_defaults(handler=download_nltk)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if getattr(args, "workers", 1) < 1:
+        raise SystemExit("--workers must be at least 1")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
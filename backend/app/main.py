@@ -1,12 +1,47 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+import json
 import os
 import sys
+import tempfile
+import time
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+if __name__ == "__main__":
+    # Serve from app/__main__.py instead: extraction workers spawned on
+    # Python 3.11+ import the __main__ script again, so the script must not
+    # be the module that wires up the app
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [backend_dir, os.getenv("PYTHONPATH")])))
+    os.execve(sys.executable, [sys.executable, "-m", "app"] + sys.argv[1:], env)
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.resume_analyzer import ResumeAnalyzer
+from services.resume_analyzer import ResumeAnalyzer, ResumeExtraction
+from services.job_queue import FINISHED_STATES, JobStore, JobRunner, JobQueueFullError
+from services.candidate_store import CandidateStore
+from services.scoring import SCORING_MODES, SkillStats
+from services.taxonomy import (
+    DEFAULT_ALIASES_PATH, DEFAULT_SKILLS_PATH, Taxonomy, TaxonomyManager, TaxonomyVersionMismatchError
+)
+from services.job_descriptions import JobDescriptionCache, JobDescriptionNotFoundError, JobDescriptionStore
+from services.warmup import WarmUp
+from utils.extraction_pool import ExtractionPool, ExtractionBusyError, ExtractionTimeoutError
+from utils.cache import ExtractionCache, content_hash
+from utils.single_flight import SingleFlight
+from utils.responses import (
+    ORJSON_AVAILABLE, FastJSONProvider, ResponseCompressor, etag_matches, select_fields
+)
+from utils.private_dir import default_private_dir
+from utils.skill_set import SkillSet
+from utils.text_preprocessor import warmup
+from utils.upload_guard import DocumentTooLargeError, UploadGuard
+from utils.metrics import (
+    metrics, SlowRequestProfiler, process_memory, start_request_timings, finish_request_timings,
+    server_timing_header
+)
 
 app = Flask(__name__)
 # Configure CORS for production
@@ -23,8 +58,660 @@ if os.getenv("CORS_ORIGINS"):
 
 CORS(app, origins=allowed_origins, supports_credentials=True)
 
+# Serialize JSON with orjson, an optional dependency (FAST_JSON=true)
+if os.getenv("FAST_JSON", "false").lower() == "true":
+    if ORJSON_AVAILABLE:
+        app.json = FastJSONProvider(app)
+    else:
+        print("Warning: FAST_JSON needs orjson (pip install orjson), using the json module")
+
+# Compress JSON and text responses for clients that accept gzip or brotli
+response_compressor = None
+if os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true":
+    response_compressor = ResponseCompressor(
+        min_bytes=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+        gzip_level=int(os.getenv("COMPRESSION_LEVEL", "6"))
+    )
+
+# Run document extraction in a bounded process pool (EXTRACTION_WORKERS=0 disables it)
+extraction_workers = int(os.getenv("EXTRACTION_WORKERS", "2"))
+extraction_pool = None
+if extraction_workers > 0:
+    extraction_pool = ExtractionPool(
+        max_workers=extraction_workers,
+        max_queue=int(os.getenv("EXTRACTION_QUEUE_SIZE", str(extraction_workers * 4))),
+        timeout=float(os.getenv("EXTRACTION_TIMEOUT", "30")),
+        max_jobs_per_worker=int(os.getenv("EXTRACTION_MAX_JOBS_PER_WORKER", "100"))
+    )
+
+# Cache extraction results by file content (EXTRACTION_CACHE_BYTES=0 disables it)
+extraction_cache_bytes = int(os.getenv("EXTRACTION_CACHE_BYTES", str(64 * 1024 * 1024)))
+extraction_cache = None
+if extraction_cache_bytes > 0:
+    max_disk_entries = os.getenv("EXTRACTION_CACHE_MAX_ENTRIES")
+    extraction_cache = ExtractionCache(
+        max_memory_bytes=extraction_cache_bytes,
+        disk_path=os.getenv("EXTRACTION_CACHE_PATH") or None,
+        max_disk_entries=int(max_disk_entries) if max_disk_entries else None
+    )
+
+# Largest accepted upload, and largest request body (the file plus multipart
+# framing); bigger requests get a 413 before their body is read
+max_upload_bytes = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", str(max_upload_bytes + 64 * 1024)))
+
+# Checked before a document is parsed: the page count a PDF declares and the
+# sizes in a DOCX zip directory. Very long PDFs are only partly parsed
+upload_guard = UploadGuard(
+    max_bytes=max_upload_bytes,
+    max_pages=int(os.getenv("UPLOAD_MAX_PAGES", "500")),
+    fast_pages=int(os.getenv("UPLOAD_FAST_PAGES", "50")),
+    max_zip_entries=int(os.getenv("DOCX_MAX_ENTRIES", "1000")),
+    max_uncompressed_bytes=int(os.getenv("DOCX_MAX_UNCOMPRESSED_BYTES", str(100 * 1024 * 1024))),
+    max_compression_ratio=float(os.getenv("DOCX_MAX_COMPRESSION_RATIO", "100"))
+)
+
+# Extraction budgets: huge documents stop being parsed once a budget is spent
+max_pages = int(os.getenv("PDF_MAX_PAGES", "0")) or None
+max_chars = int(os.getenv("MAX_TEXT_CHARS", "0")) or None
+
+# Load NLP resources now, so that with gunicorn --preload every worker inherits them
+warmup()
+
+# Skills taxonomy, recompiled and swapped in when its source files change
+# (TAXONOMY_RELOAD_INTERVAL=0 disables reloading)
+taxonomy_manager = TaxonomyManager(
+    skills_path=os.getenv("SKILLS_PATH", DEFAULT_SKILLS_PATH),
+    aliases_path=os.getenv("SKILL_ALIASES_PATH", DEFAULT_ALIASES_PATH),
+    snapshot_dir=os.getenv("TAXONOMY_SNAPSHOT_DIR", default_private_dir("resume-analyzer-taxonomy")) or None,
+    reload_interval=float(os.getenv("TAXONOMY_RELOAD_INTERVAL", "5")),
+    mapped=os.getenv("TAXONOMY_MMAP", "true").lower() == "true"
+)
+
+# Skill document frequencies for weighted scoring, shared by all workers when a path is set
+skill_stats = SkillStats(
+    os.getenv("SKILL_STATS_PATH") or None,
+    refresh_interval=float(os.getenv("SKILL_STATS_REFRESH", "30"))
+)
+scoring_mode = os.getenv("SCORING_MODE", "ratio").lower()
+if scoring_mode not in SCORING_MODES:
+    print(f"Warning: Unknown SCORING_MODE '{scoring_mode}', using 'ratio'")
+    scoring_mode = "ratio"
+
+# Cache the skills required by reposted job descriptions (JD_CACHE_BYTES=0 disables it)
+jd_cache_bytes = int(os.getenv("JD_CACHE_BYTES", str(16 * 1024 * 1024)))
+jd_cache = None
+if jd_cache_bytes > 0:
+    max_disk_entries = os.getenv("JD_CACHE_MAX_ENTRIES")
+    jd_cache = JobDescriptionCache(
+        max_memory_bytes=jd_cache_bytes,
+        ttl=float(os.getenv("JD_CACHE_TTL", "3600")) or None,
+        disk_path=os.getenv("JD_CACHE_PATH") or None,
+        max_disk_entries=int(max_disk_entries) if max_disk_entries else None
+    )
+
+# Job descriptions registered via POST /job_descriptions, shared by all workers on the host
+jd_store = JobDescriptionStore(
+    os.getenv("JD_STORE_PATH", os.path.join(tempfile.gettempdir(), "resume-analyzer-job-descriptions.sqlite3")),
+    ttl=float(os.getenv("JD_TTL", str(7 * 24 * 3600))) or None,
+    max_entries=int(os.getenv("JD_STORE_MAX_ENTRIES", "100000")) or None
+)
+
+# Coalesce concurrent identical uploads and analyses into one computation within
+# each worker; uploads also across the workers on the host when SINGLE_FLIGHT_PATH
+# is set, with waiting workers reading the result from the extraction cache
+single_flight = None
+if os.getenv("SINGLE_FLIGHT", "true").lower() == "true":
+    single_flight_lease = float(os.getenv("SINGLE_FLIGHT_LEASE", "120"))
+    try:
+        single_flight = SingleFlight(os.getenv("SINGLE_FLIGHT_PATH") or None, lease=single_flight_lease)
+    except OSError as e:
+        print(f"Warning: Coalescing uploads across workers disabled: {e}")
+        single_flight = SingleFlight(lease=single_flight_lease)
+
 # Initialize resume analyzer
-resume_analyzer = ResumeAnalyzer()
+resume_analyzer = ResumeAnalyzer(
+    extraction_pool=extraction_pool,
+    extraction_cache=extraction_cache,
+    max_pages=max_pages,
+    max_chars=max_chars,
+    fast_layout=os.getenv("PDF_FAST_LAYOUT", "false").lower() == "true",
+    skill_stats=skill_stats,
+    scoring=scoring_mode,
+    taxonomy_manager=taxonomy_manager,
+    jd_cache=jd_cache,
+    jd_store=jd_store,
+    single_flight=single_flight,
+    fuzzy_matching=os.getenv("FUZZY_MATCHING", "false").lower() == "true",
+    upload_guard=upload_guard
+)
+
+# Warm-up of the analyzer state; gunicorn.conf.py runs it in the master before
+# forking, other servers at startup. /ready answers 503 until it has run
+analyzer_warm_up = WarmUp(resume_analyzer)
+
+# Background jobs for POST /upload_resume?async=1, shared by all workers on the host
+job_runner = JobRunner(
+    JobStore(os.getenv("JOB_DB_PATH", os.path.join(tempfile.gettempdir(), "resume-analyzer-jobs.sqlite3"))),
+    max_workers=int(os.getenv("JOB_WORKERS", "2")),
+    max_pending=int(os.getenv("JOB_QUEUE_SIZE", "100")),
+    job_ttl=float(os.getenv("JOB_TTL", str(24 * 3600)))
+)
+job_extraction_timeout = float(os.getenv("JOB_EXTRACTION_TIMEOUT", "300"))
+# A sync worker is tied up for as long as a long poll or event stream lasts;
+# both end before gunicorn's 30 s worker timeout, and clients poll again or
+# reconnect (EventSource does so by itself, resuming at Last-Event-ID)
+max_poll_seconds = float(os.getenv("MAX_POLL_SECONDS", "20"))
+# Milliseconds EventSource clients wait before reconnecting
+SSE_RETRY_MS = 1000
+
+# Keep every uploaded resume searchable via /search when a store file is configured
+candidate_store = None
+if os.getenv("CANDIDATE_STORE_PATH"):
+    candidate_store = CandidateStore(os.getenv("CANDIDATE_STORE_PATH"))
+
+
+# Scrape-time gauges for /metrics
+if extraction_cache is not None:
+    metrics.register_collector(lambda: {
+        f"extraction_cache_{name}": value
+        for name, value in extraction_cache.stats().items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+if jd_cache is not None:
+    metrics.register_collector(lambda: {
+        f"jd_cache_{name}": value
+        for name, value in jd_cache.stats().items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+if single_flight is not None:
+    metrics.register_collector(lambda: {
+        f"single_flight_{name}": value
+        for name, value in single_flight.stats().items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+if extraction_pool is not None:
+    metrics.register_collector(lambda: {"extraction_pool_pending_jobs": extraction_pool.pending_jobs})
+metrics.register_collector(lambda: {"job_runner_pending_jobs": job_runner.pending_jobs})
+metrics.register_collector(lambda: {f"upload_guard_{name}": value for name, value in upload_guard.stats().items()})
+metrics.register_collector(lambda: {"taxonomy_reloads": taxonomy_manager.reload_count})
+metrics.register_collector(lambda: {f"process_{name}_bytes": value for name, value in process_memory().items()})
+
+# Optional Server-Timing headers and flame-graph profiles of slow requests
+server_timing = os.getenv("SERVER_TIMING", "false").lower() == "true"
+slow_request_profiler = None
+if float(os.getenv("PROFILE_SLOW_REQUESTS_MS", "0")) > 0:
+    slow_request_profiler = SlowRequestProfiler(
+        threshold=float(os.getenv("PROFILE_SLOW_REQUESTS_MS")) / 1000,
+        output_dir=os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "resume-analyzer-profiles"))
+    )
+
+
+@app.before_request
+def start_request_instrumentation():
+    g.request_start = time.perf_counter()
+    g.request_timings_token = start_request_timings()
+    if slow_request_profiler is not None:
+        slow_request_profiler.begin()
+
+
+@app.before_request
+def reject_large_requests():
+    # Bodies that declare their size are turned away without reading them;
+    # others are cut off by MAX_CONTENT_LENGTH as they are read
+    if request.content_length is not None and request.content_length > app.config["MAX_CONTENT_LENGTH"]:
+        return jsonify({"error": f"Request body is larger than {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+
+
+@app.after_request
+def finish_request_instrumentation(response):
+    duration = time.perf_counter() - g.request_start
+    timings = finish_request_timings(g.request_timings_token)
+    metrics.observe_stage(f"request:{request.endpoint}", duration)
+    if server_timing:
+        response.headers["Server-Timing"] = server_timing_header(timings, duration)
+    if slow_request_profiler is not None:
+        slow_request_profiler.end(str(request.endpoint), duration)
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    # Registered after the instrumentation hook, so it runs first and is timed with the request
+    if response_compressor is None or response.direct_passthrough or "Content-Encoding" in response.headers \
+            or response.status_code < 200 or response.status_code in (204, 304) \
+            or not response_compressor.compressible(response.mimetype):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = response_compressor.negotiate(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        response.response = response_compressor.compress_stream(response.iter_encoded(), encoding)
+    else:
+        body = response.get_data()
+        if len(body) < response_compressor.min_bytes:
+            return response
+        with metrics.timed("compress_response"):
+            response.set_data(response_compressor.compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+UPLOAD_EXTENSIONS = ('.pdf', '.docx')
+# How much extracted text an upload returns: the first 500 characters, all
+# of it, or none when the skill evidence spans are enough
+TEXT_MODES = ("preview", "full", "none")
+# Keys of an /analyze result that repeat the request, dropped by ?compact=1
+ANALYZE_ECHOED_FIELDS = ("candidate_skills",)
+
+
+def text_preview(text: str) -> str:
+    """Truncate extracted text to the preview returned by the API."""
+    return text[:500] + "..." if len(text) > 500 else text
+
+
+def upload_result(file_content: bytes, filename: str, extraction: ResumeExtraction,
+                  taxonomy: Taxonomy, text_mode: str = "preview") -> dict:
+    """
+    Build the upload response, storing the candidate when the store is enabled.
+    
+    Args:
+        file_content: File content as bytes
+        filename: Uploaded file name
+        extraction: Extracted skills, text and skill evidence
+        taxonomy: Taxonomy the skills were matched with
+        text_mode: One of TEXT_MODES
+        
+    Returns:
+        Upload response payload
+    """
+    result = {
+        "candidate_skills": extraction.skills,
+        "candidate_skill_ids": [taxonomy.matcher.skill_id(skill) for skill in extraction.skills],
+        "skill_evidence": extraction.evidence,
+        "taxonomy_version": taxonomy.version
+    }
+    if text_mode == "full":
+        result["extracted_text"] = extraction.text
+    elif text_mode == "preview":
+        result["extracted_text"] = text_preview(extraction.text)
+    if candidate_store is not None:
+        result["candidate_id"] = candidate_store.add(
+            content_hash(file_content), extraction.skills, filename=filename
+        )
+    return result
+
+
+def process_upload(file_content: bytes, file_extension: str, filename: str,
+                   text_mode: str = "preview") -> dict:
+    """
+    Extract skills from an uploaded resume and build the upload response.
+    
+    Args:
+        file_content: File content as bytes
+        file_extension: File extension (e.g., '.pdf', '.docx')
+        filename: Uploaded file name
+        text_mode: One of TEXT_MODES
+        
+    Returns:
+        Upload response payload
+    """
+    taxonomy = resume_analyzer.taxonomy
+    extraction = resume_analyzer.extract_resume(file_content, file_extension, taxonomy=taxonomy)
+    return upload_result(file_content, filename, extraction, taxonomy, text_mode)
+
+
+def run_upload_job(report, file_content: bytes, file_extension: str, filename: str,
+                   text_mode: str = "preview") -> dict:
+    """
+    Background job behind POST /upload_resume?async=1.
+    
+    Args:
+        report: Progress callback from the job runner
+        file_content: File content as bytes
+        file_extension: File extension (e.g., '.pdf', '.docx')
+        filename: Uploaded file name
+        text_mode: One of TEXT_MODES
+        
+    Returns:
+        Same payload as a synchronous upload
+    """
+    taxonomy = resume_analyzer.taxonomy
+    deadline = time.monotonic() + job_extraction_timeout
+    while True:
+        try:
+            extraction = resume_analyzer.extract_resume(
+                file_content, file_extension, progress=report, timeout=job_extraction_timeout,
+                taxonomy=taxonomy
+            )
+            break
+        except ExtractionBusyError as e:
+            # Jobs wait for a free extraction slot instead of failing
+            if time.monotonic() > deadline:
+                metrics.count_error("upload_job", e)
+                raise
+            report(0.0, "waiting")
+            time.sleep(0.5)
+        except Exception as e:
+            metrics.count_error("upload_job", e)
+            raise
+    
+    return upload_result(file_content, filename, extraction, taxonomy, text_mode)
+
+
+def job_event(job: dict) -> str:
+    """
+    Format a job state as a server-sent event. Its ID is the job's update
+    time, which a reconnecting client sends back as Last-Event-ID.
+    
+    Args:
+        job: Job state
+        
+    Returns:
+        Event text
+    """
+    return f"id: {job['updated_at']!r}\nevent: {job['status']}\ndata: {json.dumps(job)}\n\n"
+
+
+def read_last_event_id(value: Optional[str]) -> Optional[float]:
+    """
+    Read the Last-Event-ID header of a reconnecting event stream.
+    
+    Args:
+        value: Header value, if any
+        
+    Returns:
+        Update time of the last job state the client saw, or None
+    """
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def skill_sections_error(skill_sections) -> Optional[str]:
+    """
+    Validate the optional skill_sections of an analysis request.
+    
+    Args:
+        skill_sections: Value from the request payload
+        
+    Returns:
+        Error message, or None when the value is valid
+    """
+    if skill_sections is None:
+        return None
+    if not isinstance(skill_sections, dict) or not all(
+        isinstance(section, str) or section is None for section in skill_sections.values()
+    ):
+        return "skill_sections must map skill names to section names"
+    return None
+
+
+def read_skill_names(skills) -> List[str]:
+    """
+    Validate a list of skill names from an analysis request.
+    
+    Args:
+        skills: Value from the request payload
+        
+    Returns:
+        The skill names
+        
+    Raises:
+        ValueError: If the value is not a list of strings
+    """
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("candidate_skills must be a list of skill names")
+    return skills
+
+
+def read_candidate_skills(candidate: dict, taxonomy: Taxonomy,
+                          taxonomy_version: Optional[str]) -> Union[List[str], SkillSet]:
+    """
+    Read the skills of a candidate from an analysis request.
+    
+    Skills are given by name in candidate_skills or, for high-volume clients,
+    by skill ID in candidate_skill_ids or as a packed bitset in
+    candidate_skill_bits (base64 of SkillSet.to_bytes). Skill IDs index the
+    vocabulary returned by /skills and are only valid for the taxonomy
+    version named in taxonomy_version.
+    
+    Args:
+        candidate: Request payload, or one candidate of a batch request
+        taxonomy: Current taxonomy
+        taxonomy_version: taxonomy_version of the request payload
+        
+    Returns:
+        Skill names, or a SkillSet when skill IDs were given
+        
+    Raises:
+        TaxonomyVersionMismatchError: If skill IDs were given for another
+            taxonomy version
+        ValueError: If the skill names or IDs are malformed
+    """
+    if "candidate_skill_ids" not in candidate and "candidate_skill_bits" not in candidate:
+        return read_skill_names(candidate.get("candidate_skills") or [])
+    
+    if taxonomy_version != taxonomy.version:
+        raise TaxonomyVersionMismatchError(
+            f"Skill IDs require taxonomy_version {taxonomy.version}; fetch the vocabulary again from /skills"
+        )
+    size = len(taxonomy.matcher)
+    if "candidate_skill_bits" in candidate:
+        try:
+            return SkillSet.from_base64(candidate["candidate_skill_bits"], size)
+        except (TypeError, ValueError):
+            raise ValueError("candidate_skill_bits must be a base64 skill bitset of the current taxonomy")
+    if not isinstance(candidate["candidate_skill_ids"], list):
+        raise ValueError("candidate_skill_ids must be a list of skill IDs")
+    return SkillSet.from_ids(candidate["candidate_skill_ids"], size)
+
+
+class RequestValidationError(ValueError):
+    """Raised by the request readers shared with the ASGI app; carries the HTTP status to answer with."""
+    
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def read_text_mode(args) -> str:
+    """
+    Read how much extracted text an upload request wants back.
+    
+    Args:
+        args: Query string arguments
+        
+    Returns:
+        One of TEXT_MODES
+        
+    Raises:
+        RequestValidationError: If text is not one of TEXT_MODES
+    """
+    text_mode = args.get("text", "none" if args.get("compact") == "1" else "preview")
+    if text_mode not in TEXT_MODES:
+        raise RequestValidationError(f"text must be one of: {', '.join(TEXT_MODES)}")
+    return text_mode
+
+
+def upload_extension(filename: Optional[str]) -> str:
+    """
+    Validate the name of an uploaded file.
+    
+    Args:
+        filename: Name of the uploaded file, if any
+        
+    Returns:
+        Lowercase file extension, one of UPLOAD_EXTENSIONS
+        
+    Raises:
+        RequestValidationError: If no file was sent or its type is unsupported
+    """
+    if not filename:
+        raise RequestValidationError("No file provided")
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in UPLOAD_EXTENSIONS:
+        raise RequestValidationError("Unsupported file format. Please upload PDF or DOCX files only.")
+    return file_extension
+
+
+def queued_upload(job_id: str) -> tuple:
+    """
+    Build the 202 response to an upload queued as a background job.
+    
+    Args:
+        job_id: Job ID
+        
+    Returns:
+        Tuple of (payload, headers)
+    """
+    status_url = f"/jobs/{job_id}"
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": status_url,
+        "events_url": f"{status_url}/events"
+    }, {"Location": status_url}
+
+
+def read_scoring(payload: dict) -> str:
+    """
+    Read the scoring mode of an analysis request.
+    
+    Args:
+        payload: Request payload
+        
+    Returns:
+        One of SCORING_MODES, the server default when not given
+        
+    Raises:
+        RequestValidationError: If the mode is unknown
+    """
+    scoring = payload.get("scoring", scoring_mode)
+    if scoring not in SCORING_MODES:
+        raise RequestValidationError(f"scoring must be one of: {', '.join(SCORING_MODES)}")
+    return scoring
+
+
+class AnalyzeRequest(NamedTuple):
+    """Validated /analyze request."""
+    candidate_skills: Union[List[str], SkillSet]
+    scoring: str
+
+
+def read_analyze_request(payload: dict, taxonomy: Taxonomy) -> AnalyzeRequest:
+    """
+    Validate an /analyze request.
+    
+    Args:
+        payload: Request payload
+        taxonomy: Current taxonomy
+        
+    Returns:
+        Candidate skills and scoring mode
+        
+    Raises:
+        RequestValidationError: With status 409 if skill IDs were given for
+            another taxonomy version, 400 for any other invalid request
+    """
+    try:
+        candidate_skills = read_candidate_skills(payload, taxonomy, payload.get("taxonomy_version"))
+    except TaxonomyVersionMismatchError as e:
+        raise RequestValidationError(str(e), 409)
+    except ValueError as e:
+        raise RequestValidationError(str(e))
+    if not candidate_skills:
+        raise RequestValidationError("Candidate skills cannot be empty")
+    if not payload.get("job_description") and not payload.get("jd_id"):
+        raise RequestValidationError("Job description cannot be empty")
+    sections_error = skill_sections_error(payload.get("skill_sections"))
+    if sections_error:
+        raise RequestValidationError(sections_error)
+    return AnalyzeRequest(candidate_skills, read_scoring(payload))
+
+
+class BatchRequest(NamedTuple):
+    """Validated /analyze/batch request."""
+    candidate_ids: List
+    candidate_skills: List[Union[List[str], SkillSet]]
+    candidate_sections: List[Optional[dict]]
+    top_k: Optional[int]
+    scoring: str
+
+
+def read_batch_request(payload: dict, taxonomy: Taxonomy) -> BatchRequest:
+    """
+    Validate an /analyze/batch request.
+    
+    Args:
+        payload: Request payload
+        taxonomy: Current taxonomy
+        
+    Returns:
+        Candidates (IDs, skills and skill sections), top_k and scoring mode
+        
+    Raises:
+        RequestValidationError: With status 409 if skill IDs were given for
+            another taxonomy version, 400 for any other invalid request
+    """
+    if not payload.get("job_description") and not payload.get("jd_id"):
+        raise RequestValidationError("Job description cannot be empty")
+    
+    candidates = payload.get("candidates")
+    if not candidates or not isinstance(candidates, list):
+        raise RequestValidationError("Candidates cannot be empty")
+    
+    candidate_ids = []
+    candidate_skills = []
+    candidate_sections = []
+    for index, candidate in enumerate(candidates):
+        if isinstance(candidate, dict):
+            candidate_ids.append(candidate.get("id", index))
+            try:
+                candidate_skills.append(
+                    read_candidate_skills(candidate, taxonomy, payload.get("taxonomy_version"))
+                )
+            except TaxonomyVersionMismatchError as e:
+                raise RequestValidationError(str(e), 409)
+            except ValueError as e:
+                raise RequestValidationError(str(e))
+            candidate_sections.append(candidate.get("skill_sections"))
+            sections_error = skill_sections_error(candidate.get("skill_sections"))
+            if sections_error:
+                raise RequestValidationError(sections_error)
+        else:
+            candidate_ids.append(index)
+            try:
+                candidate_skills.append(read_skill_names(candidate))
+            except ValueError:
+                raise RequestValidationError("Each candidate must be an object or a list of skill names")
+            candidate_sections.append(None)
+    
+    top_k = payload.get("top_k")
+    if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+        raise RequestValidationError("top_k must be a positive integer")
+    
+    return BatchRequest(candidate_ids, candidate_skills, candidate_sections, top_k, read_scoring(payload))
+
+
+def batch_lines(results: Iterator[dict], candidate_ids: List, args) -> Iterator[str]:
+    """
+    Format ranked batch results as NDJSON lines, as they are consumed.
+    
+    Args:
+        results: Results of ResumeAnalyzer.analyze_many
+        candidate_ids: ID of each candidate, by candidate index
+        args: Query string arguments, for select_fields
+        
+    Yields:
+        One JSON line per result
+    """
+    for result in results:
+        result["candidate_id"] = candidate_ids[result.pop("candidate_index")]
+        yield app.json.dumps(select_fields(result, args), sort_keys=False) + "\n"
 
 
 @app.route("/")
@@ -36,7 +723,17 @@ def root():
         "endpoints": {
             "upload_resume": "POST /upload_resume",
             "analyze": "POST /analyze",
-            "health": "GET /health"
+            "job_descriptions": "POST /job_descriptions",
+            "analyze_batch": "POST /analyze/batch",
+            "health": "GET /health",
+            "ready": "GET /ready",
+            "cache_stats": "GET /cache/stats",
+            "job_status": "GET /jobs/<job_id>",
+            "job_events": "GET /jobs/<job_id>/events",
+            "search": "POST /search",
+            "metrics": "GET /metrics",
+            "candidate": "GET /candidates/<candidate_id>",
+            "taxonomy": "GET /taxonomy"
         }
     }
 
@@ -47,6 +744,56 @@ def health_check():
     return {"status": "healthy", "message": "AI Resume Analyzer API is running"}
 
 
+@app.route("/ready")
+def readiness_check():
+    """
+    Readiness check: whether this worker has warmed up and can take traffic
+    without a cold first request.
+    
+    Returns:
+        Warm-up state (200), or the same with a 503 before warm-up
+    """
+    status = analyzer_warm_up.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
+@app.route("/metrics")
+def get_metrics():
+    """
+    Prometheus metrics of this worker process.
+    
+    Returns:
+        Stage latency and input size histograms, error counts and cache gauges
+    """
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/taxonomy")
+def taxonomy_status():
+    """
+    State of the skills taxonomy in this worker process.
+    
+    Returns:
+        Current taxonomy version and size, reload count and the last reload error
+    """
+    return jsonify(taxonomy_manager.status())
+
+
+@app.route("/cache/stats")
+def cache_stats():
+    """
+    Get extraction cache counters.
+    
+    Returns:
+        Hit, miss and eviction counts of the extraction cache, and of the job
+        description cache under "job_descriptions"
+    """
+    jd_stats = {"enabled": False} if jd_cache is None else {"enabled": True, **jd_cache.stats()}
+    if resume_analyzer.extraction_cache is None:
+        return {"enabled": False, "job_descriptions": jd_stats}
+    return {"enabled": True, **resume_analyzer.extraction_cache.stats(), "job_descriptions": jd_stats}
+
+
 @app.route("/upload_resume", methods=["POST"])
 def upload_resume():
     """
@@ -54,24 +801,19 @@ def upload_resume():
     
     Args:
         file: Resume file (PDF or DOCX)
+        async: When "1", queue the upload and return a job ID immediately
+        text: How much extracted text to return, one of TEXT_MODES
+            (default "preview", or "none" with compact=1)
+        fields: Optional comma-separated keys of the result to return
         
     Returns:
-        Extracted skills and text from resume
+        Extracted skills with their evidence spans and text from resume, or
+        the queued job (202)
     """
     try:
-        # Validate file type
-        if 'file' not in request.files:
-            return jsonify({"error": "No file provided"}), 400
-        
-        file = request.files['file']
-        if not file.filename:
-            return jsonify({"error": "No file provided"}), 400
-        
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in ['.pdf', '.docx']:
-            return jsonify({
-                "error": "Unsupported file format. Please upload PDF or DOCX files only."
-            }), 400
+        text_mode = read_text_mode(request.args)
+        file = request.files.get('file')
+        file_extension = upload_extension(file.filename if file else None)
         
         # Read file content
         file_content = file.read()
@@ -79,18 +821,125 @@ def upload_resume():
         if len(file_content) == 0:
             return jsonify({"error": "Empty file provided"}), 400
         
+        if request.args.get("async") == "1":
+            job_id = job_runner.submit(run_upload_job, file_content, file_extension, file.filename, text_mode)
+            payload, headers = queued_upload(job_id)
+            return jsonify(payload), 202, headers
+        
         # Extract skills from resume
-        candidate_skills, extracted_text = resume_analyzer.extract_skills_from_resume(
-            file_content, file_extension
-        )
+        return jsonify(select_fields(
+            process_upload(file_content, file_extension, file.filename, text_mode), request.args
+        ))
+        
+    except RequestValidationError as e:
+        return jsonify({"error": str(e)}), e.status
+    except (ExtractionBusyError, JobQueueFullError) as e:
+        metrics.count_error("upload_resume", e)
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+    except ExtractionTimeoutError as e:
+        metrics.count_error("upload_resume", e)
+        return jsonify({"error": str(e)}), 504
+    except DocumentTooLargeError as e:
+        metrics.count_error("upload_resume", e)
+        return jsonify({"error": str(e)}), 413
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"Request body is larger than {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+    except Exception as e:
+        metrics.count_error("upload_resume", e)
+        return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
+
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    """
+    Get the state of a background job.
+    
+    Args:
+        job_id: Job ID returned by POST /upload_resume?async=1
+        wait: Optional seconds (up to MAX_POLL_SECONDS) to long-poll until
+            the job finishes
+        
+    Returns:
+        Job status, progress, and result or error once finished
+    """
+    try:
+        wait = min(float(request.args.get("wait", 0)), max_poll_seconds)
+    except ValueError:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+    
+    if wait > 0:
+        job = job_runner.wait(job_id, wait)
+    else:
+        job = job_runner.store.get(job_id)
+    
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """
+    Stream job progress as server-sent events.
+    
+    The stream ends after MAX_POLL_SECONDS; the client reconnects and
+    resumes after the last state it saw. Once the client has seen the
+    finished state, reconnecting gets 204, which stops EventSource.
+    
+    Args:
+        job_id: Job ID returned by POST /upload_resume?async=1
+        Last-Event-ID: Header sent by reconnecting clients
         
+    Returns:
+        text/event-stream of job states, ending once the job finishes
+    """
+    job = job_runner.store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    since = read_last_event_id(request.headers.get("Last-Event-ID"))
+    if job["status"] in FINISHED_STATES and job["updated_at"] == since:
+        return Response(status=204)
+    
+    def generate():
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for job in job_runner.watch(job_id, timeout=max_poll_seconds, since=since):
+            yield job_event(job)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/job_descriptions", methods=["POST"])
+def register_job_description():
+    """
+    Register a job description once, to analyze candidates against its ID.
+    
+    Args:
+        request: JSON with job_description
+        
+    Returns:
+        jd_id to pass to /analyze and /analyze/batch, and the required skills
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("job_description"):
+            return jsonify({"error": "Job description cannot be empty"}), 400
+        
+        jd_id, required_skills, taxonomy_version = resume_analyzer.register_job_description(
+            payload["job_description"]
+        )
         return jsonify({
-            "candidate_skills": candidate_skills,
-            "extracted_text": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
-        })
+            "jd_id": jd_id,
+            "required_skills": required_skills,
+            "taxonomy_version": taxonomy_version
+        }), 201
         
     except Exception as e:
-        return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
+        metrics.count_error("job_descriptions", e)
+        return jsonify({"error": f"Error registering job description: {str(e)}"}), 500
 
 
 @app.route("/analyze", methods=["POST"])
@@ -99,46 +948,161 @@ def analyze_resume():
     Analyze candidate skills against job description.
     
     Args:
-        request: AnalysisRequest containing candidate skills and job description
+        request: JSON with the candidate skills (see read_candidate_skills)
+            and either the job description or the jd_id of a registered
+            one, plus optional skill_sections to weight matches by resume
+            section
+        compact: When "1", leave the candidate skills out of the result
+        fields: Optional comma-separated keys of the result to return
         
     Returns:
         Analysis results with match score and suggestions
     """
     try:
         # Validate input
-        if not request.json.get("candidate_skills"):
-            return jsonify({"error": "Candidate skills cannot be empty"}), 400
-        
-        if not request.json.get("job_description"):
-            return jsonify({"error": "Job description cannot be empty"}), 400
+        try:
+            analysis = read_analyze_request(request.json, resume_analyzer.taxonomy)
+        except RequestValidationError as e:
+            return jsonify({"error": str(e)}), e.status
         
         # Perform analysis
         analysis_result = resume_analyzer.analyze_match(
-            request.json["candidate_skills"], 
-            request.json["job_description"]
+            analysis.candidate_skills,
+            request.json.get("job_description"),
+            scoring=analysis.scoring,
+            jd_id=request.json.get("jd_id"),
+            skill_sections=request.json.get("skill_sections")
         )
         
-        return jsonify(analysis_result)
+        return jsonify(select_fields(analysis_result, request.args, ANALYZE_ECHOED_FIELDS))
         
+    except JobDescriptionNotFoundError:
+        return jsonify({"error": "Job description not found"}), 404
     except Exception as e:
+        metrics.count_error("analyze", e)
         return jsonify({"error": f"Error analyzing resume: {str(e)}"}), 500
 
 
+@app.route("/analyze/batch", methods=["POST"])
+def analyze_batch():
+    """
+    Rank many candidates against one job description.
+    
+    Args:
+        request: JSON with job_description (or the jd_id of a registered
+            one), candidates (list of {"id", "candidate_skills",
+            "skill_sections"} objects or plain skill lists; see
+            read_candidate_skills for skill IDs), an optional top_k and an
+            optional scoring mode
+        fields: Optional comma-separated keys of each result to return
+        
+    Returns:
+        Newline-delimited JSON stream of analysis results, best match first
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        try:
+            batch = read_batch_request(payload, resume_analyzer.taxonomy)
+        except RequestValidationError as e:
+            return jsonify({"error": str(e)}), e.status
+        
+        results = resume_analyzer.analyze_many(
+            payload.get("job_description"), batch.candidate_skills, top_k=batch.top_k, scoring=batch.scoring,
+            jd_id=payload.get("jd_id"), skill_sections=batch.candidate_sections
+        )
+        lines = batch_lines(results, batch.candidate_ids, request.args)
+        return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+        
+    except JobDescriptionNotFoundError:
+        return jsonify({"error": "Job description not found"}), 404
+    except Exception as e:
+        metrics.count_error("analyze_batch", e)
+        return jsonify({"error": f"Error analyzing candidates: {str(e)}"}), 500
+
+
+@app.route("/search", methods=["POST"])
+def search_candidates():
+    """
+    Find stored candidates matching a job description or a list of skills.
+    
+    Args:
+        request: JSON with job_description or skills, optional must_have
+            skills every result must have, and optional top_k (default 20)
+        
+    Returns:
+        Required skills, number of matching candidates and the top_k results
+    """
+    if candidate_store is None:
+        return jsonify({"error": "Candidate store is not enabled"}), 404
+    
+    try:
+        payload = request.get_json(silent=True) or {}
+        
+        if payload.get("job_description"):
+            required_skills = resume_analyzer.extract_skills_from_jd(payload["job_description"])
+        elif payload.get("skills"):
+            required_skills = list(dict.fromkeys(payload["skills"]))
+        else:
+            return jsonify({"error": "Provide a job description or a list of skills"}), 400
+        
+        top_k = payload.get("top_k", 20)
+        if not isinstance(top_k, int) or top_k < 1:
+            return jsonify({"error": "top_k must be a positive integer"}), 400
+        
+        result = candidate_store.search(required_skills, top_k=top_k, must_have=payload.get("must_have"))
+        return jsonify({"required_skills": required_skills, **result})
+        
+    except Exception as e:
+        metrics.count_error("search", e)
+        return jsonify({"error": f"Error searching candidates: {str(e)}"}), 500
+
+
+@app.route("/candidates/<int:candidate_id>")
+def get_candidate(candidate_id):
+    """
+    Get a stored candidate.
+    
+    Args:
+        candidate_id: Candidate ID returned by /upload_resume
+        
+    Returns:
+        Stored candidate with its skills
+    """
+    if candidate_store is None:
+        return jsonify({"error": "Candidate store is not enabled"}), 404
+    
+    candidate = candidate_store.get(candidate_id)
+    if candidate is None:
+        return jsonify({"error": "Candidate not found"}), 404
+    return jsonify(candidate)
+
+
 @app.route("/skills")
 def get_skills():
     """
     Get all available skills organized by category.
     
+    The ETag is the taxonomy version: clients revalidating with
+    If-None-Match get an empty 304 until the taxonomy changes.
+    
+    Args:
+        fields: Optional comma-separated keys of the result to return
+    
     Returns:
-        Dictionary of skills by category
+        Dictionary of skills by category, aliases, the skill names by skill
+        ID (vocabulary) and the taxonomy version
     """
     try:
-        skills = resume_analyzer.get_skills_by_category()
-        return {"skills": skills}
+        taxonomy = resume_analyzer.taxonomy
+        headers = {"ETag": f'W/"{taxonomy.version}"', "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+            return "", 304, headers
+        return select_fields({
+            "skills": taxonomy.skills_database,
+            "aliases": taxonomy.aliases,
+            "vocabulary": list(taxonomy.matcher.skills),
+            "taxonomy_version": taxonomy.version
+        }, request.args), headers
     except Exception as e:
+        metrics.count_error("skills", e)
         return jsonify({"error": f"Error retrieving skills: {str(e)}"}), 500
-
-
-if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
-
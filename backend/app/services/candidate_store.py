@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class CandidateStore:
+    """
+    Persistent store of analyzed resumes with an inverted skill index.
+
+    Candidates live in a SQLite file; each row keeps its skill IDs as a packed
+    uint32 blob. In memory, every skill ID maps to a sorted posting list of
+    candidate IDs. Postings are split into a base part, rebuilt in one
+    vectorized pass, and a small append-only delta for candidates added
+    since. Candidate IDs only grow, so base + delta stays sorted.
+
+    Several processes may share one store file: each keeps its own index and
+    catches up with rows written by the others before every query.
+    """
+
+    def __init__(self, path: str, rebuild_threshold: int = 100000):
+        """
+        Open (or create) a store and load its index.
+
+        Args:
+            path: SQLite database file
+            rebuild_threshold: Merge the delta into the base index once it
+                holds this many postings
+        """
+        self.path = path
+        self.rebuild_threshold = rebuild_threshold
+
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_names: List[str] = []
+        self._base_postings = np.zeros(0, dtype=np.uint32)
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._delta: Dict[int, array] = {}
+        self._delta_size = 0
+        self._last_candidate_id = 0
+        self._last_skill_id = 0
+        self.candidate_count = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS skills (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                "id INTEGER PRIMARY KEY, content_hash TEXT UNIQUE NOT NULL, filename TEXT, "
+                "skills TEXT NOT NULL, skill_ids BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+        self.rebuild()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _sync_skills(self, conn: sqlite3.Connection) -> None:
+        for skill_id, name in conn.execute(
+            "SELECT id, name FROM skills WHERE id > ? ORDER BY id", (self._last_skill_id,)
+        ):
+            self._skill_ids[name.lower()] = skill_id
+            while len(self._skill_names) <= skill_id:
+                self._skill_names.append("")
+            self._skill_names[skill_id] = name
+            self._last_skill_id = skill_id
+
+    def rebuild(self) -> None:
+        """Rebuild the whole in-memory index from the store file."""
+        with self._lock:
+            conn = self._connect()
+            self._sync_skills(conn)
+
+            candidate_ids = array("I")
+            counts = []
+            blobs = []
+            for candidate_id, blob in conn.execute("SELECT id, skill_ids FROM candidates ORDER BY id"):
+                candidate_ids.append(candidate_id)
+                counts.append(len(blob) // 4)
+                blobs.append(blob)
+
+            skill_ids = np.frombuffer(b"".join(blobs), dtype=np.uint32)
+            owners = np.repeat(np.frombuffer(candidate_ids, dtype=np.uint32), counts)
+
+            # A stable sort by skill keeps each posting list in candidate order
+            order = np.argsort(skill_ids, kind="stable")
+            self._base_postings = owners[order]
+            self._base_offsets = np.searchsorted(
+                skill_ids[order], np.arange(len(self._skill_names) + 1)
+            ).astype(np.int64)
+
+            self._delta = {}
+            self._delta_size = 0
+            self._last_candidate_id = int(candidate_ids[-1]) if len(candidate_ids) else 0
+            self.candidate_count = len(candidate_ids)
+
+    def _sync(self) -> None:
+        """Index candidates written since the last sync, possibly by other processes."""
+        with self._lock:
+            conn = self._connect()
+            self._sync_skills(conn)
+            for candidate_id, blob in conn.execute(
+                "SELECT id, skill_ids FROM candidates WHERE id > ? ORDER BY id", (self._last_candidate_id,)
+            ):
+                for skill_id in np.frombuffer(blob, dtype=np.uint32):
+                    self._delta.setdefault(int(skill_id), array("I")).append(candidate_id)
+                    self._delta_size += 1
+                self._last_candidate_id = candidate_id
+                self.candidate_count += 1
+
+            if self._delta_size >= self.rebuild_threshold:
+                self.rebuild()
+
+    def _intern_skills(self, conn: sqlite3.Connection, skills: List[str]) -> List[int]:
+        conn.executemany(
+            "INSERT OR IGNORE INTO skills (name) VALUES (?)", [(skill,) for skill in skills]
+        )
+        self._sync_skills(conn)
+        return sorted({self._skill_ids[skill.lower()] for skill in skills})
+
+    def add(self, content_hash: str, skills: List[str], filename: Optional[str] = None) -> int:
+        """
+        Store a candidate and index its skills.
+
+        Args:
+            content_hash: Content hash of the resume file; a resume that is
+                already stored keeps its existing ID
+            skills: Extracted skills
+            filename: Original file name
+
+        Returns:
+            Candidate ID
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                row = conn.execute(
+                    "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                if row is not None:
+                    return row[0]
+
+                skill_ids = array("I", self._intern_skills(conn, skills))
+                cursor = conn.execute(
+                    "INSERT INTO candidates (content_hash, filename, skills, skill_ids, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, filename, json.dumps(skills), skill_ids.tobytes(), time.time())
+                )
+                candidate_id = cursor.lastrowid
+            self._sync()
+            return candidate_id
+
+    def _postings(self, skill_id: int) -> np.ndarray:
+        parts = []
+        if skill_id + 1 < len(self._base_offsets):
+            start, stop = self._base_offsets[skill_id], self._base_offsets[skill_id + 1]
+            parts.append(self._base_postings[start:stop])
+        delta = self._delta.get(skill_id)
+        if delta is not None:
+            parts.append(np.frombuffer(delta, dtype=np.uint32))
+        if not parts:
+            return np.zeros(0, dtype=np.uint32)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def search(self, required_skills: List[str], top_k: int = 20,
+               must_have: Optional[List[str]] = None) -> Dict:
+        """
+        Find the candidates that best match a list of required skills.
+
+        Candidates are scored like ResumeAnalyzer.analyze_match: the
+        percentage of required skills they have.
+
+        Args:
+            required_skills: Skills to score against
+            top_k: Number of candidates to return
+            must_have: Skills every returned candidate must have
+
+        Returns:
+            Dictionary with the number of candidates having at least one
+            required skill and the top_k results, best first
+        """
+        self._sync()
+
+        with self._lock:
+            skill_ids = [self._skill_ids.get(skill.lower()) for skill in required_skills]
+            must_have_ids = [self._skill_ids.get(skill.lower()) for skill in must_have or []]
+            if None in must_have_ids:
+                return {"total_matches": 0, "results": []}
+
+            postings = [self._postings(skill_id) for skill_id in skill_ids if skill_id is not None]
+            required_postings = [self._postings(skill_id) for skill_id in must_have_ids]
+            size = self._last_candidate_id + 1
+
+        if not postings or not required_skills:
+            return {"total_matches": 0, "results": []}
+
+        # Union: count how many required skills each candidate has
+        matched_counts = np.bincount(np.concatenate(postings), minlength=size)
+        # Intersection: drop candidates missing any must-have skill
+        for posting in required_postings:
+            keep = np.zeros(size, dtype=bool)
+            keep[posting] = True
+            matched_counts[~keep] = 0
+
+        candidates = np.flatnonzero(matched_counts)
+        if len(candidates) > top_k:
+            best = np.argpartition(-matched_counts[candidates], top_k - 1)[:top_k]
+            candidates = candidates[best]
+        # Best score first, oldest candidate first among ties
+        candidates = candidates[np.lexsort((candidates, -matched_counts[candidates]))]
+
+        results = []
+        rows = self._load_candidates([int(candidate_id) for candidate_id in candidates])
+        for candidate_id in candidates:
+            row = rows[int(candidate_id)]
+            candidate_skills = {skill.lower() for skill in row["skills"]}
+            matched_skills = [skill for skill in required_skills if skill.lower() in candidate_skills]
+            missing_skills = [skill for skill in required_skills if skill.lower() not in candidate_skills]
+            score = (len(matched_skills) / len(required_skills)) * 100
+            results.append({
+                "candidate_id": int(candidate_id),
+                "filename": row["filename"],
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "score": round(score, 2)
+            })
+
+        return {"total_matches": int(np.count_nonzero(matched_counts)), "results": results}
+
+    def _load_candidates(self, candidate_ids: List[int]) -> Dict[int, Dict]:
+        rows = {}
+        conn = self._connect()
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(candidate_ids), 500):
+            batch = candidate_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for candidate_id, filename, skills in conn.execute(
+                f"SELECT id, filename, skills FROM candidates WHERE id IN ({placeholders})", batch
+            ):
+                rows[candidate_id] = {"filename": filename, "skills": json.loads(skills)}
+        return rows
+
+    def get(self, candidate_id: int) -> Optional[Dict]:
+        """
+        Args:
+            candidate_id: Candidate ID
+
+        Returns:
+            Stored candidate, or None if it does not exist
+        """
+        row = self._connect().execute(
+            "SELECT id, content_hash, filename, skills, created_at FROM candidates WHERE id = ?",
+            (candidate_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "candidate_id": row[0],
+            "content_hash": row[1],
+            "filename": row[2],
+            "candidate_skills": json.loads(row[3]),
+            "created_at": row[4]
+        }
@@ -0,0 +1,199 @@
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.cache import LRUCache, SQLiteCache, content_hash
+from utils.skill_matcher import SkillMatcher
+
+
+class JobDescriptionNotFoundError(KeyError):
+    """Raised when a job description ID is unknown or has expired."""
+
+
+class JobTerms(NamedTuple):
+    """Skills required by a job description, ready for scoring."""
+
+    skills: List[str]
+    skill_ids: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def from_counts(cls, term_counts: Dict[int, int], matcher: SkillMatcher) -> "JobTerms":
+        """
+        Args:
+            term_counts: Mention count by skill ID, in order of first mention
+            matcher: Matcher the skill IDs belong to
+        """
+        skills = [matcher.skills[skill_id] for skill_id in term_counts]
+        return cls(
+            skills=skills,
+            skill_ids=np.fromiter(term_counts.keys(), dtype=np.int64, count=len(term_counts)),
+            counts=np.fromiter(term_counts.values(), dtype=np.int64, count=len(term_counts))
+        )
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes."""
+        return (sys.getsizeof(self.skills) + self.skill_ids.nbytes + self.counts.nbytes
+                + sum(sys.getsizeof(skill) for skill in self.skills) + 300)
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Normalize a job description so that reposts differing only in case or
+    spacing share an ID. Skill matching is case-insensitive and splits on
+    whitespace, so normalized text matches the same skills.
+    """
+    return " ".join(text.lower().split())
+
+
+def job_description_id(text: str) -> str:
+    """
+    Compute the ID of a job description.
+
+    Args:
+        text: Job description text
+
+    Returns:
+        Hex SHA-256 digest of the normalized text
+    """
+    return content_hash(normalize_job_description(text).encode("utf-8"))
+
+
+class JobDescriptionCache:
+    """
+    Cache of the skills required by job descriptions.
+
+    Entries are keyed by job description ID and taxonomy version, so a
+    taxonomy reload invalidates them. A byte-bounded in-memory LRU with a TTL
+    sits in front of an optional SQLite tier that the workers on a host can
+    share; the on-disk tier stores mention counts by skill ID.
+    """
+
+    def __init__(self, max_memory_bytes: int = 16 * 1024 * 1024, ttl: Optional[float] = 3600.0,
+                 disk_path: Optional[str] = None, max_disk_entries: Optional[int] = None):
+        """
+        Args:
+            max_memory_bytes: Size bound of the in-memory tier
+            ttl: Seconds an entry stays valid, or None to keep it until evicted
+            disk_path: SQLite file for the shared on-disk tier, if any
+            max_disk_entries: Entry bound of the on-disk tier
+        """
+        self.memory = LRUCache(max_memory_bytes, ttl=ttl)
+        self.disk = SQLiteCache(disk_path, max_entries=max_disk_entries, ttl=ttl) if disk_path else None
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, jd_id: str, version: str, matcher: SkillMatcher) -> Optional[JobTerms]:
+        """
+        Look up the required skills of a job description.
+
+        Args:
+            jd_id: Job description ID
+            version: Taxonomy version
+            matcher: Matcher of that taxonomy version
+
+        Returns:
+            Required skills, or None on a miss
+        """
+        key = f"{jd_id}:{version}"
+        terms = self.memory.get(key)
+        if terms is not None:
+            self.hits += 1
+            self.memory_hits += 1
+            return terms
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                terms = JobTerms.from_counts(dict(entry), matcher)
+                self.memory.set(key, terms, terms.size)
+                return terms
+
+        self.misses += 1
+        return None
+
+    def set(self, jd_id: str, version: str, terms: JobTerms) -> None:
+        """
+        Store the required skills of a job description.
+
+        Args:
+            jd_id: Job description ID
+            version: Taxonomy version
+            terms: Required skills
+        """
+        key = f"{jd_id}:{version}"
+        self.memory.set(key, terms, terms.size)
+        if self.disk is not None:
+            self.disk.set(key, [[int(skill_id), int(count)] for skill_id, count in zip(terms.skill_ids, terms.counts)])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary of hit, miss and eviction counts and memory usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.memory.evictions,
+            "entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+            "max_memory_bytes": self.memory.max_bytes,
+            "disk_enabled": self.disk is not None
+        }
+
+
+class JobDescriptionStore:
+    """
+    Job descriptions registered once and then referred to by ID.
+
+    Texts live in a SQLite file so that every worker on the host can resolve
+    an ID, whichever worker registered it. Registering a text again refreshes
+    its expiry. Expired texts are deleted as new ones are registered.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: Optional[int] = 100000):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            ttl: Seconds a registered job description is kept, or None to keep it
+            max_entries: Most job descriptions kept; the least recently
+                registered go first, or None for no bound
+        """
+        self._texts = SQLiteCache(path, max_entries=max_entries, ttl=ttl)
+
+    def register(self, text: str) -> str:
+        """
+        Store a job description.
+
+        Args:
+            text: Job description text
+
+        Returns:
+            Job description ID
+        """
+        jd_id = job_description_id(text)
+        self._texts.set(jd_id, text)
+        return jd_id
+
+    def get(self, jd_id: str) -> Optional[str]:
+        """
+        Args:
+            jd_id: Job description ID
+
+        Returns:
+            Registered text, or None if the ID is unknown or has expired
+        """
+        return self._texts.get(jd_id)
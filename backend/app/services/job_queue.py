@@ -0,0 +1,360 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already waiting to run."""
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """Whether a process of this host is still running; unknown owners count as alive."""
+    if pid is None or os.name == "nt":
+        # Signal 0 would interrupt the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    SQLite-backed table of background jobs.
+
+    The table lives in a local file so that any worker process on the host
+    can report on a job, whichever worker is running it. Each thread of each
+    process uses its own connection.
+
+    Every job records the process that runs it. A queued or running job
+    whose process has exited (a worker that crashed or was restarted) is
+    reported as failed instead of staying unfinished forever.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        self.path = path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, progress REAL NOT NULL, "
+                "stage TEXT, result TEXT, error TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, owner INTEGER)"
+            )
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self) -> str:
+        """
+        Register a new queued job, run by this process.
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, progress, stage, created_at, updated_at, owner) "
+                "VALUES (?, ?, 0, ?, ?, ?, ?)",
+                (job_id, QUEUED, QUEUED, now, now, os.getpid())
+            )
+        return job_id
+
+    def update(self, job_id: str, status: Optional[str] = None, progress: Optional[float] = None,
+               stage: Optional[str] = None, result: Any = None, error: Optional[str] = None) -> None:
+        """
+        Update the given fields of a job.
+
+        Args:
+            job_id: Job ID
+            status: New status
+            progress: Completion between 0 and 1
+            stage: Human-readable name of the current step
+            result: JSON-serializable job result
+            error: Error message of a failed job
+        """
+        fields = {"updated_at": time.time()}
+        if status is not None:
+            fields["status"] = status
+        if progress is not None:
+            fields["progress"] = progress
+        if stage is not None:
+            fields["stage"] = stage
+        if result is not None:
+            fields["result"] = json.dumps(result)
+        if error is not None:
+            fields["error"] = error
+
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job as a dictionary, or None if it does not exist
+        """
+        row = self._connect().execute(
+            "SELECT id, status, progress, stage, result, error, created_at, updated_at, owner "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] not in FINISHED_STATES and not _process_alive(row[8]):
+            self._fail_orphaned([job_id])
+            return self.get(job_id)
+
+        job = {
+            "job_id": row[0],
+            "status": row[1],
+            "progress": round(row[2], 3),
+            "stage": row[3],
+            "created_at": row[6],
+            "updated_at": row[7]
+        }
+        if row[4] is not None:
+            job["result"] = json.loads(row[4])
+        if row[5] is not None:
+            job["error"] = row[5]
+        return job
+
+    def _fail_orphaned(self, job_ids: List[str]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ?, stage = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status NOT IN (?, ?)",
+                [(FAILED, FAILED, "The job was interrupted by a server restart. Please upload the file again.",
+                  now, job_id, DONE, FAILED) for job_id in job_ids]
+            )
+
+    def fail_orphaned(self, max_age: Optional[float] = None) -> int:
+        """
+        Mark unfinished jobs as failed when the process running them has
+        exited, or when they have not been updated for max_age seconds.
+
+        Args:
+            max_age: Age in seconds after which unfinished jobs are given
+                up on, or None to only check their processes
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        stale_before = time.time() - max_age if max_age is not None else None
+        job_ids = [
+            job_id for job_id, owner, updated_at in self._connect().execute(
+                "SELECT id, owner, updated_at FROM jobs WHERE status NOT IN (?, ?)", (DONE, FAILED)
+            )
+            if not _process_alive(owner) or (stale_before is not None and updated_at < stale_before)
+        ]
+        if job_ids:
+            self._fail_orphaned(job_ids)
+        return len(job_ids)
+
+    def prune(self, max_age: float) -> None:
+        """
+        Fail orphaned jobs and delete finished jobs that have not been
+        updated for max_age seconds.
+
+        Args:
+            max_age: Age in seconds
+        """
+        self.fail_orphaned(max_age)
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, time.time() - max_age)
+            )
+
+
+class JobRunner:
+    """
+    Runs jobs on a background thread pool and records their state in a JobStore.
+
+    A job function receives a report(progress, stage) callback as its first
+    argument and returns a JSON-serializable result.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, max_pending: int = 100,
+                 job_ttl: float = 24 * 3600):
+        """
+        Args:
+            store: Job table
+            max_workers: Number of jobs running at once
+            max_pending: Maximum number of queued plus running jobs
+            job_ttl: Seconds finished jobs are kept, and unfinished jobs
+                are given up on
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self.pending_jobs = 0
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._submitted = 0
+
+        # Jobs of processes that ran before this one and died can never finish
+        store.fail_orphaned()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork, so build the pool in the process using it
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="resume-job"
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> str:
+        """
+        Queue a job.
+
+        Args:
+            fn: Job function, called as fn(report, *args)
+            *args: Extra arguments for fn
+
+        Returns:
+            Job ID
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already in flight
+        """
+        with self._lock:
+            if self.pending_jobs >= self.max_pending:
+                raise JobQueueFullError("Too many documents are waiting to be processed. Please retry shortly.")
+            self.pending_jobs += 1
+            self._submitted += 1
+            prune = self._submitted % 100 == 1
+            executor = self._get_executor()
+
+        if prune:
+            self.store.prune(self.job_ttl)
+
+        job_id = None
+        try:
+            job_id = self.store.create()
+            executor.submit(self._run, job_id, fn, args)
+        except BaseException as e:
+            with self._lock:
+                self.pending_jobs -= 1
+            if job_id is not None:
+                self.store.update(job_id, status=FAILED, stage=FAILED, error=str(e))
+            raise
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[..., Any], args: tuple) -> None:
+        def report(progress: float, stage: str) -> None:
+            self.store.update(job_id, progress=progress, stage=stage)
+
+        try:
+            self.store.update(job_id, status=RUNNING, stage=RUNNING)
+            result = fn(report, *args)
+            self.store.update(job_id, status=DONE, progress=1.0, stage=DONE, result=result)
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, stage=FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self.pending_jobs -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the job threads.
+
+        Args:
+            wait: Let queued and running jobs finish first; otherwise queued
+                jobs are dropped, and reported as failed once this process
+                has exited
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None and self._executor_pid == os.getpid():
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def wait(self, job_id: str, timeout: float, poll_interval: float = 0.1) -> Optional[Dict]:
+        """
+        Long-poll a job until it finishes or timeout seconds pass.
+
+        Args:
+            job_id: Job ID
+            timeout: Maximum seconds to wait
+            poll_interval: Seconds between checks of the job table
+
+        Returns:
+            Latest job state, or None if the job does not exist
+        """
+        deadline = time.monotonic() + timeout
+        job = self.store.get(job_id)
+        while job is not None and job["status"] not in FINISHED_STATES and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            job = self.store.get(job_id)
+        return job
+
+    def watch(self, job_id: str, timeout: float, poll_interval: float = 0.25,
+              since: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Yield a job's state every time it changes, until it finishes.
+
+        Args:
+            job_id: Job ID
+            timeout: Maximum seconds to watch
+            poll_interval: Seconds between checks of the job table
+            since: Update time of a state the caller already has; it is not
+                yielded again
+
+        Yields:
+            Job states; the last one is finished unless timeout passed first
+        """
+        deadline = time.monotonic() + timeout
+        last_update = since
+        while time.monotonic() < deadline:
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield job
+            if job["status"] in FINISHED_STATES:
+                return
+            time.sleep(poll_interval)
@@ -1,122 +1,598 @@
 import json
 import os
 import sys
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 # Add the app directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.text_extractor import extract_text_from_file
-from utils.text_preprocessor import extract_skills_from_text
+from utils.text_extractor import iter_text_from_file
+from utils.skill_matcher import SkillMatcher
+from utils.extraction_pool import ExtractionPool
+from utils.cache import ExtractionCache, content_hash
+from utils.metrics import metrics
+from utils.sections import section_weight, skill_evidence
+from utils.single_flight import SingleFlight
+from utils.skill_set import SkillSet
+from utils.upload_guard import UploadGuard
+from services.job_descriptions import (
+    JobDescriptionCache, JobDescriptionNotFoundError, JobDescriptionStore, JobTerms, job_description_id
+)
+from services.scoring import (
+    SkillStats, WeightedScorer, csr_matvec, encode_candidates, encode_section_weights
+)
+from services.taxonomy import Taxonomy, TaxonomyManager
+
+
+class ResumeExtraction(NamedTuple):
+    """Skills extracted from a resume, with the text and where each skill was found."""
+    skills: List[str]
+    text: str
+    evidence: List[Dict]
 
 
 class ResumeAnalyzer:
-    def __init__(self):
-        """Initialize the ResumeAnalyzer with skills database."""
-        self.skills_database = self._load_skills_database()
+    def __init__(self, extraction_pool: Optional[ExtractionPool] = None,
+                 extraction_cache: Optional[ExtractionCache] = None,
+                 max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                 fast_layout: bool = False, skill_stats: Optional[SkillStats] = None,
+                 scoring: str = "ratio", taxonomy_manager: Optional[TaxonomyManager] = None,
+                 jd_cache: Optional[JobDescriptionCache] = None,
+                 jd_store: Optional[JobDescriptionStore] = None,
+                 single_flight: Optional[SingleFlight] = None, fuzzy_matching: bool = False,
+                 upload_guard: Optional[UploadGuard] = None):
+        """
+        Initialize the ResumeAnalyzer with skills database.
+        
+        Args:
+            extraction_pool: Process pool for text extraction; text is
+                extracted in the calling thread when omitted
+            extraction_cache: Cache of extraction results keyed by file content
+            max_pages: Only parse the first max_pages pages of a PDF
+            max_chars: Stop extracting text after max_chars characters
+            fast_layout: Use cheaper PDF layout analysis
+            skill_stats: Skill document frequencies used by weighted scoring;
+                kept in memory for this process when omitted
+            scoring: Default scoring mode, one of SCORING_MODES
+            taxonomy_manager: Source of the skills taxonomy; the bundled
+                taxonomy is loaded once when omitted
+            jd_cache: Cache of the skills required by job descriptions
+            jd_store: Registered job descriptions, referred to by ID
+            single_flight: Coalesces concurrent identical extractions and
+                analyses into one computation
+            fuzzy_matching: Also match misspelled and oddly spaced skill
+                names in resumes, such as "Kubernets" or "Postgre SQL"
+            upload_guard: Rejects oversized documents, or degrades their
+                parsing, before extraction starts
+        """
+        self.extraction_pool = extraction_pool
+        self.extraction_cache = extraction_cache
+        self.extraction_options = {
+            "max_pages": max_pages,
+            "max_chars": max_chars,
+            "fast_layout": fast_layout
+        }
+        self.taxonomy_manager = taxonomy_manager if taxonomy_manager is not None else TaxonomyManager()
+        self.skill_stats = skill_stats if skill_stats is not None else SkillStats()
+        self.scorer = WeightedScorer(self.skill_stats)
+        self.scoring = scoring
+        self.jd_cache = jd_cache
+        self.jd_store = jd_store
+        self.single_flight = single_flight
+        self.fuzzy_matching = fuzzy_matching
+        self.upload_guard = upload_guard
+        # Cached extraction results depend on the extraction budgets and
+        # upload limits, the matching mode and, through the taxonomy
+        # version, on the skills
+        self._budget_version = f"{max_pages}-{max_chars}-{int(fast_layout)}-{int(fuzzy_matching)}"
+        if upload_guard is not None:
+            self._budget_version += f"-{upload_guard.version}"
+    
+    @property
+    def taxonomy(self) -> Taxonomy:
+        """
+        Current skills taxonomy. Methods read it once per call, so a call
+        that overlaps a taxonomy reload still sees a single version.
+        """
+        return self.taxonomy_manager.get()
+    
+    @property
+    def skills_database(self) -> Dict[str, List[str]]:
+        return self.taxonomy.skills_database
+    
+    @property
+    def skill_matcher(self) -> SkillMatcher:
+        return self.taxonomy.matcher
+    
+    @property
+    def taxonomy_version(self) -> str:
+        return self.taxonomy.version
     
-    def _load_skills_database(self) -> Dict[str, List[str]]:
+    def extract_skills_from_resume(self, file_content: bytes, file_extension: str,
+                                   progress: Optional[Callable[[float, str], None]] = None,
+                                   timeout: Optional[float] = None,
+                                   taxonomy: Optional[Taxonomy] = None) -> Tuple[List[str], str]:
         """
-        Load skills database from JSON file.
+        Extract skills from resume file.
         
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            progress: Called as progress(fraction, stage) when a step starts
+            timeout: Extraction timeout in seconds when using the extraction
+                pool; defaults to the pool's own timeout
+            taxonomy: Taxonomy to match against, for callers that report its
+                version; defaults to the current one
+            
         Returns:
-            Dictionary containing skills by category
-        """
-        try:
-            # Get the directory of the current file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Navigate to the data directory
-            data_dir = os.path.join(current_dir, '..', '..', 'data')
-            skills_file = os.path.join(data_dir, 'skills.json')
-            
-            with open(skills_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load skills database: {e}")
-            # Return a basic skills database as fallback
-            return {
-                "programming_languages": ["Python", "JavaScript", "Java", "C++", "C#"],
-                "web_frameworks": ["React", "Angular", "Vue.js", "Django", "Flask"],
-                "databases": ["MySQL", "PostgreSQL", "MongoDB", "Redis"],
-                "cloud_platforms": ["AWS", "Azure", "Google Cloud"],
-                "devops_tools": ["Docker", "Kubernetes", "Jenkins", "Git"]
+            Tuple of (extracted_skills, extracted_text)
+        """
+        extraction = self.extract_resume(file_content, file_extension, progress, timeout, taxonomy)
+        return extraction.skills, extraction.text
+    
+    def extract_resume(self, file_content: bytes, file_extension: str,
+                       progress: Optional[Callable[[float, str], None]] = None,
+                       timeout: Optional[float] = None,
+                       taxonomy: Optional[Taxonomy] = None) -> ResumeExtraction:
+        """
+        Extract skills from resume file along with where each one was found.
+        
+        Skill matching records the character offsets of every match, so the
+        evidence comes out of the same pass that finds the skills.
+        
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            progress: Called as progress(fraction, stage) when a step starts
+            timeout: Extraction timeout in seconds when using the extraction
+                pool; defaults to the pool's own timeout
+            taxonomy: Taxonomy to match against, for callers that report its
+                version; defaults to the current one
+            
+        Returns:
+            Extracted skills, text and per-skill evidence (see skill_evidence)
+            
+        Raises:
+            DocumentTooLargeError: If the upload guard rejects the document
+        """
+        taxonomy = taxonomy or self.taxonomy
+        cache_version = f"{taxonomy.version}-{self._budget_version}"
+        paged = file_extension.lower() == '.pdf'
+        metrics.observe_size("bytes", len(file_content))
+        
+        cached = self._cached_extraction(file_content, file_extension, taxonomy, cache_version, paged)
+        if cached is not None:
+            return cached
+        
+        options = self.extraction_options
+        if self.upload_guard is not None:
+            # Oversized documents are turned away before anything parses them
+            with metrics.timed("upload_guard"):
+                inspection = self.upload_guard.inspect(file_content, file_extension)
+            max_pages = self.upload_guard.fast_pages if inspection.degraded else self.upload_guard.max_pages
+            options = {
+                **options,
+                "max_pages": min(max_pages, options["max_pages"] or max_pages),
+                "fast_layout": options["fast_layout"] or inspection.degraded
             }
+        
+        if self.single_flight is None:
+            return self._extract_resume(file_content, file_extension, progress, timeout, taxonomy,
+                                        cache_version, paged, options)
+        
+        # Concurrent uploads of the same file, in this worker or another one
+        # on the host, wait for a single extraction. Other workers read its
+        # result back from the extraction cache, and extract the file again
+        # if their cache does not have it
+        key = f"extract:{content_hash(file_content)}:{file_extension.lower()}:{cache_version}"
+        return self.single_flight.do(
+            key,
+            lambda: self._extract_resume(file_content, file_extension, progress, timeout, taxonomy,
+                                         cache_version, paged, options),
+            shared=True,
+            reload=lambda: self._cached_extraction(file_content, file_extension, taxonomy, cache_version, paged)
+        )
     
-    def extract_skills_from_resume(self, file_content: bytes, file_extension: str) -> Tuple[List[str], str]:
+    def _cached_extraction(self, file_content: bytes, file_extension: str, taxonomy: Taxonomy,
+                           cache_version: str, paged: bool) -> Optional[ResumeExtraction]:
         """
-        Extract skills from resume file.
+        Look a resume up in the extraction cache.
         
         Args:
             file_content: File content as bytes
             file_extension: File extension (e.g., '.pdf', '.docx')
+            taxonomy: Taxonomy the cached matches refer to
+            cache_version: Extraction cache version of the taxonomy and budgets
+            paged: Whether the file is a PDF
             
         Returns:
-            Tuple of (extracted_skills, extracted_text)
+            Extracted skills, text and per-skill evidence, or None if the
+            resume is not cached
+        """
+        if self.extraction_cache is None:
+            return None
+        with metrics.timed("cache_lookup"):
+            cached = self.extraction_cache.get(file_content, file_extension, cache_version)
+        if cached is None:
+            return None
+        extracted_skills, extracted_text, matches = cached
+        self.skill_stats.add_document(content_hash(file_content), extracted_skills)
+        return ResumeExtraction(
+            extracted_skills, extracted_text,
+            skill_evidence(extracted_text, matches, taxonomy.matcher.skills, paged)
+        )
+    
+    def _extract_resume(self, file_content: bytes, file_extension: str,
+                        progress: Optional[Callable[[float, str], None]], timeout: Optional[float],
+                        taxonomy: Taxonomy, cache_version: str, paged: bool,
+                        options: Dict) -> ResumeExtraction:
+        """
+        Extract text and skills from a resume that is not in the extraction
+        cache, and cache the result.
+        
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            progress: Called as progress(fraction, stage) when a step starts
+            timeout: Extraction timeout in seconds when using the extraction pool
+            taxonomy: Taxonomy to match against
+            cache_version: Extraction cache version of the taxonomy and budgets
+            paged: Whether the file is a PDF
+            options: Extraction budgets passed on to the text extractor
+            
+        Returns:
+            Extracted skills, text and per-skill evidence
         """
         # Extract text from file
-        extracted_text = extract_text_from_file(file_content, file_extension)
+        if progress is not None:
+            progress(0.1, "extracting")
+        if self.extraction_pool is not None:
+            # Includes time spent queued for a worker process
+            with metrics.timed("pooled_extraction"):
+                extracted_text = self.extraction_pool.extract_text(
+                    file_content, file_extension, timeout=timeout, **options
+                )
+            
+            # Extract skills from text
+            if progress is not None:
+                progress(0.8, "matching")
+            metrics.observe_size("chars", len(extracted_text))
+            with metrics.timed("skill_matching"):
+                matches = list(taxonomy.matcher.iter_matches(extracted_text))
+        else:
+            # Match each PDF page as soon as it is parsed; a skill name split
+            # across two pages is not matched
+            chunks = []
+            matches = []
+            offset = 0
+            for chunk in iter_text_from_file(file_content, file_extension, **options):
+                chunks.append(chunk)
+                with metrics.timed("skill_matching"):
+                    for skill_id, start, end in taxonomy.matcher.iter_matches(chunk):
+                        matches.append((skill_id, offset + start, offset + end))
+                offset += len(chunk)
+            extracted_text = ''.join(chunks)
+            # Shift the offsets past the leading whitespace removed by strip()
+            leading = len(extracted_text) - len(extracted_text.lstrip())
+            if leading:
+                matches = [(skill_id, start - leading, end - leading) for skill_id, start, end in matches]
+            extracted_text = extracted_text.strip()
+            metrics.observe_size("chars", len(extracted_text))
+        
+        if self.fuzzy_matching:
+            # Only the text exact matching left unresolved is looked at again
+            with metrics.timed("fuzzy_matching"):
+                fuzzy_matches = list(taxonomy.fuzzy_matcher.iter_matches(extracted_text, matches))
+            if fuzzy_matches:
+                matches = sorted(matches + fuzzy_matches, key=lambda match: match[1])
+        
+        extracted_skills = [taxonomy.matcher.skills[skill_id] for skill_id in dict.fromkeys(
+            match[0] for match in matches
+        )]
+        
+        if paged:
+            # pdfminer ends every page with a form feed
+            metrics.observe_size("pages", extracted_text.count('\f') + 1)
+        
+        if self.extraction_cache is not None:
+            self.extraction_cache.set(
+                file_content, file_extension, cache_version, extracted_skills, extracted_text, matches
+            )
         
-        # Extract skills from text
-        extracted_skills = extract_skills_from_text(extracted_text, self.skills_database)
+        self.skill_stats.add_document(content_hash(file_content), extracted_skills)
         
-        return extracted_skills, extracted_text
+        return ResumeExtraction(
+            extracted_skills, extracted_text,
+            skill_evidence(extracted_text, matches, taxonomy.matcher.skills, paged)
+        )
     
-    def extract_skills_from_jd(self, job_description: str) -> List[str]:
+    def extract_skills_from_jd(self, job_description: str,
+                               taxonomy: Optional[Taxonomy] = None) -> List[str]:
         """
         Extract required skills from job description.
         
         Args:
             job_description: Job description text
+            taxonomy: Taxonomy to match against; defaults to the current one
             
         Returns:
             List of required skills
         """
-        return extract_skills_from_text(job_description, self.skills_database)
+        taxonomy = taxonomy or self.taxonomy
+        return list(self._job_terms(job_description, taxonomy).skills)
     
-    def analyze_match(self, candidate_skills: List[str], job_description: str) -> Dict:
+    def register_job_description(self, job_description: str) -> Tuple[str, List[str], str]:
         """
-        Analyze match between candidate skills and job description.
+        Register a job description so later calls can pass its ID instead of
+        the text, and analyze it once up front.
         
         Args:
-            candidate_skills: List of candidate skills
             job_description: Job description text
             
         Returns:
-            Dictionary containing analysis results
+            Tuple of (job description ID, required skills, taxonomy version)
+        """
+        if self.jd_store is None:
+            raise RuntimeError("Job description registration is not enabled")
+        jd_id = self.jd_store.register(job_description)
+        taxonomy = self.taxonomy
+        return jd_id, list(self._job_terms(job_description, taxonomy).skills), taxonomy.version
+    
+    def _job_terms(self, job_description: Optional[str], taxonomy: Taxonomy,
+                   jd_id: Optional[str] = None) -> JobTerms:
+        """
+        Extract the required skills of a job description with their mention
+        counts, and count the job description in the skill statistics.
+        
+        Results are cached by job description ID and taxonomy version, so a
+        reposted job description costs a hash and a lookup (just a lookup
+        when its ID is passed).
+        
+        Args:
+            job_description: Job description text; may be None when jd_id
+                is given
+            taxonomy: Taxonomy to match against
+            jd_id: ID of a registered job description, used when
+                job_description is None
+            
+        Returns:
+            Required skills with their skill IDs and mention counts
+            
+        Raises:
+            JobDescriptionNotFoundError: If only jd_id is given and it is
+                unknown or has expired
         """
+        # Text always wins over a passed ID, so a mismatched pair cannot
+        # store one job description's skills under another's ID
+        if job_description is not None:
+            jd_id = job_description_id(job_description)
+        if self.jd_cache is not None:
+            terms = self.jd_cache.get(jd_id, taxonomy.version, taxonomy.matcher)
+            if terms is not None:
+                return terms
+        
+        if job_description is None:
+            job_description = self.jd_store.get(jd_id) if self.jd_store is not None else None
+            if job_description is None:
+                raise JobDescriptionNotFoundError(jd_id)
+        
+        metrics.observe_size("chars", len(job_description))
+        with metrics.timed("skill_matching"):
+            terms = JobTerms.from_counts(taxonomy.matcher.count_skill_ids(job_description), taxonomy.matcher)
+        
+        # Reposted job descriptions differing only in case or spacing count once
+        self.skill_stats.add_document(jd_id, terms.skills, kind="jd", mentions=int(terms.counts.sum()))
+        if self.jd_cache is not None:
+            self.jd_cache.set(jd_id, taxonomy.version, terms)
+        return terms
+    
+    def analyze_match(self, candidate_skills: Union[List[str], SkillSet], job_description: Optional[str] = None,
+                      scoring: Optional[str] = None, jd_id: Optional[str] = None,
+                      skill_sections: Optional[Dict[str, Optional[str]]] = None) -> Dict:
+        """
+        Analyze match between candidate skills and job description.
+        
+        Identical analyses running at the same time in this process share
+        one computation, and therefore one result dictionary.
+        
+        Args:
+            candidate_skills: List of candidate skill names, or the
+                candidate's skill IDs in the current taxonomy
+            job_description: Job description text; may be omitted when jd_id
+                is given
+            scoring: Scoring mode, one of SCORING_MODES; defaults to the
+                analyzer's mode
+            jd_id: ID of a registered job description
+            skill_sections: Resume section each candidate skill was found in,
+                as reported in the upload evidence; matched skills then count
+                according to their section (see SECTION_WEIGHTS)
+            
+        Returns:
+            Dictionary containing analysis results; matched and missing
+            skills are given as IDs (matched_skill_ids, missing_skill_ids)
+            when the candidate skills were
+            
+        Raises:
+            JobDescriptionNotFoundError: If only jd_id is given and it is
+                unknown or has expired
+        """
+        if self.single_flight is None:
+            return self._analyze_match(candidate_skills, job_description, scoring, jd_id, skill_sections)
+        
+        # The request itself is the key: it is only ever compared in this process
+        if isinstance(candidate_skills, SkillSet):
+            candidate_key = candidate_skills.to_base64()
+        else:
+            candidate_key = candidate_skills
+        key = "analyze:" + json.dumps(
+            [candidate_key, job_description, jd_id, scoring or self.scoring, skill_sections,
+             self.taxonomy_version]
+        )
+        return self.single_flight.do(
+            key, lambda: self._analyze_match(candidate_skills, job_description, scoring, jd_id, skill_sections)
+        )
+    
+    def _analyze_match(self, candidate_skills: Union[List[str], SkillSet], job_description: Optional[str],
+                       scoring: Optional[str], jd_id: Optional[str],
+                       skill_sections: Optional[Dict[str, Optional[str]]]) -> Dict:
+        """Analyze match between candidate skills and job description; see analyze_match."""
+        scoring = scoring or self.scoring
+        taxonomy = self.taxonomy
+        
         # Extract required skills from job description
-        required_skills = self.extract_skills_from_jd(job_description)
+        with metrics.timed("jd_skill_extraction"):
+            terms = self._job_terms(job_description, taxonomy, jd_id)
+            weights = self.scorer.weights(taxonomy.matcher, terms.skill_ids, terms.counts, scoring)
         
-        # Convert to lowercase for comparison
-        candidate_skills_lower = [skill.lower() for skill in candidate_skills]
-        required_skills_lower = [skill.lower() for skill in required_skills]
+        # Compare skill IDs, converting them to names only for the response
+        matcher = taxonomy.matcher
+        candidates = candidate_skills if isinstance(candidate_skills, SkillSet) else SkillSet.from_names(
+            candidate_skills, matcher
+        )
+        bits = candidates.bits
+        section_weights = {}
+        for skill, section in (skill_sections or {}).items():
+            skill_id = matcher.skill_id(skill)
+            if skill_id is not None:
+                section_weights[skill_id] = section_weight(section)
         
         # Find matched and missing skills
-        matched_skills = []
-        missing_skills = []
+        matched_ids = []
+        missing_ids = []
+        matched_weight = 0.0
         
-        for skill in required_skills:
-            if skill.lower() in candidate_skills_lower:
-                matched_skills.append(skill)
-            else:
-                missing_skills.append(skill)
+        with metrics.timed("skill_comparison"):
+            for skill_id, weight in zip(terms.skill_ids.tolist(), weights.tolist()):
+                if bits >> skill_id & 1:
+                    matched_ids.append(skill_id)
+                    matched_weight += weight * section_weights.get(skill_id, 1.0)
+                else:
+                    missing_ids.append(skill_id)
         
-        # Calculate match score
-        if len(required_skills) > 0:
-            score = (len(matched_skills) / len(required_skills)) * 100
+        # Calculate match score as the share of the required weight covered
+        total_weight = float(weights.sum())
+        if len(terms.skills) > 0 and total_weight > 0:
+            score = (matched_weight / total_weight) * 100
         else:
             score = 0.0
         
         # Generate suggestions
-        suggestions = self._generate_suggestions(missing_skills, score)
+        suggestions = self._generate_suggestions(
+            [matcher.skills[skill_id] for skill_id in missing_ids[:5]], score
+        )
         
-        return {
-            "candidate_skills": candidate_skills,
-            "matched_skills": matched_skills,
-            "missing_skills": missing_skills,
+        if isinstance(candidate_skills, SkillSet):
+            result = {"matched_skill_ids": matched_ids, "missing_skill_ids": missing_ids}
+        else:
+            result = {
+                "candidate_skills": candidate_skills,
+                "matched_skills": [matcher.skills[skill_id] for skill_id in matched_ids],
+                "missing_skills": [matcher.skills[skill_id] for skill_id in missing_ids]
+            }
+        result.update({
             "score": round(score, 2),
+            "scoring": scoring,
+            "taxonomy_version": taxonomy.version,
             "suggestions": suggestions
-        }
+        })
+        return result
+    
+    def analyze_many(self, job_description: Optional[str], candidates: Sequence[Union[List[str], SkillSet]],
+                     top_k: Optional[int] = None, scoring: Optional[str] = None,
+                     jd_id: Optional[str] = None,
+                     skill_sections: Optional[Sequence[Optional[Dict[str, Optional[str]]]]] = None
+                     ) -> Iterator[Dict]:
+        """
+        Analyze many candidates against one job description, best match first.
+        
+        The job description is processed once into a weight vector over the
+        skill vocabulary. Candidates are encoded as the rows of a sparse
+        binary candidates x skills matrix, so scoring all of them is a single
+        matrix-vector product.
+        
+        Args:
+            job_description: Job description text; may be None when jd_id
+                is given
+            candidates: Sequence of candidate skill name lists or skill ID sets
+            top_k: Only return the top_k best candidates when given
+            scoring: Scoring mode, one of SCORING_MODES; defaults to the
+                analyzer's mode
+            jd_id: ID of a registered job description
+            skill_sections: Per candidate, the resume section of each skill
+                (or None), to weight matches by section as analyze_match does
+            
+        Returns:
+            Iterator of analysis results ranked by score; each result carries
+            the candidate's position in candidates as candidate_index, and
+            gives skills as IDs for candidates given as skill ID sets
+        """
+        scoring = scoring or self.scoring
+        taxonomy = self.taxonomy
+        terms = self._job_terms(job_description, taxonomy, jd_id)
+        weights = self.scorer.weights(taxonomy.matcher, terms.skill_ids, terms.counts, scoring)
+        
+        query = np.zeros(len(taxonomy.matcher))
+        query[terms.skill_ids] = weights
+        indptr, indices = encode_candidates(taxonomy.matcher, candidates)
+        data = None
+        if skill_sections is not None and any(skill_sections):
+            data = encode_section_weights(taxonomy.matcher, indptr, indices, skill_sections)
+        
+        total_weight = float(weights.sum())
+        if len(terms.skills) > 0 and total_weight > 0:
+            scores = csr_matvec(indptr, indices, query, data) / total_weight * 100
+        else:
+            scores = np.zeros(len(candidates))
+        
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        
+        return self._iter_batch_results(
+            terms.skills, terms.skill_ids, candidates, indptr, indices, scores, order, taxonomy.version
+        )
+    
+    def _iter_batch_results(self, required_skills: List[str], required_ids: np.ndarray,
+                            candidates: Sequence[Union[List[str], SkillSet]],
+                            indptr: np.ndarray, indices: np.ndarray, scores: np.ndarray,
+                            order: np.ndarray, taxonomy_version: str) -> Iterator[Dict]:
+        """
+        Turn scored candidates into analysis results, lazily and in rank order.
+        
+        Args:
+            required_skills: Skills required by the job description
+            required_ids: Skill IDs of required_skills
+            candidates: Candidates as passed to analyze_many
+            indptr: Row pointers of the candidate skill matrix
+            indices: Sorted skill IDs of each candidate row
+            scores: Match score per candidate
+            order: Candidate rows in rank order
+            taxonomy_version: Version of the taxonomy the skills come from
+            
+        Returns:
+            Iterator of analysis results
+        """
+        for rank, row in enumerate(order, start=1):
+            hits = np.isin(required_ids, indices[indptr[row]:indptr[row + 1]], assume_unique=True)
+            matched = np.flatnonzero(hits)
+            missing = np.flatnonzero(~hits)
+            score = float(scores[row])
+            
+            result = {"candidate_index": int(row), "rank": rank}
+            if isinstance(candidates[row], SkillSet):
+                result["matched_skill_ids"] = required_ids[matched].tolist()
+                result["missing_skill_ids"] = required_ids[missing].tolist()
+            else:
+                result["matched_skills"] = [required_skills[i] for i in matched]
+                result["missing_skills"] = [required_skills[i] for i in missing]
+            result.update({
+                "score": round(score, 2),
+                "taxonomy_version": taxonomy_version,
+                "suggestions": self._generate_suggestions([required_skills[i] for i in missing[:5]], score)
+            })
+            yield result
     
     def _generate_suggestions(self, missing_skills: List[str], score: float) -> str:
         """
@@ -154,5 +630,5 @@ class ResumeAnalyzer:
         Returns:
             Dictionary of skills by category
         """
-        return self.skills_database
+        return self.taxonomy.skills_database
 
@@ -0,0 +1,347 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.sections import section_weight
+from utils.skill_matcher import SkillMatcher
+from utils.skill_set import SkillSet
+
+
+# "ratio" is the original unweighted score: the share of required skills found
+SCORING_MODES = ("ratio", "tfidf", "bm25")
+
+
+class SkillStats:
+    """
+    Document frequencies of skills over analyzed job descriptions and resumes.
+
+    Each distinct document is counted once, identified by a caller-supplied
+    hash. Without a path the statistics live in memory and cover the current
+    process only; only the last max_recent documents are remembered, so a
+    document that comes back after that many others is counted again. With a path they are kept in a SQLite file shared by every
+    worker; each process counts its own documents immediately and reloads the
+    totals written by the others at most every refresh_interval seconds.
+    """
+
+    def __init__(self, path: Optional[str] = None, refresh_interval: float = 30.0,
+                 max_recent: int = 10000):
+        """
+        Args:
+            path: SQLite database file, or None for in-memory statistics
+            refresh_interval: Seconds between reloads of the shared totals
+            max_recent: Number of recently counted document hashes remembered
+                in memory, to skip the database for repeated documents, or
+                without a path to bound the memory of counted documents
+        """
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.max_recent = max_recent
+        # Bumped on every change, so derived weights can be cached
+        self.version = 0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._df: Counter = Counter()
+        self._documents = 0
+        self._jd_count = 0
+        self._jd_mentions = 0
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._loaded_at = 0.0
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS documents ("
+                    "hash TEXT PRIMARY KEY, kind TEXT NOT NULL, mentions INTEGER NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS skill_df (skill TEXT PRIMARY KEY, df INTEGER NOT NULL)"
+                )
+            self._reload()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _reload(self) -> None:
+        conn = self._connect()
+        df = Counter(dict(conn.execute("SELECT skill, df FROM skill_df")))
+        documents, = conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+        jd_count, jd_mentions = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(mentions), 0) FROM documents WHERE kind = 'jd'"
+        ).fetchone()
+        with self._lock:
+            self._df = df
+            self._documents = documents
+            self._jd_count = jd_count
+            self._jd_mentions = jd_mentions
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    def _remember(self, document_hash: str) -> bool:
+        """Return False if the document was counted recently by this process."""
+        with self._lock:
+            if document_hash in self._recent:
+                self._recent.move_to_end(document_hash)
+                return False
+            self._recent[document_hash] = None
+            if len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+            return True
+
+    def add_document(self, document_hash: str, skills: Iterable[str], kind: str = "resume",
+                     mentions: int = 0) -> bool:
+        """
+        Count the skills of a document, once per distinct document.
+
+        Args:
+            document_hash: Stable identifier of the document content
+            skills: Skills found in the document; duplicates are ignored
+            kind: "resume" or "jd"
+            mentions: Total number of skill mentions, for job descriptions
+
+        Returns:
+            True if the document had not been counted before
+        """
+        if not self._remember(document_hash):
+            return False
+        skill_keys = sorted({skill.lower() for skill in skills})
+
+        if self.path:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO documents (hash, kind, mentions) VALUES (?, ?, ?)",
+                    (document_hash, kind, mentions)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                conn.executemany(
+                    "INSERT INTO skill_df (skill, df) VALUES (?, 1) "
+                    "ON CONFLICT(skill) DO UPDATE SET df = df + 1",
+                    [(skill,) for skill in skill_keys]
+                )
+
+        with self._lock:
+            self._df.update(skill_keys)
+            self._documents += 1
+            if kind == "jd":
+                self._jd_count += 1
+                self._jd_mentions += mentions
+            self.version += 1
+        return True
+
+    def refresh(self) -> None:
+        """Reload the shared totals if they are older than refresh_interval."""
+        if self.path and time.monotonic() - self._loaded_at > self.refresh_interval:
+            self._reload()
+
+    def snapshot(self) -> Tuple[Dict[str, int], int, float]:
+        """
+        Returns:
+            Tuple of (document frequency by lowercase skill name, number of
+            documents, average skill mentions per job description or 0.0)
+        """
+        with self._lock:
+            average_jd_mentions = self._jd_mentions / self._jd_count if self._jd_count else 0.0
+            return dict(self._df), self._documents, average_jd_mentions
+
+
+class WeightedScorer:
+    """
+    Weighted match scoring over the skill vocabulary of a SkillMatcher.
+
+    IDF vectors are cached per matcher, so a taxonomy reload starts a fresh
+    vocabulary without any extra bookkeeping.
+
+    A job description is a sparse vector of skill weights and a resume a
+    binary vector of the skills it mentions. The score is the share of the
+    job description's total weight covered by the resume, as a percentage,
+    so every mode stays on the same 0-100 scale as the original ratio:
+
+    - ratio: every required skill weighs 1
+    - tfidf: (1 + ln tf) * smoothed idf
+    - bm25: BM25 idf with tf saturation, normalized by the average number of
+      skill mentions per job description
+    """
+
+    def __init__(self, skill_stats: SkillStats, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            skill_stats: Corpus document frequencies
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.skill_stats = skill_stats
+        self.k1 = k1
+        self.b = b
+        self._idf_lock = threading.Lock()
+        self._idf_cache: Dict[str, Tuple[int, SkillMatcher, np.ndarray, float]] = {}
+
+    def _idf(self, skill_matcher: SkillMatcher, mode: str) -> Tuple[np.ndarray, float]:
+        """Per-skill IDF over the vocabulary and the average JD length."""
+        self.skill_stats.refresh()
+        with self._idf_lock:
+            cached = self._idf_cache.get(mode)
+        if cached is not None and cached[0] == self.skill_stats.version and cached[1] is skill_matcher:
+            return cached[2], cached[3]
+
+        version = self.skill_stats.version
+        df_by_skill, documents, average_jd_mentions = self.skill_stats.snapshot()
+        df = np.zeros(len(skill_matcher))
+        for skill, count in df_by_skill.items():
+            skill_id = skill_matcher.skill_id(skill)
+            if skill_id is not None:
+                df[skill_id] = count
+        # Shared totals may lag a process's own counts for a moment
+        documents = np.maximum(documents, df)
+        if mode == "tfidf":
+            idf = np.log((1 + documents) / (1 + df)) + 1
+        else:
+            idf = np.log1p((documents - df + 0.5) / (df + 0.5))
+
+        with self._idf_lock:
+            # Another thread may have cached newer weights meanwhile
+            cached = self._idf_cache.get(mode)
+            if cached is None or cached[1] is not skill_matcher or cached[0] <= version:
+                self._idf_cache[mode] = (version, skill_matcher, idf, average_jd_mentions)
+        return idf, average_jd_mentions
+
+    def weights(self, skill_matcher: SkillMatcher, skill_ids: np.ndarray,
+                term_counts: np.ndarray, mode: str) -> np.ndarray:
+        """
+        Weight the skills required by a job description.
+
+        Args:
+            skill_matcher: Matcher defining the skill ID vocabulary
+            skill_ids: Required skill IDs
+            term_counts: Number of mentions of each required skill in the
+                job description
+            mode: One of SCORING_MODES
+
+        Returns:
+            Weight of each required skill
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}', expected one of {', '.join(SCORING_MODES)}")
+        if mode == "ratio":
+            return np.ones(len(skill_ids))
+
+        idf, average_jd_mentions = self._idf(skill_matcher, mode)
+        tf = term_counts.astype(np.float64)
+        if mode == "tfidf":
+            return (1 + np.log(tf)) * idf[skill_ids]
+
+        length = tf.sum()
+        relative_length = length / average_jd_mentions if average_jd_mentions else 1.0
+        saturation = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * relative_length))
+        return saturation * idf[skill_ids]
+
+
+def encode_candidates(skill_matcher: SkillMatcher,
+                      candidates: Sequence[Union[List[str], SkillSet]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode candidate skill lists as the rows of a binary CSR matrix.
+
+    Unknown skills are dropped and repeated skills are kept once.
+
+    Args:
+        skill_matcher: Matcher defining the skill ID vocabulary
+        candidates: Candidate skill name lists or skill ID sets
+
+    Returns:
+        Tuple of (indptr, indices): the skill IDs of row i are
+        indices[indptr[i]:indptr[i + 1]], sorted
+    """
+    rows = []
+    skill_ids = []
+    set_rows = []
+    for row, skills in enumerate(candidates):
+        if isinstance(skills, SkillSet):
+            set_rows.append(row)
+            continue
+        for skill in skills:
+            skill_id = skill_matcher.skill_id(skill)
+            if skill_id is not None:
+                rows.append(row)
+                skill_ids.append(skill_id)
+    keys = np.asarray(rows, dtype=np.int64) * len(skill_matcher) + np.asarray(skill_ids, dtype=np.int64)
+
+    if set_rows:
+        # Unpack all skill bitsets at once as the rows of a bit matrix
+        width = (len(skill_matcher) + 7) // 8
+        packed = np.frombuffer(b"".join(candidates[row].to_bytes(width) for row in set_rows), dtype=np.uint8)
+        bits = np.unpackbits(packed.reshape(len(set_rows), width), axis=1, bitorder="little")
+        set_index, set_ids = np.nonzero(bits)
+        keys = np.concatenate([
+            keys, np.asarray(set_rows, dtype=np.int64)[set_index] * len(skill_matcher) + set_ids
+        ])
+
+    # One sort over (row, skill) keys orders each row and exposes duplicates
+    keys = np.unique(keys)
+    row_of_key = keys // max(len(skill_matcher), 1)
+    indices = keys - row_of_key * len(skill_matcher)
+    indptr = np.searchsorted(row_of_key, np.arange(len(candidates) + 1)).astype(np.int64)
+    return indptr, indices
+
+
+def encode_section_weights(skill_matcher: SkillMatcher, indptr: np.ndarray, indices: np.ndarray,
+                           skill_sections: Sequence[Optional[Dict[str, Optional[str]]]]) -> np.ndarray:
+    """
+    Weight the entries of a candidate skill matrix by the resume section
+    each candidate mentions the skill in (see utils.sections.SECTION_WEIGHTS).
+
+    Args:
+        skill_matcher: Matcher defining the skill ID vocabulary
+        indptr: Row pointers from encode_candidates
+        indices: Sorted skill IDs of each row from encode_candidates
+        skill_sections: Per candidate, the section of each skill, or None;
+            skills without a section entry keep a weight of 1
+
+    Returns:
+        One weight per entry of indices
+    """
+    data = np.ones(len(indices))
+    for row, sections in enumerate(skill_sections):
+        if not sections:
+            continue
+        low, high = indptr[row], indptr[row + 1]
+        row_ids = indices[low:high]
+        for skill, section in sections.items():
+            skill_id = skill_matcher.skill_id(skill)
+            if skill_id is None:
+                continue
+            position = int(np.searchsorted(row_ids, skill_id))
+            if position < len(row_ids) and row_ids[position] == skill_id:
+                data[low + position] = section_weight(section)
+    return data
+
+
+def csr_matvec(indptr: np.ndarray, indices: np.ndarray, vector: np.ndarray,
+               data: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Multiply a CSR matrix by a dense vector.
+
+    Args:
+        indptr: Row pointers
+        indices: Column indices
+        vector: Dense vector with one value per column
+        data: Value of each entry; every entry is 1 when omitted
+
+    Returns:
+        One value per row
+    """
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    weights = vector[indices] if data is None else vector[indices] * data
+    return np.bincount(rows, weights=weights, minlength=len(indptr) - 1)
@@ -0,0 +1,597 @@
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.fuzzy_matcher import FuzzyMatcher
+from utils.flat_matcher import FlatSkillMatcher, StringTable, build_hash_table, edge_hash, string_hash
+from utils.metrics import metrics
+from utils.private_dir import ensure_private_dir
+from utils.skill_matcher import SkillMatcher, normalize_tokens
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data')
+DEFAULT_SKILLS_PATH = os.path.join(DATA_DIR, 'skills.json')
+DEFAULT_ALIASES_PATH = os.path.join(DATA_DIR, 'skill_aliases.json')
+
+# Bump when the compiled layout or the matcher's normalization changes, so
+# that snapshots written by older code are never loaded
+SNAPSHOT_FORMAT = 4
+SNAPSHOT_MAGIC = b"RATAXSNP"
+# magic, taxonomy version, number of sections, SHA-256 of everything after
+# the header
+_HEADER = struct.Struct("<8s16sI32s")
+# section name, byte offset, byte length
+_SECTION = struct.Struct("<8sQQ")
+
+_SECTION_DTYPES = {
+    "str_data": np.uint8,   # UTF-8 bytes of every interned string
+    "str_offs": np.uint32,  # string i is str_data[str_offs[i]:str_offs[i + 1]]
+    "skills": np.uint32,    # string ID of each canonical skill name
+    "cat_name": np.uint32,  # string ID of each category name
+    "cat_offs": np.uint32,  # skills of category c are cat_skls[cat_offs[c]:cat_offs[c + 1]]
+    "cat_skls": np.uint32,  # skill IDs, in source order
+    "skl_coff": np.uint32,  # categories of skill s are skl_cats[skl_coff[s]:skl_coff[s + 1]]
+    "skl_cats": np.uint32,  # category indexes
+    "name_hsh": np.uint32,  # hash table of lowercase skill names -> skill ID + 1
+    "al_names": np.uint32,  # string ID of each alias
+    "al_skls": np.uint32,   # skill ID of each alias
+    "node_off": np.uint32,  # matcher trie, see SkillMatcher.flatten
+    "edge_tok": np.uint32,  # string ID of each edge token
+    "edge_dst": np.uint32,
+    "node_skl": np.int32,
+    "edge_src": np.uint32,  # source node of each edge
+    "edge_hsh": np.uint32,  # hash table of (source node, token) -> edge + 1
+    "tok_hash": np.uint32,  # hash table of edge tokens -> string ID + 1
+}
+# memoryview formats of the section dtypes, for mapped taxonomies
+_VIEW_FORMATS = {np.uint8: "B", np.uint32: "I", np.int32: "i"}
+
+
+class TaxonomyError(Exception):
+    """Raised when a taxonomy source or snapshot cannot be loaded."""
+
+
+class TaxonomyVersionMismatchError(ValueError):
+    """Raised when skill IDs refer to another taxonomy version than the current one."""
+
+
+class Taxonomy:
+    """
+    One immutable version of the skills taxonomy: canonical skills grouped by
+    category, their aliases, and the matcher compiled from both.
+
+    A new version is a new object; code that holds a reference keeps using
+    the version it started with.
+    """
+
+    def __init__(self, version: str, skills_database: Dict[str, List[str]],
+                 aliases: Dict[str, str], matcher: SkillMatcher):
+        """
+        Args:
+            version: Content hash of the taxonomy sources
+            skills_database: Canonical skills by category
+            aliases: Canonical skill name of every alias
+            matcher: Matcher for skills and aliases
+        """
+        self.version = version
+        self.skills_database = skills_database
+        self.aliases = aliases
+        self.matcher = matcher
+        self.loaded_at = time.time()
+
+    @property
+    def alias_count(self) -> int:
+        return len(self.aliases)
+
+    @cached_property
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """Typo-tolerant matcher over the same skills and aliases, built on first use."""
+        matcher = self.matcher
+        terms = [(skill, skill_id) for skill_id, skill in enumerate(matcher.skills)]
+        terms.extend((alias, matcher.skill_id(skill)) for alias, skill in self.aliases.items())
+        return FuzzyMatcher(terms)
+
+
+class MappedTaxonomy(Taxonomy):
+    """
+    Taxonomy served straight from a memory-mapped snapshot.
+
+    The matcher reads the mapping in place, so processes mapping the same
+    snapshot share its pages through the page cache instead of each holding
+    a private copy. skills_database and aliases are decoded on access, for
+    the rare callers that need them as dictionaries.
+    """
+
+    def __init__(self, version: str, sections: Dict[str, memoryview], path: str, size: int):
+        """
+        Args:
+            version: Taxonomy version
+            sections: Typed views of the snapshot sections
+            path: Snapshot file
+            size: Size of the mapping in bytes
+        """
+        self.version = version
+        self.matcher = FlatSkillMatcher(sections)
+        self.path = path
+        self.size = size
+        self.loaded_at = time.time()
+        self._sections = sections
+        self._category_names = StringTable(sections["str_data"], sections["str_offs"], sections["cat_name"])
+        self._alias_names = StringTable(sections["str_data"], sections["str_offs"], sections["al_names"])
+
+    @property
+    def skills_database(self) -> Dict[str, List[str]]:
+        skills = self.matcher.skills
+        offsets = self._sections["cat_offs"]
+        members = self._sections["cat_skls"]
+        return {
+            category: [skills[skill_id] for skill_id in members[offsets[index]:offsets[index + 1]]]
+            for index, category in enumerate(self._category_names)
+        }
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        skills = self.matcher.skills
+        return {
+            alias: skills[skill_id] for alias, skill_id in zip(self._alias_names, self._sections["al_skls"])
+        }
+
+    @property
+    def alias_count(self) -> int:
+        return len(self._sections["al_names"])
+
+
+def load_source(skills_path: str, aliases_path: Optional[str] = None
+                ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], str]:
+    """
+    Read and validate the taxonomy source files.
+
+    Args:
+        skills_path: JSON object of category -> list of skill names
+        aliases_path: Optional JSON object of canonical skill -> list of
+            aliases; ignored if the file does not exist
+
+    Returns:
+        Tuple of (skills by category, aliases by canonical skill, version)
+    """
+    try:
+        with open(skills_path, 'rb') as f:
+            skills_source = f.read()
+        aliases_source = b""
+        if aliases_path and os.path.exists(aliases_path):
+            with open(aliases_path, 'rb') as f:
+                aliases_source = f.read()
+
+        skills_database = json.loads(skills_source)
+        aliases = json.loads(aliases_source) if aliases_source else {}
+    except (OSError, ValueError) as e:
+        raise TaxonomyError(f"Could not read taxonomy: {e}") from e
+
+    for name, document in (("skills", skills_database), ("aliases", aliases)):
+        if not isinstance(document, dict) or not all(
+            isinstance(values, list) and all(isinstance(value, str) for value in values)
+            for values in document.values()
+        ):
+            raise TaxonomyError(f"The {name} file must map names to lists of strings")
+
+    digest = hashlib.sha256(b"%d\0" % SNAPSHOT_FORMAT)
+    digest.update(hashlib.sha256(skills_source).digest())
+    digest.update(hashlib.sha256(aliases_source).digest())
+    return skills_database, aliases, digest.hexdigest()[:16]
+
+
+def compile_taxonomy(skills_database: Dict[str, List[str]], aliases: Dict[str, List[str]],
+                     version: str) -> Taxonomy:
+    """
+    Compile skills and aliases into a Taxonomy.
+
+    Args:
+        skills_database: Canonical skills by category
+        aliases: Aliases by canonical skill name
+        version: Taxonomy version
+
+    Returns:
+        Compiled taxonomy
+    """
+    matcher = SkillMatcher(skills_database)
+    resolved: Dict[str, str] = {}
+    for canonical, names in aliases.items():
+        skill_id = matcher.skill_id(canonical)
+        if skill_id is None:
+            raise TaxonomyError(f"Aliases given for unknown skill '{canonical}'")
+        for alias in names:
+            if not normalize_tokens(alias):
+                raise TaxonomyError(f"Alias '{alias}' of '{canonical}' contains no letters or digits")
+            existing = matcher.lookup(alias)
+            if existing is not None and existing != skill_id:
+                raise TaxonomyError(
+                    f"Alias '{alias}' of '{canonical}' already names '{matcher.skills[existing]}'"
+                )
+            matcher.add_alias(alias, skill_id)
+            resolved[alias] = matcher.skills[skill_id]
+
+    return Taxonomy(version, skills_database, resolved, matcher)
+
+
+def write_snapshot(taxonomy: Taxonomy, path: str) -> None:
+    """
+    Write a taxonomy as a compiled binary snapshot, atomically.
+
+    All strings are interned into one table and everything else is stored as
+    flat integer arrays, including the hash tables FlatSkillMatcher needs to
+    match text without building any Python objects from the file.
+
+    Args:
+        taxonomy: Taxonomy to write
+        path: Snapshot file
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        string_id = strings.get(value)
+        if string_id is None:
+            string_id = strings[value] = len(strings)
+        return string_id
+
+    matcher = taxonomy.matcher
+    skill_ids = [intern(skill) for skill in matcher.skills]
+    category_names = []
+    category_offsets = [0]
+    category_skills = []
+    category_indexes = {}
+    for category, skills in taxonomy.skills_database.items():
+        category_indexes[category] = len(category_names)
+        category_names.append(intern(category))
+        category_skills.extend(matcher.skill_id(skill) for skill in skills)
+        category_offsets.append(len(category_skills))
+    skill_category_offsets = [0]
+    skill_categories = []
+    for categories in matcher.categories:
+        skill_categories.extend(category_indexes[category] for category in categories)
+        skill_category_offsets.append(len(skill_categories))
+    alias_names = [intern(alias) for alias in taxonomy.aliases]
+    alias_skills = [matcher.skill_id(skill) for skill in taxonomy.aliases.values()]
+    edge_tokens, node_offsets, edge_children, node_skills = matcher.flatten()
+    edge_token_ids = [intern(token) for token in edge_tokens]
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+
+    edge_sources = [
+        node for node in range(len(node_skills)) for _ in range(node_offsets[node], node_offsets[node + 1])
+    ]
+    token_ids = sorted(set(edge_token_ids))
+    token_table = build_hash_table([string_hash(encoded[token_id]) for token_id in token_ids], token_ids)
+    edge_table = build_hash_table(
+        [edge_hash(source, token_id) for source, token_id in zip(edge_sources, edge_token_ids)],
+        range(len(edge_sources))
+    )
+    name_table = build_hash_table(
+        [string_hash(skill.lower().encode("utf-8")) for skill in matcher.skills], range(len(matcher))
+    )
+
+    arrays = {
+        "str_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "str_offs": string_offsets,
+        "skills": skill_ids,
+        "cat_name": category_names,
+        "cat_offs": category_offsets,
+        "cat_skls": category_skills,
+        "skl_coff": skill_category_offsets,
+        "skl_cats": skill_categories,
+        "name_hsh": name_table,
+        "al_names": alias_names,
+        "al_skls": alias_skills,
+        "node_off": node_offsets,
+        "edge_tok": edge_token_ids,
+        "edge_dst": edge_children,
+        "node_skl": node_skills,
+        "edge_src": edge_sources,
+        "edge_hsh": edge_table,
+        "tok_hash": token_table,
+    }
+
+    # Sections start on 8-byte boundaries so every array can be mapped in place
+    offset = _HEADER.size + _SECTION.size * len(arrays)
+    sections = []
+    payloads = []
+    for name, values in arrays.items():
+        data = np.asarray(values, dtype=_SECTION_DTYPES[name]).tobytes()
+        padding = -offset % 8
+        offset += padding
+        sections.append(_SECTION.pack(name.encode("ascii"), offset, len(data)))
+        payloads.append(b"\0" * padding + data)
+        offset += len(data)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    for chunk in sections + payloads:
+        digest.update(chunk)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, taxonomy.version.encode("ascii"), len(sections), digest.digest()))
+            f.writelines(sections)
+            f.writelines(payloads)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_snapshot(path: str, mapped: bool = False, expected_version: Optional[str] = None) -> Taxonomy:
+    """
+    Load a taxonomy from a compiled binary snapshot, after checking its
+    header: the checksum must match the contents and the version, if given,
+    the expected one.
+
+    Args:
+        path: Snapshot file written by write_snapshot
+        mapped: Match directly on the memory-mapped file instead of
+            rebuilding the matcher in memory
+        expected_version: Version the snapshot must hold, such as the one
+            in its file name
+
+    Returns:
+        Loaded taxonomy
+
+    Raises:
+        TaxonomyError: If the file is unreadable, corrupt or of another version
+    """
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, checksum = _HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise TaxonomyError(f"{path} is not a taxonomy snapshot")
+        if expected_version is not None and version != expected_version.encode("ascii"):
+            raise TaxonomyError(f"{path} holds taxonomy {version.decode('ascii', 'replace')}, "
+                                f"expected {expected_version}")
+        if hashlib.sha256(memoryview(buffer)[_HEADER.size:]).digest() != checksum:
+            raise TaxonomyError(f"{path} is corrupt: checksum mismatch")
+
+        view = memoryview(buffer)
+        arrays = {}
+        for index in range(count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + index * _SECTION.size)
+            name = name.rstrip(b"\0").decode("ascii")
+            dtype = _SECTION_DTYPES[name]
+            if offset + length > len(buffer) or length % np.dtype(dtype).itemsize:
+                raise TaxonomyError(f"{path} is corrupt: section {name} out of bounds")
+            if mapped:
+                arrays[name] = view[offset:offset + length].cast(_VIEW_FORMATS[dtype])
+            else:
+                arrays[name] = np.frombuffer(
+                    buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset
+                )
+        missing = set(_SECTION_DTYPES) - set(arrays)
+        if missing:
+            raise TaxonomyError(f"{path} is missing sections: {', '.join(sorted(missing))}")
+    except (OSError, ValueError, TypeError, KeyError, struct.error) as e:
+        raise TaxonomyError(f"Could not read taxonomy snapshot {path}: {e}") from e
+
+    if mapped:
+        return MappedTaxonomy(version.decode("ascii"), arrays, path, len(buffer))
+
+    data = arrays["str_data"].tobytes()
+    offsets = arrays["str_offs"].tolist()
+    strings = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    skills = [strings[string_id] for string_id in arrays["skills"].tolist()]
+    skills_database: Dict[str, List[str]] = {}
+    categories: List[List[str]] = [[] for _ in skills]
+    category_offsets = arrays["cat_offs"].tolist()
+    category_skills = arrays["cat_skls"].tolist()
+    for index, string_id in enumerate(arrays["cat_name"].tolist()):
+        category = strings[string_id]
+        members = category_skills[category_offsets[index]:category_offsets[index + 1]]
+        skills_database[category] = [skills[skill_id] for skill_id in members]
+        for skill_id in members:
+            if category not in categories[skill_id]:
+                categories[skill_id].append(category)
+
+    aliases = {
+        strings[string_id]: skills[skill_id]
+        for string_id, skill_id in zip(arrays["al_names"].tolist(), arrays["al_skls"].tolist())
+    }
+    matcher = SkillMatcher.from_flat(
+        skills, categories,
+        [strings[string_id] for string_id in arrays["edge_tok"].tolist()],
+        arrays["node_off"].tolist(), arrays["edge_dst"].tolist(), arrays["node_skl"].tolist()
+    )
+    return Taxonomy(version.decode("ascii"), skills_database, aliases, matcher)
+
+
+class TaxonomyManager:
+    """
+    Owns the current taxonomy and swaps in new versions when its source
+    files change.
+
+    Source files are polled at most every reload_interval seconds: the first
+    get() once the interval has passed starts a short-lived thread that
+    checks them and compiles any new version, while that request and the
+    ones after it keep being served the current version. No thread outlives
+    a check, so a manager created before a fork keeps working in every
+    worker. A new version is published by replacing a single reference, so
+    requests already running finish on the version they started with. A
+    version that fails to load is reported and skipped, and the previous
+    version stays in service.
+
+    With a snapshot_dir, compiled versions are written as binary snapshots
+    named by version; other workers picking up the same change load the
+    snapshot instead of compiling it again. The directory must belong to
+    the current user and be closed to everyone else, or snapshots are
+    disabled; a snapshot is only loaded if its header holds the version in
+    its name and a checksum matching its contents. With mapped=True as
+    well, every process matches directly on the memory-mapped snapshot,
+    sharing one copy of the taxonomy through the page cache.
+    """
+
+    def __init__(self, skills_path: str = DEFAULT_SKILLS_PATH,
+                 aliases_path: Optional[str] = DEFAULT_ALIASES_PATH,
+                 snapshot_dir: Optional[str] = None, reload_interval: float = 0.0,
+                 keep_snapshots: int = 5, mapped: bool = False):
+        """
+        Load the taxonomy, failing loudly if it cannot be loaded.
+
+        Args:
+            skills_path: Skills by category JSON file
+            aliases_path: Aliases by canonical skill JSON file, optional
+            snapshot_dir: Directory for compiled snapshots, or None; created
+                with mode 0700 if missing
+            reload_interval: Seconds between checks for source changes;
+                0 disables reloading
+            keep_snapshots: Number of most recent snapshots kept in snapshot_dir
+            mapped: Serve the taxonomy from the memory-mapped snapshot;
+                requires snapshot_dir
+        """
+        if snapshot_dir is not None:
+            try:
+                ensure_private_dir(snapshot_dir)
+            except OSError as e:
+                print(f"Warning: Taxonomy snapshots disabled: {e}")
+                snapshot_dir = None
+
+        self.skills_path = skills_path
+        self.aliases_path = aliases_path
+        self.snapshot_dir = snapshot_dir
+        self.reload_interval = reload_interval
+        self.keep_snapshots = keep_snapshots
+        self.mapped = mapped and snapshot_dir is not None
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+
+        self._reload_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._checked_at = time.monotonic()
+        self._stamp = self._source_stamp()
+        self._failed_stamp = None
+        self.current = self._load()
+
+    def _source_stamp(self) -> Tuple:
+        stamp = []
+        for path in (self.skills_path, self.aliases_path):
+            try:
+                stat = os.stat(path) if path else None
+                stamp.append((stat.st_mtime_ns, stat.st_size) if stat else None)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _load(self) -> Taxonomy:
+        skills_database, aliases, version = load_source(self.skills_path, self.aliases_path)
+        if self.snapshot_dir is None:
+            return compile_taxonomy(skills_database, aliases, version)
+
+        snapshot_path = os.path.join(self.snapshot_dir, f"taxonomy-{version}.bin")
+        if os.path.exists(snapshot_path):
+            try:
+                return load_snapshot(snapshot_path, mapped=self.mapped, expected_version=version)
+            except TaxonomyError as e:
+                print(f"Warning: Recompiling taxonomy {version}: {e}")
+
+        taxonomy = compile_taxonomy(skills_database, aliases, version)
+        try:
+            write_snapshot(taxonomy, snapshot_path)
+            self._prune_snapshots()
+        except OSError as e:
+            print(f"Warning: Could not write taxonomy snapshot: {e}")
+            return taxonomy
+        # Drop the compiled objects and serve the shared mapping instead
+        return load_snapshot(snapshot_path, mapped=True, expected_version=version) if self.mapped else taxonomy
+
+    def _prune_snapshots(self) -> None:
+        snapshots = sorted(
+            glob.glob(os.path.join(self.snapshot_dir, "taxonomy-*.bin")), key=os.path.getmtime, reverse=True
+        )
+        for path in snapshots[self.keep_snapshots:]:
+            try:
+                # Workers still mapping an old snapshot keep their pages after the unlink
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def get(self) -> Taxonomy:
+        """
+        Return the current taxonomy, starting a background check for source
+        changes when one is due.
+
+        Returns:
+            Current taxonomy
+        """
+        if self.reload_interval > 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self._checked_at = time.monotonic()
+            threading.Thread(target=self.check_for_updates, name="taxonomy-reload", daemon=True).start()
+        return self.current
+
+    def check_for_updates(self) -> bool:
+        """
+        Reload the taxonomy if its source files changed, in the calling thread.
+
+        Returns:
+            True if a new version was swapped in
+        """
+        if self._pid != os.getpid():
+            # Forked while another thread was reloading; that thread and its
+            # hold on the lock stayed behind in the parent
+            self._reload_lock = threading.Lock()
+            self._pid = os.getpid()
+        # Only one thread reloads; the others keep serving the current version
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            stamp = self._source_stamp()
+            if stamp == self._stamp or stamp == self._failed_stamp:
+                return False
+
+            try:
+                taxonomy = self._load()
+            except Exception as e:
+                self._failed_stamp = stamp
+                self.last_error = str(e)
+                metrics.count_error("taxonomy_reload", e)
+                print(f"Warning: Keeping taxonomy {self.current.version}, reload failed: {e}")
+                return False
+
+            self._stamp = stamp
+            self._failed_stamp = None
+            self.last_error = None
+            if taxonomy.version == self.current.version:
+                return False
+            self.current = taxonomy
+            self.reload_count += 1
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def status(self) -> Dict:
+        """
+        Returns:
+            Version and size of the current taxonomy and the reload state
+        """
+        taxonomy = self.current
+        return {
+            "version": taxonomy.version,
+            "skills": len(taxonomy.matcher),
+            "aliases": taxonomy.alias_count,
+            "categories": len(taxonomy.skills_database),
+            "loaded_at": taxonomy.loaded_at,
+            "mapped": isinstance(taxonomy, MappedTaxonomy),
+            "mapped_bytes": taxonomy.size if isinstance(taxonomy, MappedTaxonomy) else None,
+            "reload_interval": self.reload_interval,
+            "reloads": self.reload_count,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,190 @@
+import gc
+import io
+import threading
+import time
+import zipfile
+from typing import Callable, Dict, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from services.resume_analyzer import ResumeAnalyzer
+from services.scoring import SCORING_MODES
+from utils.metrics import metrics
+from utils.text_preprocessor import warmup as load_stopwords
+
+
+def _sample_lines(skills: Sequence[str]) -> List[str]:
+    """Lines of a short resume with section headings, mentioning some of the skills."""
+    picked = list(skills[::max(len(skills) // 24, 1)][:24])
+    return [
+        "SUMMARY",
+        "Software engineer building reliable services with " + ", ".join(picked[:6]) + ".",
+        "EXPERIENCE",
+        "Led the migration of the reporting platform to " + ", ".join(picked[6:12]) + ".",
+        "Improved latency of customer-facing integrations and mentored the team.",
+        "PROJECTS",
+        "Built internal tooling with " + ", ".join(picked[12:18]) + ".",
+        "SKILLS",
+        ", ".join(picked),
+        "EDUCATION",
+        "BSc Computer Science"
+    ]
+
+
+def _sample_pdf(lines: List[str]) -> bytes:
+    """One-page PDF with a Helvetica text stream, written without a PDF library."""
+    text = b" ".join(
+        b"(" + line.encode("latin-1", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(")
+        .replace(b")", b"\\)") + b") '"
+        for line in lines
+    )
+    stream = b"BT /F1 10 Tf 50 760 Td 13 TL " + text + b" ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def _sample_docx(lines: List[str]) -> bytes:
+    """DOCX package holding just the main document part, one paragraph per line."""
+    paragraphs = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as package:
+        package.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>'
+        )
+        package.writestr(
+            "word/document.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'
+        )
+    return output.getvalue()
+
+
+def warm_up_analyzer(analyzer: ResumeAnalyzer) -> Dict[str, float]:
+    """
+    Build everything the analyzer creates lazily by running a sample resume
+    through the whole pipeline: stopwords, the taxonomy and its compiled
+    matcher, the fuzzy index, pdfminer's font and encoding tables, and the
+    matching and scoring code paths.
+
+    The sample runs on a scratch analyzer that shares the taxonomy but none
+    of the caches, pools or skill statistics, and its stage timings are not
+    recorded, so warming up leaves no trace in results, metrics, files or
+    worker processes.
+
+    Args:
+        analyzer: Analyzer whose taxonomy and settings to warm up
+
+    Returns:
+        Seconds spent per warm-up step
+    """
+    with metrics.isolated():
+        return _warm_up(analyzer)
+
+
+def _warm_up(analyzer: ResumeAnalyzer) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    def timed(step: str, fn: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        fn()
+        timings[step] = time.perf_counter() - start
+
+    timed("stopwords", load_stopwords)
+    taxonomy = analyzer.taxonomy
+    timed("taxonomy", lambda: len(taxonomy.matcher))
+    if analyzer.fuzzy_matching:
+        timed("fuzzy_index", lambda: taxonomy.fuzzy_matcher)
+
+    scratch = ResumeAnalyzer(
+        taxonomy_manager=analyzer.taxonomy_manager, fuzzy_matching=analyzer.fuzzy_matching,
+        upload_guard=analyzer.upload_guard, **analyzer.extraction_options
+    )
+    lines = _sample_lines(taxonomy.matcher.skills)
+    extractions = {}
+    for extension, document in ((".pdf", _sample_pdf(lines)), (".docx", _sample_docx(lines))):
+        timed(extension[1:], lambda: extractions.setdefault(
+            extension, scratch.extract_resume(document, extension, taxonomy=taxonomy)
+        ))
+
+    def analyze() -> None:
+        extraction = extractions[".pdf"]
+        sections = {item["skill"]: item["section"] for item in extraction.evidence}
+        job_description = "Looking for an engineer with " + ", ".join(lines[-3].split(", ")[::2])
+        for scoring in SCORING_MODES:
+            scratch.analyze_match(extraction.skills, job_description, scoring=scoring, skill_sections=sections)
+        candidates = [extraction.skills, extractions[".docx"].skills, extraction.skills[::2]]
+        list(scratch.analyze_many(job_description, candidates, skill_sections=[sections, None, None]))
+
+    timed("analysis", analyze)
+    return timings
+
+
+class WarmUp:
+    """
+    Warms up an analyzer once per process tree and tells whether that has
+    happened, for readiness checks. A worker forked after its parent warmed
+    up inherits both the warm state and the outcome.
+    """
+
+    def __init__(self, analyzer: ResumeAnalyzer):
+        """
+        Args:
+            analyzer: Analyzer to warm up
+        """
+        self.analyzer = analyzer
+        self.timings: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.timings is not None
+
+    def run(self) -> Dict[str, float]:
+        """
+        Warm up the analyzer unless this process already is.
+
+        Returns:
+            Seconds spent per warm-up step (see warm_up_analyzer)
+        """
+        with self._lock:
+            if self.timings is None:
+                self.timings = warm_up_analyzer(self.analyzer)
+            return self.timings
+
+    def status(self) -> Dict:
+        """
+        Get the warm-up state of this process.
+
+        Returns:
+            Whether it is ready, the milliseconds each warm-up step took and
+            how many objects were frozen out of garbage collection before
+            the fork (see gunicorn.conf.py)
+        """
+        timings = self.timings or {}
+        return {
+            "ready": self.ready,
+            "warm_up_ms": {step: round(seconds * 1000, 1) for step, seconds in timings.items()},
+            "frozen_objects": gc.get_freeze_count()
+        }
@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Compute the content address of a blob.
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache bounded by the total size of its values.
+
+    Sizes are supplied by the caller, so the bound is as accurate as the
+    caller's estimate. Entries may optionally expire after ttl seconds.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        """
+        Args:
+            max_bytes: Maximum total size of cached values
+            ttl: Seconds an entry stays valid, or None to keep it until evicted
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.current_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        """
+        Store a value, evicting least recently used entries to make room.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Size of the value in bytes
+        """
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (value, size, time.monotonic())
+            self.current_bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+class SQLiteCache:
+    """
+    On-disk key/value tier stored in a SQLite file, shared across processes.
+
+    Values are JSON-serialized and zlib-compressed. Each thread of each
+    process opens its own connection, so an instance created before a fork
+    is safe to use in the children.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            max_entries: Prune the oldest entries beyond this count
+            ttl: Seconds an entry stays valid, or None to keep it; expired
+                entries are deleted as new ones are written
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        row = self._connect().execute(
+            "SELECT value, stored_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        blob = zlib.compress(json.dumps(value).encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, blob, time.time())
+            )
+            self._writes += 1
+            # Prune on the first write of each process and every 100 writes
+            # after it, so rows left behind by earlier processes go as well
+            if self._writes % 100 != 1:
+                return
+            if self.ttl is not None:
+                conn.execute("DELETE FROM cache WHERE stored_at < ?", (time.time() - self.ttl,))
+            if self.max_entries is not None:
+                conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+
+class ExtractionCache:
+    """
+    Content-addressed cache of text, skills and skill match spans extracted
+    from uploaded files.
+
+    Entries are keyed by the SHA-256 of the file content, the file extension
+    and the skills database version, so changing the database invalidates
+    them. A byte-bounded in-memory LRU sits in front of an optional SQLite
+    tier that gunicorn workers on the same host can share.
+    """
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024,
+                 disk_path: Optional[str] = None, max_disk_entries: Optional[int] = None):
+        """
+        Args:
+            max_memory_bytes: Size bound of the in-memory tier
+            disk_path: SQLite file for the shared on-disk tier, if any
+            max_disk_entries: Entry bound of the on-disk tier
+        """
+        self.memory = LRUCache(max_memory_bytes)
+        self.disk = SQLiteCache(disk_path, max_entries=max_disk_entries) if disk_path else None
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(file_content: bytes, file_extension: str, version: str) -> str:
+        return f"{content_hash(file_content)}:{file_extension.lower()}:{version}"
+
+    @staticmethod
+    def _size(skills: List[str], text: str, matches: Sequence[Sequence[int]]) -> int:
+        return (sys.getsizeof(text) + sum(sys.getsizeof(skill) for skill in skills)
+                + sys.getsizeof(matches) + 100 * len(matches))
+
+    def get(self, file_content: bytes, file_extension: str,
+            version: str) -> Optional[Tuple[List[str], str, List[Tuple]]]:
+        """
+        Look up the extraction result for a file.
+
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            version: Skills database version
+
+        Returns:
+            Tuple of (extracted_skills, extracted_text, matches), or None on
+            a miss
+        """
+        key = self.make_key(file_content, file_extension, version)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.memory_hits += 1
+            skills, text, matches = entry
+            return list(skills), text, list(matches)
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            # Entries written before match spans were cached lack them and
+            # are extracted again
+            if entry is not None and len(entry) == 3:
+                self.hits += 1
+                self.disk_hits += 1
+                skills, text, matches = entry
+                matches = [tuple(match) for match in matches]
+                self.memory.set(key, (tuple(skills), text, tuple(matches)), self._size(skills, text, matches))
+                return skills, text, matches
+
+        self.misses += 1
+        return None
+
+    def set(self, file_content: bytes, file_extension: str, version: str,
+            skills: List[str], text: str, matches: Sequence[Sequence[float]]) -> None:
+        """
+        Store the extraction result for a file.
+
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            version: Skills database version
+            skills: Extracted skills
+            text: Extracted text
+            matches: Skill matches as (skill_id, start, end) offsets into
+                text, with a trailing confidence for fuzzy matches
+        """
+        key = self.make_key(file_content, file_extension, version)
+        self.memory.set(key, (tuple(skills), text, tuple(matches)), self._size(skills, text, matches))
+        if self.disk is not None:
+            self.disk.set(key, [skills, text, [list(match) for match in matches]])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary of hit, miss and eviction counts and memory usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.memory.evictions,
+            "entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+            "max_memory_bytes": self.memory.max_bytes,
+            "disk_enabled": self.disk is not None
+        }
@@ -0,0 +1,217 @@
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from utils import extraction_worker
+
+
+class ExtractionBusyError(Exception):
+    """Raised when the extraction queue is full and the job was not accepted."""
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when an extraction job does not finish within its timeout."""
+
+
+class ExtractionPool:
+    """
+    Bounded process pool that runs document text extraction off the request thread.
+
+    pdfminer is CPU-bound and holds the GIL for the whole parse, so extraction
+    runs in worker processes. At most max_queue jobs may be queued or running
+    at once; further jobs are rejected immediately with ExtractionBusyError so
+    callers can answer 429 instead of piling up requests. Workers are replaced
+    after max_jobs_per_worker jobs to cap pdfminer's memory growth.
+
+    A job that outlives its timeout cannot be cancelled once a worker has
+    picked it up, so the pool is recycled instead: its workers are killed,
+    which fails the jobs they were running and frees their slots, and the
+    next job starts a fresh pool.
+
+    The executor is created lazily in the process that first submits a job,
+    so a pool built at import time is safe to inherit across a fork. Jobs
+    run utils.extraction_worker, which imports nothing but the extractor.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: Optional[int] = None,
+                 timeout: float = 30.0, max_jobs_per_worker: int = 100):
+        """
+        Configure the pool; no processes are started until the first job.
+
+        Args:
+            max_workers: Number of extraction processes
+            max_queue: Maximum number of queued plus running jobs
+                (defaults to four per worker)
+            timeout: Seconds to wait for a job before giving up
+            max_jobs_per_worker: Jobs a worker runs before it is replaced
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue if max_queue is not None else max_workers * 4
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._executor_jobs = 0
+        self.pending_jobs = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Return the executor for this process, creating or recycling it as needed.
+
+        Returns:
+            Process pool executor
+        """
+        with self._lock:
+            if self._executor is not None and self._executor_pid != os.getpid():
+                # Inherited from a parent process across fork; unusable here
+                self._executor = None
+
+            if self._executor is not None and sys.version_info < (3, 11):
+                # Without max_tasks_per_child, recycle the whole pool instead
+                if self._executor_jobs >= self.max_jobs_per_worker * self.max_workers:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+
+            if self._executor is None:
+                if sys.version_info >= (3, 11):
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        max_tasks_per_child=self.max_jobs_per_worker
+                    )
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self._executor_pid = os.getpid()
+                self._executor_jobs = 0
+
+            self._executor_jobs += 1
+            return self._executor
+
+    def _reset_executor(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Drop a broken executor so the next job starts a fresh one.
+
+        Args:
+            executor: Executor that raised BrokenProcessPool
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _recycle_executor(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Kill the workers of an executor stuck on a job and drop it, so the
+        next job starts a fresh one. Jobs still queued are cancelled and jobs
+        running on the killed workers fail with BrokenProcessPool; either way
+        their slots are released.
+
+        Args:
+            executor: Executor running the job that timed out
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # Snapshot the workers first: shutdown() forgets about them
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.kill()
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.pending_jobs -= 1
+        self._slots.release()
+
+    def submit(self, file_content: bytes, file_extension: str, **options) -> Future:
+        """
+        Queue a text extraction job.
+
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            **options: Extraction budgets passed on to extract_text_from_file
+
+        Returns:
+            Future resolving to the extracted text
+
+        Raises:
+            ExtractionBusyError: If max_queue jobs are already in flight
+        """
+        return self._submit(file_content, file_extension, options)[0]
+
+    def _submit(self, file_content: bytes, file_extension: str,
+                options: Dict[str, Any]) -> Tuple[Future, ProcessPoolExecutor]:
+        if not self._slots.acquire(blocking=False):
+            raise ExtractionBusyError("Server is busy processing other documents. Please retry shortly.")
+
+        with self._lock:
+            self.pending_jobs += 1
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(extraction_worker.extract_text, file_content, file_extension, options)
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            self._release(None)
+            raise
+        except Exception:
+            self._release(None)
+            raise
+
+        # The slot is held until the job really finishes, even if the caller
+        # gave up waiting, so runaway documents keep counting against the limit
+        future.add_done_callback(self._release)
+        return future, executor
+
+    def extract_text(self, file_content: bytes, file_extension: str,
+                     timeout: Optional[float] = None, **options) -> str:
+        """
+        Extract text from a file in a worker process and wait for the result.
+
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+            timeout: Seconds to wait; defaults to the pool timeout
+            **options: Extraction budgets passed on to extract_text_from_file
+
+        Returns:
+            Extracted text as string
+
+        Raises:
+            ExtractionBusyError: If the queue is full
+            ExtractionTimeoutError: If the job does not finish in time
+        """
+        future, executor = self._submit(file_content, file_extension, options)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Already running: the only way to stop it is to stop its worker
+                self._recycle_executor(executor)
+            raise ExtractionTimeoutError("Timed out extracting text from document")
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise Exception("Error extracting text: extraction worker crashed")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Wait for queued and running jobs to finish first
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None and self._executor_pid == os.getpid():
+            executor.shutdown(wait=wait, cancel_futures=not wait)
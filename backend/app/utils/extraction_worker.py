@@ -0,0 +1,26 @@
+"""
+Entry point of the extraction pool's worker processes.
+
+On Python 3.11+ the pool starts workers with the spawn method, so each one
+imports what its jobs need from scratch. This module imports only the text
+extractor, keeping the app, the taxonomy and the stores out of the workers.
+"""
+
+from typing import Any, Dict
+
+from utils.text_extractor import extract_text_from_file
+
+
+def extract_text(file_content: bytes, file_extension: str, options: Dict[str, Any]) -> str:
+    """
+    Worker task: extract the text of one document.
+
+    Args:
+        file_content: File content as bytes
+        file_extension: File extension (e.g., '.pdf', '.docx')
+        options: Extraction budgets passed on to extract_text_from_file
+
+    Returns:
+        Extracted text as string
+    """
+    return extract_text_from_file(file_content, file_extension, **options)
@@ -0,0 +1,232 @@
+import zlib
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.skill_matcher import TOKEN_PATTERN, MatchQueries, normalize_tokens
+
+
+def string_hash(data: bytes) -> int:
+    """Stable hash of a string's UTF-8 bytes, identical in every process."""
+    return zlib.crc32(data)
+
+
+def edge_hash(node: int, token_id: int) -> int:
+    """Stable hash of a trie edge, identified by its source node and token."""
+    return (node * 2654435761 + token_id * 40503) & 0xFFFFFFFF
+
+
+def build_hash_table(hashes: Sequence, values: Sequence) -> List[int]:
+    """
+    Build an open-addressing hash table with linear probing.
+
+    Args:
+        hashes: Hash of every key
+        values: Value of every key, non-negative
+
+    Returns:
+        Slots holding value + 1, or 0 when empty; the length is a power of
+        two at least twice the number of keys
+    """
+    size = 8
+    while size < 2 * len(hashes):
+        size *= 2
+    mask = size - 1
+    slots = [0] * size
+    for key_hash, value in zip(hashes, values):
+        slot = key_hash & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = value + 1
+    return slots
+
+
+class StringTable(Sequence):
+    """Read-only sequence of strings decoded on access from a flat buffer."""
+
+    def __init__(self, data: memoryview, offsets: memoryview, ids: Optional[memoryview] = None):
+        """
+        Args:
+            data: Concatenated UTF-8 bytes of the interned strings
+            offsets: String i is data[offsets[i]:offsets[i + 1]]
+            ids: Optional indirection: item i is string ids[i]
+        """
+        self._data = data
+        self._offsets = offsets
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids) if self._ids is not None else len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        string_id = self._ids[index] if self._ids is not None else index
+        return str(self._data[self._offsets[string_id]:self._offsets[string_id + 1]], "utf-8")
+
+    def raw(self, string_id: int) -> memoryview:
+        """Undecoded bytes of an interned string."""
+        return self._data[self._offsets[string_id]:self._offsets[string_id + 1]]
+
+
+class GroupedStrings(Sequence):
+    """Read-only sequence of string lists stored as CSR offsets into a string table."""
+
+    def __init__(self, names: StringTable, offsets: memoryview, members: memoryview):
+        self._names = names
+        self._offsets = offsets
+        self._members = members
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return [self._names[member] for member in self._members[self._offsets[index]:self._offsets[index + 1]]]
+
+
+class FlatSkillMatcher(MatchQueries):
+    """
+    SkillMatcher that runs directly on the arrays of a mapped taxonomy snapshot.
+
+    Nothing is deserialized when a snapshot is opened: names, categories and
+    the trie are read from the mapping on demand, so the pages are shared by
+    every process mapping the same file. Token and skill-name lookups go
+    through open-addressing hash tables stored in the snapshot. Two small,
+    bounded LRU caches keep the per-token cost close to a dict lookup on
+    ordinary text.
+    """
+
+    def __init__(self, sections: Dict[str, memoryview], token_cache_size: int = 16384,
+                 name_cache_size: int = 4096):
+        """
+        Args:
+            sections: Typed views of the snapshot sections, as written by
+                services.taxonomy.write_snapshot
+            token_cache_size: Cached document tokens
+            name_cache_size: Cached skill_id() lookups
+        """
+        self._strings = StringTable(sections["str_data"], sections["str_offs"])
+        self.skills = StringTable(sections["str_data"], sections["str_offs"], sections["skills"])
+        category_names = StringTable(sections["str_data"], sections["str_offs"], sections["cat_name"])
+        self.categories = GroupedStrings(category_names, sections["skl_coff"], sections["skl_cats"])
+
+        self._token_slots = sections["tok_hash"]
+        self._token_mask = len(self._token_slots) - 1
+        self._edge_slots = sections["edge_hsh"]
+        self._edge_mask = len(self._edge_slots) - 1
+        self._edge_sources = sections["edge_src"]
+        self._edge_tokens = sections["edge_tok"]
+        self._edge_children = sections["edge_dst"]
+        self._node_skills = sections["node_skl"]
+        self._name_slots = sections["name_hsh"]
+        self._name_mask = len(self._name_slots) - 1
+
+        self._token_id = lru_cache(maxsize=token_cache_size)(self._find_token_id)
+        self._cached_skill_id = lru_cache(maxsize=name_cache_size)(self._find_skill_id)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _find_token_id(self, token: str) -> int:
+        data = token.encode("utf-8")
+        slot = string_hash(data) & self._token_mask
+        while True:
+            string_id = self._token_slots[slot] - 1
+            if string_id < 0:
+                return -1
+            if self._strings.raw(string_id) == data:
+                return string_id
+            slot = (slot + 1) & self._token_mask
+
+    def _find_skill_id(self, skill: str) -> Optional[int]:
+        key = skill.lower()
+        slot = string_hash(key.encode("utf-8")) & self._name_mask
+        while True:
+            skill_id = self._name_slots[slot] - 1
+            if skill_id < 0:
+                return None
+            if self.skills[skill_id].lower() == key:
+                return skill_id
+            slot = (slot + 1) & self._name_mask
+
+    def _child(self, node: int, token_id: int) -> int:
+        slot = edge_hash(node, token_id) & self._edge_mask
+        while True:
+            edge = self._edge_slots[slot] - 1
+            if edge < 0:
+                return -1
+            if self._edge_sources[edge] == node and self._edge_tokens[edge] == token_id:
+                return self._edge_children[edge]
+            slot = (slot + 1) & self._edge_mask
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        """
+        Look up the ID of a canonical skill name (case-insensitive).
+
+        Args:
+            skill: Skill name
+
+        Returns:
+            Skill ID, or None if the skill is unknown
+        """
+        return self._cached_skill_id(skill)
+
+    def lookup(self, alias: str) -> Optional[int]:
+        """
+        Find the skill an alias or skill name is registered for.
+
+        Args:
+            alias: Alias text, matched on its normalized tokens
+
+        Returns:
+            Skill ID, or None if no skill is registered under exactly these tokens
+        """
+        node = 0
+        for token in normalize_tokens(alias):
+            token_id = self._token_id(token)
+            node = self._child(node, token_id) if token_id >= 0 else -1
+            if node < 0:
+                return None
+        skill_id = self._node_skills[node]
+        return skill_id if skill_id >= 0 else None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Find every skill occurrence in text in a single left-to-right pass.
+
+        Args:
+            text: Input text string
+
+        Yields:
+            Tuples of (skill_id, start, end) with character offsets into text
+        """
+        token_id = self._token_id
+        tokens = [(token_id(match.group().lower()), match.start(), match.end())
+                  for match in TOKEN_PATTERN.finditer(text)]
+
+        position = 0
+        while position < len(tokens):
+            node = 0
+            best = None
+            cursor = position
+            while cursor < len(tokens) and tokens[cursor][0] >= 0:
+                node = self._child(node, tokens[cursor][0])
+                if node < 0:
+                    break
+                cursor += 1
+                if self._node_skills[node] >= 0:
+                    best = (self._node_skills[node], cursor)
+
+            if best is None:
+                position += 1
+                continue
+
+            skill_id, stop = best
+            yield skill_id, tokens[position][1], tokens[stop - 1][2]
+            position = stop
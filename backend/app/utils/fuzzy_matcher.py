@@ -0,0 +1,265 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from utils.skill_matcher import TOKEN_PATTERN, normalize_tokens
+
+
+# Confidence of a match that only differs from a skill name in spacing or
+# punctuation ("Postgre SQL", "NodeJS")
+JOIN_CONFIDENCE = 0.95
+MIN_JOIN_LENGTH = 4
+# Shortest word that may contain a typo
+MIN_TYPO_LENGTH = 7
+
+# Text allowed between the tokens of one fuzzy match: "Postgre SQL",
+# "Kuber-netes", "Vue js", but not "Java, Script"
+_JOINERS = frozenset(("", " ", "-", ".", "/"))
+
+
+def compact_form(text: str) -> str:
+    """
+    Join the tokens of text without separators or dots, so that "Vue.js",
+    "Vue js" and "VueJS" all compact to "vuejs".
+
+    Args:
+        text: Input text string
+
+    Returns:
+        Compact lowercase form
+    """
+    return "".join(normalize_tokens(text)).replace(".", "")
+
+
+def allowed_distance(length: int) -> int:
+    """
+    Edit distance tolerated for a word of the given length. Words shorter
+    than seven characters are only ever matched exactly: too many ordinary
+    words are one edit away from "React", "Docker" or "Render".
+
+    Args:
+        length: Length of the word, without separators
+
+    Returns:
+        Maximum number of typos
+    """
+    if length < MIN_TYPO_LENGTH:
+        return 0
+    return 1 if length < 11 else 2
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """
+    Every string obtained by deleting up to distance characters from word,
+    including word itself.
+    """
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance between two strings: insertions,
+    deletions, substitutions and transpositions of adjacent characters.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Distances above the limit are not computed exactly
+
+    Returns:
+        Distance, or limit + 1 when it exceeds the limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if before is not None and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class FuzzyMatcher:
+    """
+    Typo- and spacing-tolerant skill matcher for text the exact matcher
+    could not resolve.
+
+    Skill names and aliases are indexed by their "compact" form, the
+    normalized tokens joined without separators, so "Postgre SQL", "NodeJS"
+    and "Kuber-netes" are plain dictionary lookups. Typos are found with a
+    SymSpell-style deletion index: every string obtained by deleting up to
+    allowed_distance() characters from a compact name points back to it, so
+    a word only needs its own deletions looked up instead of being compared
+    with every skill. Candidates are then verified with a bounded edit
+    distance. The cost per word is independent of the taxonomy size, and
+    lookups are cached since documents repeat their words.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, int]], max_distance: int = 2, max_window: int = 3,
+                 cache_size: int = 16384):
+        """
+        Build the index.
+
+        Args:
+            terms: (name, skill_id) of every skill name and alias
+            max_distance: Upper bound on the typos tolerated in one match
+            max_window: Most document tokens joined into one match
+            cache_size: Cached word lookups
+        """
+        self.max_distance = max_distance
+        self.max_window = max_window
+        self._compact: Dict[str, int] = {}
+        self._deletes: Dict[str, List[str]] = {}
+
+        for term, skill_id in terms:
+            compact = compact_form(term)
+            if compact:
+                # The first registration wins, as in SkillMatcher
+                self._compact.setdefault(compact, skill_id)
+        for compact in self._compact:
+            for variant in deletes(compact, self._distance(len(compact))):
+                self._deletes.setdefault(variant, []).append(compact)
+        self._prefixes = {compact[:length] for compact in self._compact for length in range(1, len(compact))}
+        self._max_length = max((len(compact) for compact in self._compact), default=0) + max_distance
+
+        self._lookup = lru_cache(maxsize=cache_size)(self._find)
+
+    def __len__(self) -> int:
+        return len(self._compact)
+
+    def _distance(self, length: int) -> int:
+        return min(self.max_distance, allowed_distance(length))
+
+    def _find(self, word: str) -> Optional[Tuple[int, float]]:
+        skill_id = self._compact.get(word)
+        if skill_id is not None:
+            return skill_id, JOIN_CONFIDENCE
+        distance = self._distance(len(word))
+        if distance == 0 or len(word) > self._max_length:
+            return None
+
+        best_distance = distance + 1
+        best: Dict[int, str] = {}
+        for variant in deletes(word, distance):
+            for term in self._deletes.get(variant, ()):
+                # Typos rarely hit the first letter, and requiring it keeps
+                # ordinary words from turning into skills; neither do plurals
+                # and inflections ("principles", "heartbeats") name the skill
+                if term[0] != word[0] or word.startswith(term):
+                    continue
+                limit = min(distance, self._distance(len(term)))
+                found = edit_distance(word, term, limit)
+                if found > limit:
+                    continue
+                if found < best_distance:
+                    best_distance = found
+                    best = {}
+                if found == best_distance:
+                    best[self._compact[term]] = term
+        # A word equally close to two skills is left unmatched
+        if len(best) != 1:
+            return None
+        skill_id, term = best.popitem()
+        return skill_id, round(1.0 - best_distance / len(term), 2)
+
+    def lookup(self, word: str) -> Optional[Tuple[int, float]]:
+        """
+        Find the skill a word most likely means.
+
+        Args:
+            word: Word or phrase, normalized the same way as documents
+
+        Returns:
+            Tuple of (skill_id, confidence), or None if no skill is close enough
+        """
+        return self._lookup(compact_form(word))
+
+    def iter_matches(self, text: str, exact_matches: Sequence[Sequence[int]] = ()
+                     ) -> Iterator[Tuple[int, int, int, float]]:
+        """
+        Find skills in the parts of text that exact matching left unresolved.
+
+        At each unresolved token the longest run of up to max_window tokens
+        whose compact form names a skill wins; failing that, the token alone
+        may name a skill with typos.
+
+        Args:
+            text: Input text string
+            exact_matches: (skill_id, start, end) of the exact matches in text
+
+        Yields:
+            Tuples of (skill_id, start, end, confidence) with character
+            offsets into text
+        """
+        spans = sorted((match[1], match[2]) for match in exact_matches)
+        words: List[Optional[str]] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        # joined[i]: token i may continue a run started before it
+        joined: List[bool] = []
+        span = 0
+        previous_end = -1
+        for match in TOKEN_PATTERN.finditer(text):
+            start = match.start()
+            while span < len(spans) and spans[span][1] <= start:
+                span += 1
+            # Tokens inside an exact match are never rematched
+            if span < len(spans) and spans[span][0] <= start:
+                words.append(None)
+            else:
+                words.append(match.group().lower().replace(".", ""))
+            joined.append(previous_end >= 0 and text[previous_end:start] in _JOINERS)
+            starts.append(start)
+            previous_end = match.end()
+            ends.append(previous_end)
+
+        compact = self._compact
+        prefixes = self._prefixes
+        lookup = self._lookup
+        typos = self.max_distance > 0
+        count = len(words)
+        position = 0
+        while position < count:
+            word = words[position]
+            if word is None or word.isdigit():
+                position += 1
+                continue
+
+            found = None
+            stop = position + 1
+            # Only a word that starts some skill name can start a joined run
+            if word in prefixes:
+                run = word
+                cursor = position + 1
+                while cursor < count and cursor - position < self.max_window and joined[cursor] \
+                        and words[cursor] is not None:
+                    run += words[cursor]
+                    cursor += 1
+                    # Joined runs as short as "g o" are more likely noise than "Go"
+                    if len(run) >= MIN_JOIN_LENGTH and run in compact:
+                        found = compact[run], JOIN_CONFIDENCE
+                        stop = cursor
+            if found is None:
+                if word in compact:
+                    found = compact[word], JOIN_CONFIDENCE
+                elif typos and MIN_TYPO_LENGTH <= len(word) <= self._max_length:
+                    found = lookup(word)
+
+            if found is None:
+                position += 1
+                continue
+
+            skill_id, confidence = found
+            yield skill_id, starts[position], ends[stop - 1], confidence
+            position = stop
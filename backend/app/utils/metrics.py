@@ -0,0 +1,340 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Latency buckets in seconds, from sub-millisecond skill lookups to long PDFs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Size buckets for bytes, pages, characters and tokens
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 1000, 10000, 100000, 1000000, 10000000, 100000000)
+
+# Stage timings of the current request, for Server-Timing headers
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram, one per label value."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    In-process metrics registry rendered in the Prometheus text format.
+
+    Metrics are kept per process: with several gunicorn workers each one
+    reports its own counters, labelled by pid.
+    """
+
+    def __init__(self, prefix: str = "resume_analyzer"):
+        """
+        Args:
+            prefix: Prefix of every metric name
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stage_latency: Dict[str, Histogram] = {}
+        self._input_size: Dict[str, Histogram] = {}
+        self._errors: Counter = Counter()
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """
+        Record the latency of a pipeline stage.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            histogram = self._stage_latency.get(stage)
+            if histogram is None:
+                histogram = self._stage_latency[stage] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, seconds))
+
+    def observe_size(self, kind: str, value: float) -> None:
+        """
+        Record an input size.
+
+        Args:
+            kind: What is measured (bytes, pages, chars, tokens)
+            value: Measured size
+        """
+        with self._lock:
+            histogram = self._input_size.get(kind)
+            if histogram is None:
+                histogram = self._input_size[kind] = Histogram(SIZE_BUCKETS)
+            histogram.observe(value)
+
+    def count_error(self, stage: str, error: BaseException) -> None:
+        """
+        Count an error by stage and exception type.
+
+        Args:
+            stage: Stage or endpoint where the error surfaced
+            error: The exception
+        """
+        with self._lock:
+            self._errors[(stage, type(error).__name__)] += 1
+
+    def register_collector(self, collector: Callable[[], Dict[str, float]]) -> None:
+        """
+        Add gauges computed at scrape time, such as cache counters.
+
+        Args:
+            collector: Returns a dictionary of metric name suffix to value
+        """
+        self._collectors.append(collector)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """
+        Time a block of code as a pipeline stage.
+
+        Args:
+            stage: Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    @contextmanager
+    def isolated(self) -> Iterator[None]:
+        """
+        Record into scratch histograms for the duration of a block and drop
+        them afterwards, e.g. while sample documents are run before serving.
+        Observations made meanwhile by other threads are dropped as well.
+        """
+        with self._lock:
+            saved = self._stage_latency, self._input_size, self._errors
+            self._stage_latency, self._input_size, self._errors = {}, {}, Counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stage_latency, self._input_size, self._errors = saved
+
+    def _render_histograms(self, lines: List[str], name: str, label: str,
+                           histograms: Dict[str, Histogram], pid: int) -> None:
+        lines.append(f"# TYPE {name} histogram")
+        for value, histogram in sorted(histograms.items()):
+            labels = f'{label}="{value}",pid="{pid}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text
+        """
+        pid = os.getpid()
+        lines: List[str] = []
+        with self._lock:
+            self._render_histograms(
+                lines, f"{self.prefix}_stage_seconds", "stage", self._stage_latency, pid
+            )
+            self._render_histograms(
+                lines, f"{self.prefix}_input_size", "kind", self._input_size, pid
+            )
+            lines.append(f"# TYPE {self.prefix}_errors_total counter")
+            for (stage, error_type), count in sorted(self._errors.items()):
+                lines.append(
+                    f'{self.prefix}_errors_total{{stage="{stage}",type="{error_type}",pid="{pid}"}} {count}'
+                )
+
+        for collector in self._collectors:
+            for suffix, value in sorted(collector().items()):
+                lines.append(f'{self.prefix}_{suffix}{{pid="{pid}"}} {float(value)}')
+
+        return "\n".join(lines) + "\n"
+
+
+def process_memory() -> Dict[str, int]:
+    """
+    Memory use of the current process in bytes.
+
+    On Linux this includes the proportional set size (shared pages divided
+    among the processes mapping them) and the private pages, which show what
+    a gunicorn worker really adds; elsewhere only the peak RSS is known.
+
+    Returns:
+        Dictionary with rss and, when available, pss and private byte counts
+    """
+    try:
+        fields = {}
+        with open("/proc/self/smaps_rollup", "r", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+        return {
+            "rss": fields["Rss"],
+            "pss": fields["Pss"],
+            "private": fields["Private_Clean"] + fields["Private_Dirty"]
+        }
+    except (OSError, KeyError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        return {"rss": peak if sys.platform == "darwin" else peak * 1024}
+
+
+def start_request_timings() -> contextvars.Token:
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        Token to pass to finish_request_timings
+    """
+    return _request_timings.set([])
+
+
+def finish_request_timings(token: contextvars.Token) -> List[Tuple[str, float]]:
+    """
+    Stop collecting stage timings for the current request.
+
+    Args:
+        token: Token from start_request_timings
+
+    Returns:
+        Recorded (stage, seconds) pairs
+    """
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    """
+    Format stage timings as a Server-Timing header value.
+
+    Args:
+        timings: (stage, seconds) pairs
+        total: Total request duration in seconds
+
+    Returns:
+        Header value
+    """
+    durations: Dict[str, float] = {}
+    for stage, seconds in timings:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in durations.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class SlowRequestProfiler:
+    """
+    Sampling profiler that keeps stack samples of slow requests only.
+
+    One background thread samples the stacks of threads currently handling
+    requests every interval seconds. When a request takes longer than
+    threshold seconds, its samples are written in the folded-stack format
+    read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, threshold: float, output_dir: str, interval: float = 0.005):
+        """
+        Args:
+            threshold: Seconds a request must take for its profile to be kept
+            output_dir: Directory for .folded files
+            interval: Seconds between samples
+        """
+        self.threshold = threshold
+        self.output_dir = output_dir
+        self.interval = interval
+        self._samples: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _ensure_sampler(self) -> None:
+        # Threads do not survive a fork, so start the sampler in the process using it
+        if self._thread is None or self._thread_pid != os.getpid():
+            self._thread = threading.Thread(target=self._sample_forever, name="slow-request-profiler", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _sample_forever(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                        frame = frame.f_back
+                    samples[";".join(reversed(stack))] += 1
+
+    def begin(self) -> None:
+        """Start sampling the current thread."""
+        with self._lock:
+            self._ensure_sampler()
+            self._samples[threading.get_ident()] = Counter()
+
+    def end(self, name: str, duration: float) -> Optional[str]:
+        """
+        Stop sampling the current thread and keep the profile if it was slow.
+
+        Args:
+            name: Request name used in the file name
+            duration: Request duration in seconds
+
+        Returns:
+            Path of the written profile, or None
+        """
+        with self._lock:
+            samples = self._samples.pop(threading.get_ident(), None)
+        if not samples or duration < self.threshold:
+            return None
+
+        safe_name = "".join(c if c.isalnum() else "_" for c in name).strip("_") or "request"
+        path = os.path.join(
+            self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{safe_name}-{int(duration * 1000)}ms.folded"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+# Process-wide registry used by the pipeline modules
+metrics = Metrics()
@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional
+
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+from werkzeug.http import parse_options_header
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a request body is larger than allowed."""
+
+
+class MultipartFileReader:
+    """
+    Incremental multipart/form-data parser that keeps a single file field.
+
+    Body chunks are fed in as they arrive from the client, so a slow upload
+    costs a little memory instead of a blocked worker. The file name is
+    known as soon as the part headers arrive, which lets callers reject an
+    unsupported file before the rest of the body is received.
+    """
+
+    def __init__(self, content_type: str, field: str = "file", max_bytes: Optional[int] = None,
+                 max_field_bytes: int = 64 * 1024, max_parts: int = 32):
+        """
+        Args:
+            content_type: Content-Type header of the request
+            field: Name of the file field to keep; other files are skipped
+            max_bytes: Maximum size of the kept file
+            max_field_bytes: Maximum size of the plain form fields together
+            max_parts: Maximum number of parts in the body
+
+        Raises:
+            ValueError: If the body is not multipart/form-data
+        """
+        mimetype, options = parse_options_header(content_type)
+        if mimetype != "multipart/form-data" or not options.get("boundary"):
+            raise ValueError("Expected a multipart/form-data body")
+
+        # The decoder's own memory limit applies to whole body chunks, so the
+        # field and file sizes are checked here instead
+        self._decoder = MultipartDecoder(options["boundary"].encode("latin-1"), max_parts=max_parts)
+        self.field = field
+        self.max_bytes = max_bytes
+        self.max_field_bytes = max_field_bytes
+        self.filename: Optional[str] = None
+        self.fields: Dict[str, str] = {}
+        self.done = False
+
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._field_bytes = 0
+        # The part being received: the kept file, a form field or neither
+        self._in_file = False
+        self._field_name: Optional[str] = None
+        self._field_data = bytearray()
+
+    @property
+    def size(self) -> int:
+        """Bytes of the kept file received so far."""
+        return self._size
+
+    @property
+    def content(self) -> bytes:
+        """Content of the kept file."""
+        return b"".join(self._chunks)
+
+    def feed(self, data: Optional[bytes]) -> None:
+        """
+        Parse the next chunk of the request body.
+
+        Args:
+            data: Body chunk, or None once the body has ended
+
+        Raises:
+            UploadTooLargeError: If the file or the form fields are too large
+            ValueError: If the body is malformed or ends early
+        """
+        try:
+            self._decoder.receive_data(data)
+            self._process_events()
+        except RequestEntityTooLarge:
+            raise UploadTooLargeError("Too many form fields")
+        if data is None and not self.done:
+            raise ValueError("Incomplete multipart body")
+
+    def _process_events(self) -> None:
+        while not self.done:
+            event = self._decoder.next_event()
+            if isinstance(event, NeedData):
+                return
+            if isinstance(event, Epilogue):
+                self.done = True
+            elif isinstance(event, File):
+                self._in_file = event.name == self.field and self.filename is None
+                self._field_name = None
+                if self._in_file:
+                    self.filename = event.filename
+            elif isinstance(event, Field):
+                self._in_file = False
+                self._field_name = event.name
+                self._field_data = bytearray()
+            elif isinstance(event, Data):
+                self._receive_part_data(event)
+
+    def _receive_part_data(self, event: Data) -> None:
+        if self._in_file:
+            self._size += len(event.data)
+            if self.max_bytes is not None and self._size > self.max_bytes:
+                raise UploadTooLargeError(f"File is larger than {self.max_bytes} bytes")
+            self._chunks.append(event.data)
+        elif self._field_name is not None:
+            self._field_bytes += len(event.data)
+            if self._field_bytes > self.max_field_bytes:
+                raise UploadTooLargeError("Form fields are too large")
+            self._field_data += event.data
+            if not event.more_data:
+                self.fields[self._field_name] = self._field_data.decode("utf-8", "replace")
@@ -0,0 +1,43 @@
+import os
+import stat
+import tempfile
+
+
+def default_private_dir(name: str) -> str:
+    """
+    Per-user directory under the system temp directory, for state shared by
+    the workers of one user on a host.
+
+    Args:
+        name: Directory name, suffixed with the user ID
+
+    Returns:
+        Directory path; see ensure_private_dir before using it
+    """
+    uid = getattr(os, "getuid", lambda: None)()
+    return os.path.join(tempfile.gettempdir(), name if uid is None else f"{name}-{uid}")
+
+
+def ensure_private_dir(path: str) -> str:
+    """
+    Create a directory only the current user can use, or check that an
+    existing one is. Files found in a directory other users can write to,
+    such as a predictable path under /tmp, could have been planted there.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        The path
+
+    Raises:
+        PermissionError: If the path is not a directory owned by the current
+            user and closed to everyone else
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return path
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory owned by user {os.getuid()} with mode 0700")
+    return path
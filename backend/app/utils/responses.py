@@ -0,0 +1,224 @@
+import gzip
+import zlib
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Media types worth compressing; event streams are left alone so that each
+# event reaches the client as soon as it is sent
+COMPRESSIBLE_TYPES = frozenset(("application/json", "application/x-ndjson", "text/plain", "text/html"))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider serializing with orjson, an optional dependency.
+
+    Output matches the default provider apart from non-ASCII characters,
+    which are written as UTF-8 instead of escapes. Values orjson rejects,
+    such as integers beyond 64 bits, fall back to the json module.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+class StreamCompressor:
+    """Incremental compressor for a response body sent in chunks."""
+
+    def __init__(self, encoding: str, gzip_level: int = 6, brotli_quality: int = 5):
+        """
+        Args:
+            encoding: "gzip" or "br"
+            gzip_level: zlib compression level, 1-9
+            brotli_quality: Brotli quality, 0-11
+        """
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits 31: deflate with a gzip header and trailer
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk; output is held back until enough input has arrived."""
+        if self._brotli is not None:
+            return self._brotli.process(chunk)
+        return self._zlib.compress(chunk)
+
+    def finish(self) -> bytes:
+        """End the stream, returning the remaining output."""
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class ResponseCompressor:
+    """
+    Content-Encoding negotiation and compression of response bodies.
+
+    Brotli is offered when the brotli package is installed and preferred
+    over gzip at equal quality values. Bodies below min_bytes are sent
+    as-is: headers and CPU outweigh the saving.
+    """
+
+    def __init__(self, min_bytes: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        """
+        Args:
+            min_bytes: Smallest complete body that is compressed
+            gzip_level: zlib compression level, 1-9
+            brotli_quality: Brotli quality, 0-11; 4-6 suits dynamic responses
+        """
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """
+        Pick the encoding for a response.
+
+        Args:
+            accept_encoding: Accept-Encoding header of the request
+
+        Returns:
+            Supported encoding with the highest quality value, or None to
+            send the body uncompressed
+        """
+        if not accept_encoding:
+            return None
+        weights = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.partition(";")
+            weight = 1.0
+            params = params.strip()
+            if params[:2].lower() == "q=":
+                try:
+                    weight = float(params[2:])
+                except ValueError:
+                    weight = 0.0
+            weights[name.strip().lower()] = weight
+
+        best = None
+        best_weight = 0.0
+        for encoding in self.encodings:
+            weight = weights.get(encoding, weights.get("*", 0.0))
+            if weight > best_weight:
+                best = encoding
+                best_weight = weight
+        return best
+
+    @staticmethod
+    def compressible(media_type: Optional[str]) -> bool:
+        """Whether responses of a media type (without parameters) are compressed."""
+        return media_type in COMPRESSIBLE_TYPES
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compress a complete body.
+
+        Args:
+            body: Response body
+            encoding: Encoding returned by negotiate
+
+        Returns:
+            Compressed body
+        """
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def stream(self, encoding: str) -> StreamCompressor:
+        """Start compressing a body that is sent in chunks."""
+        return StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+
+    def compress_stream(self, chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+        """
+        Compress a streamed body chunk by chunk.
+
+        Args:
+            chunks: Body chunks
+            encoding: Encoding returned by negotiate
+
+        Yields:
+            Compressed chunks
+        """
+        stream = self.stream(encoding)
+        for chunk in chunks:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+
+def select_fields(payload: dict, args: Mapping[str, str], echoed: Tuple[str, ...] = ()) -> dict:
+    """
+    Trim a response payload to what the client asked for.
+
+    Args:
+        payload: Response payload
+        args: Query parameters: compact=1 drops the echoed keys, and
+            fields=a,b keeps only the listed top-level keys
+        echoed: Keys that repeat the request or preview its input
+
+    Returns:
+        The payload, or a trimmed copy
+    """
+    if args.get("compact") == "1" and echoed:
+        payload = {key: value for key, value in payload.items() if key not in echoed}
+    fields = args.get("fields")
+    if fields:
+        wanted = {field.strip() for field in fields.split(",")}
+        payload = {key: value for key, value in payload.items() if key in wanted}
+    return payload
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an ETag with an If-None-Match header, so that a tag
+    validates the gzip, brotli and uncompressed forms of a response alike.
+
+    Args:
+        if_none_match: If-None-Match header of the request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
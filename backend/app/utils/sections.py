@@ -0,0 +1,172 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Heading phrases of each resume section. A line is a heading when it holds
+# nothing but one of these phrases, optionally followed by a colon
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "career summary", "profile", "professional profile",
+                "about me", "objective", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history"),
+    "projects": ("projects", "personal projects", "key projects", "selected projects", "open source"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "skills and tools",
+               "competencies", "core competencies", "technologies", "tech stack", "tools"),
+    "education": ("education", "education and training", "academic background", "qualifications"),
+    "certifications": ("certifications", "certificates", "licenses and certifications", "courses",
+                       "training"),
+    "publications": ("publications", "research"),
+    "awards": ("awards", "honors", "honors and awards", "achievements"),
+    "interests": ("interests", "hobbies", "hobbies and interests", "activities", "volunteering"),
+}
+
+# How much a skill counts towards a match depending on where the resume
+# mentions it: using a skill at work says more than listing it as a hobby.
+# Skills outside any recognized section count as a skills-section listing.
+SECTION_WEIGHTS: Dict[str, float] = {
+    "experience": 1.0,
+    "projects": 0.9,
+    "skills": 0.8,
+    "summary": 0.8,
+    "certifications": 0.7,
+    "publications": 0.7,
+    "education": 0.6,
+    "awards": 0.5,
+    "interests": 0.3,
+}
+DEFAULT_SECTION_WEIGHT = 0.8
+
+
+def _heading_pattern(headings: Dict[str, Tuple[str, ...]]) -> "re.Pattern":
+    groups = []
+    for section, phrases in headings.items():
+        # Longest phrase first, so "work experience" is not cut at "work"
+        alternatives = []
+        for phrase in sorted(phrases, key=len, reverse=True):
+            words = [r'(?:and|&)' if word == "and" else re.escape(word) for word in phrase.split()]
+            alternatives.append(r'[ \t]+'.join(words))
+        groups.append(f"(?P<{section}>{'|'.join(alternatives)})")
+    # Bullets, numbering and page breaks may precede a heading; a colon may follow
+    return re.compile(
+        r'^[ \t\f•*#\-\d.)]*(?:' + '|'.join(groups) + r')[ \t]*:?[ \t]*$',
+        re.IGNORECASE | re.MULTILINE
+    )
+
+
+HEADING_PATTERN = _heading_pattern(SECTION_HEADINGS)
+
+
+def find_sections(text: str) -> List[Tuple[int, str]]:
+    """
+    Find the section headings of a resume.
+
+    The classifier is a single regular expression run over the text, so it
+    costs one C-level scan regardless of the number of heading phrases.
+
+    Args:
+        text: Resume text
+
+    Returns:
+        List of (offset, section) pairs in text order, where offset is the
+        start of the heading line
+    """
+    return [(match.start(), match.lastgroup) for match in HEADING_PATTERN.finditer(text)]
+
+
+def section_weight(section: Optional[str]) -> float:
+    """
+    Args:
+        section: Section name, or None for text outside any section
+
+    Returns:
+        Weight of a skill mentioned in that section
+    """
+    return SECTION_WEIGHTS.get(section, DEFAULT_SECTION_WEIGHT)
+
+
+class ResumeLayout:
+    """
+    Section and page lookup for character offsets into a resume's text.
+
+    PDF pages end with a form feed in the extracted text, so the page of an
+    offset is the number of form feeds before it plus one.
+    """
+
+    def __init__(self, text: str, paged: bool = False):
+        """
+        Args:
+            text: Resume text
+            paged: Whether the text has pages, i.e. comes from a PDF
+        """
+        sections = find_sections(text)
+        self._section_starts = [offset for offset, _ in sections]
+        self._section_names = [section for _, section in sections]
+        self._page_breaks: Optional[List[int]] = None
+        if paged:
+            self._page_breaks = [match.start() for match in re.finditer('\f', text)]
+
+    @property
+    def sections(self) -> List[str]:
+        """Sections found, in text order."""
+        return list(self._section_names)
+
+    def section_at(self, offset: int) -> Optional[str]:
+        """
+        Args:
+            offset: Character offset into the text
+
+        Returns:
+            Section containing the offset, or None before the first heading
+        """
+        index = bisect_right(self._section_starts, offset)
+        return self._section_names[index - 1] if index else None
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """
+        Args:
+            offset: Character offset into the text
+
+        Returns:
+            1-based page number, or None when the text has no pages
+        """
+        if self._page_breaks is None:
+            return None
+        return bisect_right(self._page_breaks, offset) + 1
+
+
+def skill_evidence(text: str, matches: Iterable[Sequence[float]], skills: Sequence[str],
+                   paged: bool = False) -> List[Dict]:
+    """
+    Group skill matches into per-skill evidence with sections and pages.
+
+    Args:
+        text: Text the matches were found in
+        matches: (skill_id, start, end) triples with offsets into text; fuzzy
+            matches carry their confidence as a fourth item
+        skills: Skill names by skill ID
+        paged: Whether the text has pages, i.e. comes from a PDF
+
+    Returns:
+        One entry per skill in order of first mention, with the section that
+        weighs the most under "section" and every span under "spans"
+    """
+    layout = ResumeLayout(text, paged)
+    evidence: Dict[int, Dict] = {}
+    for match in matches:
+        skill_id, start, end = match[:3]
+        section = layout.section_at(start)
+        span = {"start": start, "end": end, "text": text[start:end], "section": section}
+        if paged:
+            span["page"] = layout.page_at(start)
+        if len(match) > 3:
+            span["confidence"] = match[3]
+
+        entry = evidence.get(skill_id)
+        if entry is None:
+            evidence[skill_id] = {"skill": skills[skill_id], "section": section, "spans": [span]}
+        else:
+            entry["spans"].append(span)
+            if section_weight(section) > section_weight(entry["section"]):
+                entry["section"] = section
+    return list(evidence.values())
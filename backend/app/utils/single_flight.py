@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from utils.private_dir import ensure_private_dir
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A computation in progress in this process."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations into one.
+
+    The first caller for a key runs the computation. Callers arriving while
+    it runs wait for it and get its result (or its exception) instead of
+    computing the same thing again.
+
+    Within a process, waiting callers share the result object. Across
+    processes on a host, shared calls claim their key in a SQLite table that
+    holds only who is computing what, never results: callers in other
+    processes poll until the claim is released, then reload the result from
+    wherever the owner put it (e.g. a shared cache), computing it themselves
+    if it is not there. If the owner fails, dies or overruns its lease, the
+    next waiter takes over. Errors are only shared within a process.
+    """
+
+    def __init__(self, path: Optional[str] = None, lease: float = 120.0, poll_interval: float = 0.02):
+        """
+        Args:
+            path: SQLite file for coalescing across processes, or None to
+                coalesce within this process only. It is created readable by
+                the current user only, in a directory only they can use
+            lease: Seconds a claim holds before waiters may take it over
+            poll_interval: Initial seconds between polls of a shared claim;
+                doubles up to ten times that
+
+        Raises:
+            PermissionError: If the directory of path is open to other users
+        """
+        self.path = path
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.leaders = 0
+        self.local_followers = 0
+        self.shared_followers = 0
+
+        if path is not None:
+            ensure_private_dir(os.path.dirname(os.path.abspath(path)))
+            os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS flights ("
+                    "key TEXT PRIMARY KEY, pid INTEGER NOT NULL, started_at REAL NOT NULL)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def do(self, key: str, fn: Callable[[], T], shared: bool = False,
+           reload: Optional[Callable[[], Optional[T]]] = None) -> T:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the computation, e.g. a content hash
+            fn: Computation to run
+            shared: Also coalesce with other processes
+            reload: For shared calls, looks up the result another process
+                computed, returning None if it cannot be found; fn is run
+                again when it is missing
+
+        Returns:
+            Result of fn, computed by this caller or a concurrent one
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.local_followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if shared and self.path is not None:
+                call.result = self._do_shared(key, fn, reload)
+            else:
+                call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _do_shared(self, key: str, fn: Callable[[], T], reload: Optional[Callable[[], Optional[T]]]) -> T:
+        interval = self.poll_interval
+        waited = False
+        while not self._claim(key):
+            waited = True
+            time.sleep(interval)
+            interval = min(interval * 2, self.poll_interval * 10)
+
+        try:
+            if waited and reload is not None:
+                # The previous owner has finished; its result is usually in the cache by now
+                result = reload()
+                if result is not None:
+                    with self._lock:
+                        self.shared_followers += 1
+                    return result
+            return fn()
+        finally:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM flights WHERE key = ? AND pid = ?", (key, os.getpid()))
+
+    def _claim(self, key: str) -> bool:
+        """Claim a key, taking over claims whose owner died or overran its lease."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT pid, started_at FROM flights WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT OR IGNORE INTO flights (key, pid, started_at) VALUES (?, ?, ?)",
+                    (key, os.getpid(), now)
+                )
+            elif now - row[1] > self.lease or not _process_alive(row[0]):
+                conn.execute(
+                    "UPDATE flights SET pid = ?, started_at = ? WHERE key = ? AND pid = ? AND started_at = ?",
+                    (os.getpid(), now, key, row[0], row[1])
+                )
+            owner = conn.execute("SELECT pid, started_at FROM flights WHERE key = ?", (key,)).fetchone()
+        return owner is not None and owner[0] == os.getpid() and owner[1] == now
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Computations run, and callers served by another caller's
+            computation in this process or in another one
+        """
+        return {
+            "leaders": self.leaders,
+            "local_followers": self.local_followers,
+            "shared_followers": self.shared_followers,
+            "in_flight": len(self._calls),
+            "shared": self.path is not None
+        }
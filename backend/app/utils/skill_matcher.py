@@ -0,0 +1,291 @@
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Tokens are runs of ASCII letters/digits, keeping trailing '+' and '#' so
+# that "C++", "C#" and "F#" survive normalization, and '.' between letters or
+# digits so that "Vue.js", "ASP.NET" and "Fly.io" stay one token (as does the
+# leading dot of ".NET"). Everything else ('-', '/', whitespace, a full stop
+# ending a sentence...) separates tokens.
+TOKEN_PATTERN = re.compile(r'(?:(?<![a-z0-9.])\.(?=[a-z0-9]))?[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*',
+                           re.ASCII | re.IGNORECASE)
+
+# Trie key marking the end of an alias; never a valid token.
+_END = ''
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """
+    Split text into the normalized tokens used for skill matching.
+
+    Args:
+        text: Input text string
+
+    Returns:
+        List of lowercase tokens
+    """
+    return [match.group().lower() for match in TOKEN_PATTERN.finditer(text)]
+
+
+class MatchQueries:
+    """
+    Queries derived from iter_matches, shared by the skill matchers.
+
+    Subclasses provide iter_matches(text) yielding (skill_id, start, end),
+    plus the skills and categories sequences indexed by skill ID.
+    """
+
+    skills: Sequence[str]
+    categories: Sequence[Sequence[str]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Find every skill occurrence in text.
+
+        Args:
+            text: Input text string
+
+        Yields:
+            Tuples of (skill_id, start, end) with character offsets into text
+        """
+        raise NotImplementedError
+
+    def find_skill_ids(self, text: str) -> List[int]:
+        """
+        Find the IDs of skills mentioned in text.
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Unique skill IDs in order of first appearance
+        """
+        seen = set()
+        skill_ids = []
+        for skill_id, _, _ in self.iter_matches(text):
+            if skill_id not in seen:
+                seen.add(skill_id)
+                skill_ids.append(skill_id)
+        return skill_ids
+
+    def count_skill_ids(self, text: str) -> Dict[int, int]:
+        """
+        Count the mentions of each skill in text.
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Mention count by skill ID, in order of first appearance
+        """
+        counts: Dict[int, int] = {}
+        for skill_id, _, _ in self.iter_matches(text):
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+        return counts
+
+    def find_skills(self, text: str) -> List[str]:
+        """
+        Find the canonical names of skills mentioned in text.
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Unique skill names in order of first appearance
+        """
+        return [self.skills[skill_id] for skill_id in self.find_skill_ids(text)]
+
+    def find_skills_by_category(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find skills mentioned in text grouped by their categories.
+
+        Args:
+            text: Input text string
+
+        Returns:
+            Dictionary of found skills by category
+        """
+        found: Dict[str, List[str]] = {}
+        for skill_id in self.find_skill_ids(text):
+            for category in self.categories[skill_id]:
+                found.setdefault(category, []).append(self.skills[skill_id])
+        return found
+
+
+class SkillMatcher(MatchQueries):
+    """
+    Multi-word skill matcher compiled once from a skills database.
+
+    Every skill name is normalized into a token sequence and inserted into a
+    token trie. Matching walks the text once, taking the longest alias that
+    starts at each token, so the per-document cost depends on the document
+    length and the longest alias, not on the size of the database.
+    """
+
+    def __init__(self, skills_database: Dict[str, List[str]]):
+        """
+        Compile the matcher from a skills database.
+
+        Args:
+            skills_database: Dictionary containing skills by category
+        """
+        self.skills: List[str] = []
+        self.categories: List[List[str]] = []
+        self._skill_ids: Dict[str, int] = {}
+        self._trie: Dict = {}
+
+        for category, skills in skills_database.items():
+            for skill in skills:
+                skill_id = self._skill_ids.get(skill.lower())
+                if skill_id is None:
+                    skill_id = len(self.skills)
+                    self._skill_ids[skill.lower()] = skill_id
+                    self.skills.append(skill)
+                    self.categories.append([])
+                    self.add_alias(skill, skill_id)
+                if category not in self.categories[skill_id]:
+                    self.categories[skill_id].append(category)
+
+    @classmethod
+    def from_flat(cls, skills: Sequence[str], categories: Sequence[Sequence[str]],
+                  edge_tokens: Sequence[str], node_offsets: Sequence[int],
+                  edge_children: Sequence[int], node_skills: Sequence[int]) -> "SkillMatcher":
+        """
+        Rebuild a matcher from the output of flatten() without re-normalizing
+        any skill or alias.
+
+        Args:
+            skills: Canonical skill names by ID
+            categories: Categories of each skill
+            edge_tokens: Token of every trie edge
+            node_offsets: Edges of node n are node_offsets[n]:node_offsets[n + 1]
+            edge_children: Target node of every trie edge
+            node_skills: Skill ID ending at each node, or -1
+
+        Returns:
+            Matcher equivalent to the flattened one
+        """
+        matcher = cls.__new__(cls)
+        matcher.skills = list(skills)
+        matcher.categories = [list(skill_categories) for skill_categories in categories]
+        matcher._skill_ids = {skill.lower(): skill_id for skill_id, skill in enumerate(matcher.skills)}
+
+        nodes = [{} for _ in range(len(node_skills))]
+        for index, node in enumerate(nodes):
+            if node_skills[index] >= 0:
+                node[_END] = int(node_skills[index])
+            for edge in range(node_offsets[index], node_offsets[index + 1]):
+                node[edge_tokens[edge]] = nodes[edge_children[edge]]
+        matcher._trie = nodes[0] if nodes else {}
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def flatten(self) -> Tuple[List[str], List[int], List[int], List[int]]:
+        """
+        Flatten the token trie into arrays, numbering nodes breadth-first
+        from the root (node 0) and sorting each node's edges by token.
+
+        Returns:
+            Tuple of (edge_tokens, node_offsets, edge_children, node_skills)
+            as accepted by from_flat
+        """
+        edge_tokens: List[str] = []
+        edge_children: List[int] = []
+        node_offsets = [0]
+        node_skills: List[int] = []
+
+        nodes = [self._trie]
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            index += 1
+            node_skills.append(node.get(_END, -1))
+            for token in sorted(token for token in node if token != _END):
+                edge_tokens.append(token)
+                edge_children.append(len(nodes))
+                nodes.append(node[token])
+            node_offsets.append(len(edge_tokens))
+        return edge_tokens, node_offsets, edge_children, node_skills
+
+    def add_alias(self, alias: str, skill_id: int) -> None:
+        """
+        Register an alternative spelling for a skill.
+
+        Args:
+            alias: Alias text, normalized the same way as documents
+            skill_id: ID of the canonical skill
+        """
+        tokens = normalize_tokens(alias)
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # The first registration wins, mirroring the database order
+        node.setdefault(_END, skill_id)
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        """
+        Look up the ID of a canonical skill name (case-insensitive).
+
+        Args:
+            skill: Skill name
+
+        Returns:
+            Skill ID, or None if the skill is unknown
+        """
+        return self._skill_ids.get(skill.lower())
+
+    def lookup(self, alias: str) -> Optional[int]:
+        """
+        Find the skill an alias or skill name is registered for.
+
+        Args:
+            alias: Alias text, matched on its normalized tokens
+
+        Returns:
+            Skill ID, or None if no skill is registered under exactly these tokens
+        """
+        node = self._trie
+        for token in normalize_tokens(alias):
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Find every skill occurrence in text in a single left-to-right pass.
+
+        Args:
+            text: Input text string
+
+        Yields:
+            Tuples of (skill_id, start, end) with character offsets into text
+        """
+        tokens = [(match.group().lower(), match.start(), match.end())
+                  for match in TOKEN_PATTERN.finditer(text)]
+
+        position = 0
+        while position < len(tokens):
+            node = self._trie
+            best = None
+            cursor = position
+            while cursor < len(tokens):
+                node = node.get(tokens[cursor][0])
+                if node is None:
+                    break
+                cursor += 1
+                if _END in node:
+                    best = (node[_END], cursor)
+
+            if best is None:
+                position += 1
+                continue
+
+            skill_id, stop = best
+            yield skill_id, tokens[position][1], tokens[stop - 1][2]
+            position = stop
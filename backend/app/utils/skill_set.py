@@ -0,0 +1,171 @@
+import base64
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from utils.skill_matcher import SkillMatcher
+
+
+class SkillSet:
+    """
+    Immutable set of skill IDs stored as a bitset.
+
+    Bit i is set when the set holds skill ID i of a taxonomy's vocabulary
+    (SkillMatcher.skills), so the set is one Python integer: intersection and
+    difference are single integer operations, and the serialized form is
+    one bit per skill of the vocabulary, about 35 bytes for the bundled
+    taxonomy. Skill IDs are only meaningful together with the taxonomy
+    version they came from.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, bits: int = 0):
+        """
+        Args:
+            bits: Bitset with bit i set for skill ID i
+        """
+        if bits < 0:
+            raise ValueError("A skill bitset cannot be negative")
+        self._bits = bits
+
+    @classmethod
+    def from_ids(cls, skill_ids: Iterable[int], size: Optional[int] = None) -> "SkillSet":
+        """
+        Args:
+            skill_ids: Skill IDs, in any order
+            size: Vocabulary size; IDs outside it are rejected when given
+
+        Returns:
+            Set of the skill IDs
+
+        Raises:
+            ValueError: If an ID is not a non-negative integer below size
+        """
+        bits = 0
+        for skill_id in skill_ids:
+            if not isinstance(skill_id, int) or isinstance(skill_id, bool) or skill_id < 0 \
+                    or (size is not None and skill_id >= size):
+                raise ValueError(f"Unknown skill ID: {skill_id!r}")
+            bits |= 1 << skill_id
+        return cls(bits)
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], matcher: SkillMatcher) -> "SkillSet":
+        """
+        Args:
+            names: Canonical skill names (case-insensitive); unknown names
+                are dropped
+            matcher: Matcher defining the skill ID vocabulary
+
+        Returns:
+            Set of the named skills
+        """
+        bits = 0
+        for name in names:
+            skill_id = matcher.skill_id(name)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return cls(bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: Optional[int] = None) -> "SkillSet":
+        """
+        Args:
+            data: Little-endian bitset, as returned by to_bytes
+            size: Vocabulary size; bits beyond it are rejected when given
+
+        Returns:
+            Decoded set
+
+        Raises:
+            ValueError: If the bitset holds IDs outside the vocabulary
+        """
+        bits = int.from_bytes(data, "little")
+        if size is not None and bits >> size:
+            raise ValueError("The skill bitset holds IDs beyond the vocabulary")
+        return cls(bits)
+
+    @classmethod
+    def from_base64(cls, text: str, size: Optional[int] = None) -> "SkillSet":
+        """
+        Args:
+            text: Base64 of the little-endian bitset, as returned by to_base64
+            size: Vocabulary size; bits beyond it are rejected when given
+
+        Returns:
+            Decoded set
+
+        Raises:
+            ValueError: If text is not base64 or holds IDs outside the vocabulary
+        """
+        return cls.from_bytes(base64.b64decode(text, validate=True), size)
+
+    @property
+    def bits(self) -> int:
+        """Bitset with bit i set for skill ID i."""
+        return self._bits
+
+    def to_bytes(self, length: Optional[int] = None) -> bytes:
+        """
+        Args:
+            length: Pad the bitset to this many bytes, e.g. (vocabulary
+                size + 7) // 8 for fixed-width storage
+
+        Returns:
+            Little-endian bitset, by default as short as the largest skill
+            ID allows
+        """
+        if length is None:
+            length = (self._bits.bit_length() + 7) // 8
+        return self._bits.to_bytes(length, "little")
+
+    def to_base64(self) -> str:
+        """Base64 of to_bytes(), for JSON payloads."""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    def ids(self) -> List[int]:
+        """Skill IDs in ascending order."""
+        return list(self)
+
+    def names(self, skills: Sequence[str]) -> List[str]:
+        """
+        Args:
+            skills: Skill names by skill ID, e.g. SkillMatcher.skills
+
+        Returns:
+            Skill names in skill ID order
+        """
+        return [skills[skill_id] for skill_id in self]
+
+    def __iter__(self) -> Iterator[int]:
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __contains__(self, skill_id: int) -> bool:
+        return skill_id >= 0 and bool(self._bits >> skill_id & 1)
+
+    def __len__(self) -> int:
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self._bits & other._bits)
+
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self._bits | other._bits)
+
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self._bits & ~other._bits)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SkillSet) and self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"SkillSet({self.ids()})"
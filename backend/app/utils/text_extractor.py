@@ -1,81 +1,279 @@
 import os
 import io
-from typing import Optional
-from pdfminer.high_level import extract_text_to_fp
+import re
+import zipfile
+from typing import IO, Iterator, Optional
+from lxml import etree
+from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
-from docx import Document
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 
+from utils.metrics import metrics
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# WordprocessingML elements read by the DOCX extractor
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W + "p"
+_W_T = _W + "t"
+_W_BR = _W + "br"
+_W_TYPE = _W + "type"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run content other than w:t and w:br, with the text python-docx renders it as
+_DOCX_RUN_TEXT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-"
+}
+_DOCX_TAGS = [_W_P, _W_T, _W_BR, _MC_FALLBACK, *_DOCX_RUN_TEXT]
+_DOCX_HEADER_PART = re.compile(r'word/header\d*\.xml$')
+_DOCX_FOOTER_PART = re.compile(r'word/footer\d*\.xml$')
+
+
+def _layout_params(fast_layout: bool) -> LAParams:
+    """
+    Get pdfminer layout parameters.
+    
+    Args:
+        fast_layout: Skip the expensive reading-order analysis of text boxes
+        
+    Returns:
+        Layout parameters
+    """
+    if fast_layout:
+        # boxes_flow=None orders text boxes by position instead of running
+        # the quadratic box-grouping pass; vertical text is not detected
+        return LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+    return LAParams()
+
+
+def iter_pdf_pages(file_content: bytes, max_pages: Optional[int] = None,
+                   max_chars: Optional[int] = None, fast_layout: bool = False) -> Iterator[str]:
+    """
+    Extract text from PDF file content one page at a time.
+    
+    Parsing stops as soon as either budget is spent, so the pages after it
+    are never laid out.
+    
+    Args:
+        file_content: PDF file content as bytes
+        max_pages: Stop after this many pages
+        max_chars: Stop once this many characters have been produced
+        fast_layout: Use cheaper layout analysis
+        
+    Yields:
+        Text of each page, ending with a form feed as in pdfminer's output
+    """
+    pdf_file = io.BytesIO(file_content)
+    resource_manager = PDFResourceManager()
+    output = io.StringIO()
+    device = TextConverter(resource_manager, output, laparams=_layout_params(fast_layout))
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    
+    remaining_chars = max_chars
+    try:
+        for page in PDFPage.get_pages(pdf_file, maxpages=max_pages or 0):
+            with metrics.timed("pdf_page"):
+                interpreter.process_page(page)
+            text = output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            
+            if remaining_chars is not None:
+                text = text[:remaining_chars]
+                remaining_chars -= len(text)
+            yield text
+            
+            if remaining_chars is not None and remaining_chars <= 0:
+                break
+    finally:
+        device.close()
+        output.close()
+
+
+def extract_text_from_pdf(file_content: bytes, max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None, fast_layout: bool = False) -> str:
     """
     Extract text from PDF file content.
     
     Args:
         file_content: PDF file content as bytes
+        max_pages: Stop after this many pages
+        max_chars: Stop once this many characters have been extracted
+        fast_layout: Use cheaper layout analysis
         
     Returns:
         Extracted text as string
     """
     try:
-        # Create a file-like object from bytes
-        pdf_file = io.BytesIO(file_content)
-        
-        # Extract text using pdfminer
-        output = io.StringIO()
-        extract_text_to_fp(pdf_file, output, laparams=LAParams())
-        text = output.getvalue()
-        output.close()
-        
-        return text.strip()
+        pages = iter_pdf_pages(file_content, max_pages, max_chars, fast_layout)
+        return ''.join(pages).strip()
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def _iter_part_paragraphs(part: IO[bytes]) -> Iterator[str]:
+    """
+    Stream the paragraphs of one WordprocessingML part.
+    
+    Every paragraph is yielded, wherever it sits: in the body, in table
+    cells or in text boxes, in document order. A text box anchored in a
+    paragraph comes out just before that paragraph's own text.
+    Elements are cleared as soon as their paragraph ends, so memory stays
+    flat however long the document is.
+    
+    Args:
+        part: Open XML part of the DOCX package
+        
+    Yields:
+        Text of each paragraph, rendered as python-docx does
+    """
+    # Paragraphs nest when a text box sits inside one, so each open
+    # paragraph collects its own text
+    open_paragraphs = []
+    # Text boxes are stored twice, as DrawingML and as a VML fallback
+    fallback_depth = 0
+    context = etree.iterparse(
+        part, events=("start", "end"), tag=_DOCX_TAGS,
+        resolve_entities=False, no_network=True, load_dtd=False
+    )
+    for event, element in context:
+        tag = element.tag
+        if event == "start":
+            if tag == _W_P:
+                open_paragraphs.append([])
+            elif tag == _MC_FALLBACK:
+                fallback_depth += 1
+            continue
+        
+        if tag == _W_P:
+            yield ''.join(open_paragraphs.pop())
+            element.clear(keep_tail=False)
+            # Drop the finished siblings the parser still links to
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        elif tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif open_paragraphs and not fallback_depth:
+            if tag == _W_T:
+                if element.text:
+                    open_paragraphs[-1].append(element.text)
+            elif tag == _W_BR:
+                # Page and column breaks add no text
+                if element.get(_W_TYPE, "textWrapping") == "textWrapping":
+                    open_paragraphs[-1].append("\n")
+            else:
+                open_paragraphs[-1].append(_DOCX_RUN_TEXT[tag])
+
+
+def iter_docx_paragraphs(file_content: bytes) -> Iterator[str]:
+    """
+    Stream the non-empty paragraphs of a DOCX file.
+    
+    The package is read as a plain zip archive and each XML part is parsed
+    incrementally, without building python-docx's object model. Header
+    paragraphs come first, then the document body (tables and text boxes
+    included), then footnotes, endnotes and footers. Headers or footers
+    repeated across sections are yielded once.
+    
+    Args:
+        file_content: DOCX file content as bytes
+        
+    Yields:
+        Stripped text of each non-empty paragraph
+    """
+    with zipfile.ZipFile(io.BytesIO(file_content)) as package:
+        names = set(package.namelist())
+        headers = sorted(name for name in names if _DOCX_HEADER_PART.match(name))
+        footers = sorted(name for name in names if _DOCX_FOOTER_PART.match(name))
+        notes = [name for name in ("word/footnotes.xml", "word/endnotes.xml") if name in names]
+        
+        seen_parts = set()
+        for name in headers + ["word/document.xml"] + notes + footers:
+            with package.open(name) as part:
+                paragraphs = filter(None, (text.strip() for text in _iter_part_paragraphs(part)))
+                if name == "word/document.xml":
+                    yield from paragraphs
+                    continue
+                paragraphs = tuple(paragraphs)
+            if paragraphs not in seen_parts:
+                seen_parts.add(paragraphs)
+                yield from paragraphs
+
+
+def extract_text_from_docx(file_content: bytes, max_chars: Optional[int] = None) -> str:
     """
     Extract text from DOCX file content.
     
     Args:
         file_content: DOCX file content as bytes
+        max_chars: Stop parsing once this many characters have been extracted
         
     Returns:
         Extracted text as string
     """
     try:
-        # Create a file-like object from bytes
-        docx_file = io.BytesIO(file_content)
-        
-        # Load document
-        doc = Document(docx_file)
-        
-        # Extract text from all paragraphs
-        text_parts = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text.strip())
+        with metrics.timed("docx_extraction"):
+            text_parts = []
+            length = 0
+            for paragraph in iter_docx_paragraphs(file_content):
+                text_parts.append(paragraph)
+                length += len(paragraph) + 1
+                if max_chars is not None and length >= max_chars:
+                    break
         
         return '\n'.join(text_parts)
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
 
-def extract_text_from_file(file_content: bytes, file_extension: str) -> str:
+def iter_text_from_file(file_content: bytes, file_extension: str, max_pages: Optional[int] = None,
+                        max_chars: Optional[int] = None, fast_layout: bool = False) -> Iterator[str]:
     """
-    Extract text from file based on its extension.
+    Extract text from file based on its extension, in chunks as it is parsed.
+    
+    PDFs are yielded page by page; DOCX files as a single chunk.
     
     Args:
         file_content: File content as bytes
         file_extension: File extension (e.g., '.pdf', '.docx')
+        max_pages: Stop after this many PDF pages
+        max_chars: Stop once this many characters have been extracted
+        fast_layout: Use cheaper PDF layout analysis
         
-    Returns:
-        Extracted text as string
+    Yields:
+        Chunks of extracted text
     """
     file_extension = file_extension.lower()
     
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_content)
+        try:
+            yield from iter_pdf_pages(file_content, max_pages, max_chars, fast_layout)
+        except Exception as e:
+            raise Exception(f"Error extracting text from PDF: {str(e)}")
     elif file_extension == '.docx':
-        return extract_text_from_docx(file_content)
+        text = extract_text_from_docx(file_content, max_chars)
+        yield text[:max_chars] if max_chars is not None else text
     else:
         raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: .pdf, .docx")
 
+
+def extract_text_from_file(file_content: bytes, file_extension: str, max_pages: Optional[int] = None,
+                           max_chars: Optional[int] = None, fast_layout: bool = False) -> str:
+    """
+    Extract text from file based on its extension.
+    
+    Args:
+        file_content: File content as bytes
+        file_extension: File extension (e.g., '.pdf', '.docx')
+        max_pages: Stop after this many PDF pages
+        max_chars: Stop once this many characters have been extracted
+        fast_layout: Use cheaper PDF layout analysis
+        
+    Returns:
+        Extracted text as string
+    """
+    return ''.join(
+        iter_text_from_file(file_content, file_extension, max_pages, max_chars, fast_layout)
+    ).strip()
+
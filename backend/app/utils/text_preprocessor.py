@@ -1,21 +1,14 @@
-import re
-import nltk
-from typing import List
+import os
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
 # import spacy  # Commented out spaCy for now
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from utils.skill_matcher import SkillMatcher
+from utils.metrics import metrics
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+# NLTK is imported on first use; nothing here touches the disk or network at import
+# NLTK's English stopword list, used when the corpus is not installed
+STOPWORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'stopwords_en.txt')
 
 # Load spaCy model - commented out for now
 # try:
@@ -26,51 +19,39 @@ from nltk.tokenize import word_tokenize
 nlp = None  # Disabled spaCy for now
 
 
-def clean_text(text: str) -> str:
+@lru_cache(maxsize=None)
+def get_stopwords() -> FrozenSet[str]:
     """
-    Clean and normalize text by removing special characters and extra whitespace.
+    Load the English stopword list once per process.
+    
+    Reads the NLTK stopwords corpus if it is installed and the copy of its
+    English list bundled in data/stopwords_en.txt otherwise. Nothing is
+    downloaded; `python -m app.cli download-nltk` installs the corpus.
     
-    Args:
-        text: Input text string
-        
     Returns:
-        Cleaned text string
+        Frozen set of lowercase stopwords
     """
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters but keep spaces and alphanumeric
-    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    import nltk
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        with open(STOPWORDS_PATH, encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f if line.strip())
     
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    return text
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
 
 
-def remove_stopwords(text: str) -> str:
+def warmup() -> None:
     """
-    Remove common stopwords from text.
+    Load everything preprocessing needs up front.
     
-    Args:
-        text: Input text string
-        
-    Returns:
-        Text with stopwords removed
+    Call this before gunicorn forks workers (--preload) so that they start
+    with the stopwords already resident instead of loading them on their
+    first request.
     """
-    # Tokenize text
-    tokens = word_tokenize(text)
-    
-    # Get English stopwords
-    stop_words = set(stopwords.words('english'))
-    
-    # Remove stopwords
-    filtered_tokens = [word for word in tokens if word.lower() not in stop_words]
-    
-    return ' '.join(filtered_tokens)
+    get_stopwords()
 
 
 def extract_entities(text: str) -> List[str]:
@@ -103,63 +84,26 @@ def extract_entities(text: str) -> List[str]:
     return entities
 
 
-def preprocess_text(text: str) -> str:
-    """
-    Complete text preprocessing pipeline.
-    
-    Args:
-        text: Input text string
-        
-    Returns:
-        Preprocessed text string
-    """
-    # Clean text
-    text = clean_text(text)
-    
-    # Remove stopwords
-    text = remove_stopwords(text)
-    
-    return text
-
-
-def extract_skills_from_text(text: str, skills_database: dict) -> List[str]:
+def extract_skills_from_text(text: str, skills_database: dict,
+                             matcher: Optional[SkillMatcher] = None) -> List[str]:
     """
     Extract skills from text using the skills database.
     
     Args:
         text: Input text string
         skills_database: Dictionary containing skills by category
+        matcher: Precompiled matcher for skills_database; compiled on the fly
+            when omitted, so long-lived callers should build one up front
         
     Returns:
         List of found skills
     """
-    # Preprocess text
-    processed_text = preprocess_text(text)
-    
-    # Create a set of all skills from the database
-    all_skills = set()
-    for category, skills in skills_database.items():
-        all_skills.update([skill.lower() for skill in skills])
-    
-    # Tokenize processed text
-    tokens = word_tokenize(processed_text)
-    
-    # Find matching skills
-    found_skills = []
-    for token in tokens:
-        if token.lower() in all_skills:
-            # Find the original case from the database
-            for category, skills in skills_database.items():
-                for skill in skills:
-                    if skill.lower() == token.lower():
-                        found_skills.append(skill)
-                        break
-    
-    # Remove duplicates while preserving order
-    unique_skills = []
-    for skill in found_skills:
-        if skill not in unique_skills:
-            unique_skills.append(skill)
-    
-    return unique_skills
-
+    if matcher is None:
+        matcher = SkillMatcher(skills_database)
+    
+    # Match single- and multi-word skills in one pass over the raw text: no
+    # lowercased, cleaned or re-joined copy of it is made, and punctuated
+    # names such as "C++" and "Vue.js" survive
+    metrics.observe_size("chars", len(text))
+    with metrics.timed("skill_matching"):
+        return matcher.find_skills(text)
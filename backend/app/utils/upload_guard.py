@@ -0,0 +1,165 @@
+import io
+import zipfile
+from typing import Dict, NamedTuple, Optional
+
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+
+# Entries smaller than this may compress as well as they like: short XML
+# parts full of repeated markup legitimately reach ratios in the hundreds
+_RATIO_MIN_BYTES = 1024 * 1024
+
+
+class DocumentTooLargeError(Exception):
+    """Raised when an upload exceeds a size, page or decompression limit."""
+
+
+class UploadInspection(NamedTuple):
+    """What an upload declares about itself, read without parsing its content."""
+    pages: Optional[int]
+    uncompressed_bytes: Optional[int]
+    degraded: bool
+
+
+def pdf_page_count(file_content: bytes) -> Optional[int]:
+    """
+    Read the page count a PDF declares in its page tree.
+
+    Only the trailer, the cross-reference table and the catalog and page
+    tree root objects are read; no page is parsed or laid out.
+
+    Args:
+        file_content: PDF file content as bytes
+
+    Returns:
+        Declared number of pages, or None if the structure cannot be read
+    """
+    try:
+        document = PDFDocument(PDFParser(io.BytesIO(file_content)))
+        pages = resolve1(document.catalog.get("Pages"))
+        count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+    except Exception:
+        return None
+    return count if isinstance(count, int) and count >= 0 else None
+
+
+class UploadGuard:
+    """
+    Cheap inspection of uploaded documents before they are parsed.
+
+    PDFs are checked against the page count of their page tree and DOCX
+    files against the sizes recorded in the zip central directory, so a
+    200 MB PDF or a zip bomb is turned away after reading a few objects
+    and directory entries instead of pinning a worker. Declared sizes can
+    be trusted as bounds: zipfile stops inflating an entry at its recorded
+    size and fails its CRC check, and PDFs are never parsed past max_pages.
+
+    PDFs with more than fast_pages pages are not rejected but parsed in a
+    degraded mode: only the first fast_pages pages, with fast layout.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_pages: int = 500, fast_pages: int = 50,
+                 max_zip_entries: int = 1000, max_uncompressed_bytes: int = 100 * 1024 * 1024,
+                 max_compression_ratio: float = 100.0):
+        """
+        Args:
+            max_bytes: Largest accepted file, or None for no limit
+            max_pages: Largest accepted PDF page count
+            fast_pages: PDFs with more pages are parsed in degraded mode
+            max_zip_entries: Most entries a DOCX package may hold
+            max_uncompressed_bytes: Largest total uncompressed size of a
+                DOCX package
+            max_compression_ratio: Largest uncompressed to compressed size
+                ratio of a DOCX entry of 1 MB or more
+        """
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.fast_pages = min(fast_pages, max_pages)
+        self.max_zip_entries = max_zip_entries
+        self.max_uncompressed_bytes = max_uncompressed_bytes
+        self.max_compression_ratio = max_compression_ratio
+        self.rejected = 0
+        self.degraded = 0
+
+    @property
+    def version(self) -> str:
+        """Identifies the limits that shape extraction results, for cache keys."""
+        return f"{self.max_pages}-{self.fast_pages}"
+
+    def inspect(self, file_content: bytes, file_extension: str) -> UploadInspection:
+        """
+        Check an upload against the limits.
+
+        Args:
+            file_content: File content as bytes
+            file_extension: File extension (e.g., '.pdf', '.docx')
+
+        Returns:
+            Declared page count or uncompressed size, and whether the
+            document should be parsed in degraded mode
+
+        Raises:
+            DocumentTooLargeError: If the upload exceeds a limit
+        """
+        try:
+            if self.max_bytes is not None and len(file_content) > self.max_bytes:
+                raise DocumentTooLargeError(f"File is larger than {self.max_bytes} bytes")
+            file_extension = file_extension.lower()
+            if file_extension == '.pdf':
+                inspection = self._inspect_pdf(file_content)
+            elif file_extension == '.docx':
+                inspection = self._inspect_docx(file_content)
+            else:
+                inspection = UploadInspection(None, None, False)
+        except DocumentTooLargeError:
+            self.rejected += 1
+            raise
+        if inspection.degraded:
+            self.degraded += 1
+        return inspection
+
+    def _inspect_pdf(self, file_content: bytes) -> UploadInspection:
+        pages = pdf_page_count(file_content)
+        if pages is not None and pages > self.max_pages:
+            raise DocumentTooLargeError(f"PDF has {pages} pages; at most {self.max_pages} are accepted")
+        # A PDF whose page tree cannot be read, or that declares fewer pages
+        # than it has, is still never parsed beyond max_pages
+        return UploadInspection(pages, None, pages is not None and pages > self.fast_pages)
+
+    def _inspect_docx(self, file_content: bytes) -> UploadInspection:
+        try:
+            # Opening a package only reads its central directory
+            with zipfile.ZipFile(io.BytesIO(file_content)) as package:
+                entries = package.infolist()
+        except zipfile.BadZipFile:
+            # Not a zip at all; extraction reports it
+            return UploadInspection(None, None, False)
+
+        if len(entries) > self.max_zip_entries:
+            raise DocumentTooLargeError(
+                f"DOCX package has {len(entries)} entries; at most {self.max_zip_entries} are accepted"
+            )
+        uncompressed = sum(entry.file_size for entry in entries)
+        if uncompressed > self.max_uncompressed_bytes:
+            raise DocumentTooLargeError(
+                f"DOCX package expands to {uncompressed} bytes; at most {self.max_uncompressed_bytes} are accepted"
+            )
+        for entry in entries:
+            if entry.file_size >= _RATIO_MIN_BYTES \
+                    and entry.file_size > self.max_compression_ratio * max(entry.compress_size, 1):
+                raise DocumentTooLargeError(
+                    f"DOCX entry {entry.filename} is compressed {entry.file_size // max(entry.compress_size, 1)}:1; "
+                    f"at most {self.max_compression_ratio:g}:1 is accepted"
+                )
+        return UploadInspection(None, uncompressed, False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get inspection counters.
+
+        Returns:
+            Uploads rejected and uploads parsed in degraded mode
+        """
+        return {"rejected": self.rejected, "degraded": self.degraded}
@@ -0,0 +1,125 @@
+"""
+Timing and baseline-comparison helpers for the benchmark suite.
+"""
+
+import json
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples.
+
+    Args:
+        samples: Measured values
+        fraction: Percentile between 0 and 1
+
+    Returns:
+        Percentile value
+    """
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None, **extra) -> Dict:
+    """
+    Summarize latencies measured in seconds.
+
+    Args:
+        latencies: Per-operation latencies in seconds
+        elapsed: Wall time of the whole run, for throughput under concurrency;
+            defaults to the sum of the latencies
+        **extra: Additional fields to include (input sizes, ...)
+
+    Returns:
+        Dictionary of latency percentiles in milliseconds and throughput
+    """
+    total = elapsed if elapsed is not None else sum(latencies)
+    return {
+        "runs": len(latencies),
+        "mean_ms": round(1000 * sum(latencies) / len(latencies), 4),
+        "p50_ms": round(1000 * percentile(latencies, 0.50), 4),
+        "p95_ms": round(1000 * percentile(latencies, 0.95), 4),
+        "p99_ms": round(1000 * percentile(latencies, 0.99), 4),
+        "ops_per_sec": round(len(latencies) / total, 2) if total > 0 else None,
+        **extra
+    }
+
+
+def measure(fn: Callable[[], object], runs: int, warmup: int = 1, **extra) -> Dict:
+    """
+    Time repeated calls of fn.
+
+    Args:
+        fn: Function to benchmark
+        runs: Number of timed calls
+        warmup: Untimed calls made first
+        **extra: Additional fields for the summary
+
+    Returns:
+        Latency summary
+    """
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, **extra)
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    """
+    Args:
+        path: Baseline JSON file
+
+    Returns:
+        Stored results, or None if the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(path: str, results: Dict) -> None:
+    """
+    Args:
+        path: Output JSON file
+        results: Benchmark results
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Find benchmarks whose median latency regressed against a baseline.
+
+    Args:
+        results: Current results
+        baseline: Baseline results
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower)
+
+    Returns:
+        Human-readable regression messages; empty if there are none
+    """
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or not previous.get("p50_ms"):
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{name}: p50 {current['p50_ms']:.3f} ms vs baseline "
+                f"{previous['p50_ms']:.3f} ms ({(ratio - 1) * 100:+.0f}%)"
+            )
+    return regressions
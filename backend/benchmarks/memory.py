@@ -0,0 +1,202 @@
+"""
+Memory report for the skills taxonomy across forked workers.
+
+Run from the backend directory:
+
+    python -m benchmarks.memory                          # bundled taxonomy
+    python -m benchmarks.memory --skills 50000 --workers 4
+    python -m benchmarks.memory --skills 50000 --no-preload
+
+For each way of holding the taxonomy, a fresh process loads it and forks
+--workers workers, as gunicorn --preload does. Every worker matches text
+with it and then reports its memory while all of them are alive, so the
+proportional set size (PSS) splits shared pages fairly:
+
+- none: no taxonomy, the baseline cost of a worker
+- compiled: Python dict trie and lists, as built from the JSON sources
+- mapped: FlatSkillMatcher on the memory-mapped binary snapshot
+
+With --no-preload every worker loads the taxonomy after the fork, like a
+worker picking up a hot reload.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(BACKEND_DIR, "app")
+sys.path.insert(0, APP_DIR)
+
+from benchmarks.harness import percentile, save_results
+from benchmarks.synthetic import make_lines, make_taxonomy
+
+MODES = ("none", "compiled", "mapped")
+
+
+def _load(mode: str, skills_path: str, aliases_path: str, snapshot_dir: str):
+    from services.taxonomy import TaxonomyManager
+
+    if mode == "none":
+        return None
+    if mode == "compiled":
+        return TaxonomyManager(skills_path, aliases_path).get()
+    return TaxonomyManager(skills_path, aliases_path, snapshot_dir=snapshot_dir, mapped=True).get()
+
+
+def _worker(mode: str, taxonomy, paths: List[str], text: str, rounds: int,
+            barrier, results) -> None:
+    import gc
+    from utils.metrics import process_memory
+
+    if taxonomy is None and mode != "none":
+        taxonomy = _load(mode, *paths)
+
+    match_ms = None
+    if taxonomy is not None:
+        matcher = taxonomy.matcher
+        start = time.perf_counter()
+        for _ in range(rounds):
+            skills = matcher.find_skills(text)
+        match_ms = (time.perf_counter() - start) / rounds * 1000
+        # Batch scoring looks skills up by name as well
+        for skill in skills:
+            matcher.skill_id(skill)
+    gc.collect()
+
+    barrier.wait()
+    memory = process_memory()
+    barrier.wait()
+    results.put({**memory, "match_ms": match_ms})
+
+
+def _measure(mode: str, paths: List[str], workers: int, text: str, rounds: int,
+             preload: bool, output) -> None:
+    """Runs in a fresh process: load (when preloading), fork workers, collect."""
+    # Import everything first so the parent's load cost is the taxonomy alone
+    import services.taxonomy  # noqa: F401
+    from utils.metrics import process_memory
+
+    before = process_memory()["rss"]
+    taxonomy = _load(mode, *paths) if preload else None
+    parent_load = process_memory()["rss"] - before
+
+    context = multiprocessing.get_context("fork")
+    # The parent stays alive during measurement, like the gunicorn master
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(mode, taxonomy, paths, text, rounds, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get(timeout=600) for _ in processes]
+    for process in processes:
+        process.join()
+
+    output.put({"mode": mode, "parent_load_bytes": parent_load, "workers": samples})
+
+
+def _median(samples: List[Dict], field: str) -> Optional[float]:
+    values = [sample[field] for sample in samples if sample.get(field) is not None]
+    return percentile(values, 0.5) if values else None
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills", type=int, default=0,
+                        help="synthetic taxonomy size (default: the bundled taxonomy)")
+    parser.add_argument("--workers", type=int, default=4, help="forked workers per mode")
+    parser.add_argument("--rounds", type=int, default=5, help="matching rounds per worker")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="load the taxonomy in every worker after the fork")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    from services.taxonomy import DEFAULT_ALIASES_PATH, DEFAULT_SKILLS_PATH, TaxonomyManager
+
+    work_dir = tempfile.mkdtemp(prefix="resume-analyzer-memory-")
+    try:
+        skills_path, aliases_path = DEFAULT_SKILLS_PATH, DEFAULT_ALIASES_PATH
+        if args.skills:
+            skills_database, aliases = make_taxonomy(args.skills)
+            skills_path = os.path.join(work_dir, "skills.json")
+            aliases_path = os.path.join(work_dir, "skill_aliases.json")
+            with open(skills_path, "w", encoding="utf-8") as f:
+                json.dump(skills_database, f)
+            with open(aliases_path, "w", encoding="utf-8") as f:
+                json.dump(aliases, f)
+
+        snapshot_dir = os.path.join(work_dir, "snapshots")
+        # Compile the snapshot once up front, as the first worker would
+        taxonomy = TaxonomyManager(skills_path, aliases_path, snapshot_dir=snapshot_dir, mapped=True).get()
+        paths = [skills_path, aliases_path, snapshot_dir]
+        skills = list(taxonomy.matcher.skills)
+        text = "\n".join(make_lines(skills, 2000, random.Random(1), skills_per_line=1.0))
+
+        report = {
+            "skills": len(skills),
+            "aliases": taxonomy.alias_count,
+            "source_bytes": os.path.getsize(skills_path) + os.path.getsize(aliases_path),
+            "snapshot_bytes": taxonomy.size,
+            "workers": args.workers,
+            "preload": args.preload,
+            "modes": {}
+        }
+
+        # Each mode is measured from a fresh interpreter, so they do not share pages
+        spawn = multiprocessing.get_context("spawn")
+        for mode in MODES:
+            output = spawn.Queue()
+            process = spawn.Process(
+                target=_measure, args=(mode, paths, args.workers, text, args.rounds, args.preload, output)
+            )
+            process.start()
+            result = output.get(timeout=1200)
+            process.join()
+            report["modes"][mode] = {
+                "parent_load_mb": round(result["parent_load_bytes"] / 2 ** 20, 2),
+                "worker_rss_mb": round(_median(result["workers"], "rss") / 2 ** 20, 2),
+                "worker_pss_mb": _round_mb(_median(result["workers"], "pss")),
+                "worker_private_mb": _round_mb(_median(result["workers"], "private")),
+                "match_ms": _median(result["workers"], "match_ms")
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"taxonomy: {report['skills']} skills, {report['aliases']} aliases; "
+          f"sources {report['source_bytes'] / 2 ** 20:.2f} MB, snapshot {report['snapshot_bytes'] / 2 ** 20:.2f} MB")
+    print(f"{'mode':10s} {'parent load':>12s} {'worker RSS':>12s} {'worker PSS':>12s} "
+          f"{'private':>12s} {'match':>10s}")
+    for mode, stats in report["modes"].items():
+        match = f"{stats['match_ms']:.2f} ms" if stats["match_ms"] is not None else "-"
+        print(f"{mode:10s} {stats['parent_load_mb']:9.2f} MB {stats['worker_rss_mb']:9.2f} MB "
+              f"{_format_mb(stats['worker_pss_mb'])} {_format_mb(stats['worker_private_mb'])} {match:>10s}")
+
+    if args.output:
+        save_results(args.output, report)
+    return 0
+
+
+def _round_mb(value: Optional[float]) -> Optional[float]:
+    return round(value / 2 ** 20, 2) if value is not None else None
+
+
+def _format_mb(value: Optional[float]) -> str:
+    return f"{value:9.2f} MB" if value is not None else f"{'n/a':>12s}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
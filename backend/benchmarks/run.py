@@ -0,0 +1,297 @@
+"""
+Benchmark suite for the extraction and matching pipeline.
+
+Run from the backend directory:
+
+    python -m benchmarks                       # stage and HTTP benchmarks
+    python -m benchmarks --suite gunicorn      # load test a local gunicorn
+    python -m benchmarks --save-baseline       # record benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json
+
+When a baseline exists, any benchmark whose median latency is more than
+--tolerance slower than the baseline is reported and the exit status is 1.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(BACKEND_DIR, "app")
+sys.path.insert(0, APP_DIR)
+
+from benchmarks.harness import compare, load_baseline, measure, save_results, summarize
+from benchmarks.synthetic import make_job_description, make_resume_docx, make_resume_pdf
+
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+
+
+def python_docx_text(file_content: bytes) -> str:
+    """Reference DOCX extraction through python-docx: body paragraphs only."""
+    from docx import Document
+
+    document = Document(io.BytesIO(file_content))
+    return "\n".join(
+        paragraph.text.strip() for paragraph in document.paragraphs if paragraph.text.strip()
+    )
+
+
+def run_stage_benchmarks(args: argparse.Namespace, results: Dict) -> None:
+    """Micro-benchmark each pipeline stage in-process."""
+    from services.job_descriptions import JobDescriptionCache, JobDescriptionStore
+    from services.resume_analyzer import ResumeAnalyzer
+    from services.scoring import SCORING_MODES
+    from utils.text_extractor import extract_text_from_docx, extract_text_from_pdf
+    from utils.text_preprocessor import extract_skills_from_text
+
+    analyzer = ResumeAnalyzer()
+    skills = analyzer.skill_matcher.skills
+    runs = args.runs
+
+    for pages in args.pages:
+        pdf = make_resume_pdf(skills, pages=pages, seed=pages)
+        results[f"extract_text_from_pdf[{pages}p]"] = measure(
+            lambda: extract_text_from_pdf(pdf), runs, bytes=len(pdf), pages=pages
+        )
+
+    # Skills also sit in a table, the page header and a sidebar text box
+    docx = make_resume_docx(skills, paragraphs=50 * max(args.pages), seed=1, header=True, text_box=True)
+    results["extract_text_from_docx"] = measure(
+        lambda: extract_text_from_docx(docx), runs, bytes=len(docx),
+        skills_found=len(analyzer.skill_matcher.find_skills(extract_text_from_docx(docx)))
+    )
+    results["extract_text_from_docx[python-docx]"] = measure(
+        lambda: python_docx_text(docx), runs, bytes=len(docx),
+        skills_found=len(analyzer.skill_matcher.find_skills(python_docx_text(docx)))
+    )
+
+    text = extract_text_from_pdf(make_resume_pdf(skills, pages=max(args.pages), seed=2))
+    results["extract_skills_from_text"] = measure(
+        lambda: extract_skills_from_text(text, analyzer.skills_database, analyzer.skill_matcher),
+        runs * 5, chars=len(text)
+    )
+
+    # Fuzzy matching runs on top of exact matching, over the tokens it left unresolved
+    taxonomy = analyzer.taxonomy
+    fuzzy_matcher = taxonomy.fuzzy_matcher
+    results["skill_matching"] = measure(
+        lambda: list(taxonomy.matcher.iter_matches(text)), runs * 5, chars=len(text)
+    )
+    results["skill_matching[fuzzy]"] = measure(
+        lambda: list(fuzzy_matcher.iter_matches(text, list(taxonomy.matcher.iter_matches(text)))), runs * 5,
+        chars=len(text)
+    )
+
+    job_description = make_job_description(skills, seed=3)
+    candidate_skills = extract_skills_from_text(text, analyzer.skills_database, analyzer.skill_matcher)
+    results["analyze_match"] = measure(
+        lambda: analyzer.analyze_match(candidate_skills, job_description), runs * 5,
+        jd_chars=len(job_description), candidate_skills=len(candidate_skills)
+    )
+
+    # Every candidate viewed re-posts the same job description; by ID it is a cache lookup
+    with tempfile.TemporaryDirectory() as store_dir:
+        jd_analyzer = ResumeAnalyzer(
+            taxonomy_manager=analyzer.taxonomy_manager,
+            jd_cache=JobDescriptionCache(),
+            jd_store=JobDescriptionStore(os.path.join(store_dir, "job-descriptions.sqlite3"))
+        )
+        jd_id = jd_analyzer.register_job_description(job_description)[0]
+        results["analyze_match[jd_id]"] = measure(
+            lambda: jd_analyzer.analyze_match(candidate_skills, jd_id=jd_id), runs * 5,
+            jd_chars=len(job_description), candidate_skills=len(candidate_skills)
+        )
+
+    rng = random.Random(8)
+    candidates = [rng.sample(skills, min(20, len(skills))) for _ in range(10000)]
+    for mode in SCORING_MODES:
+        results[f"analyze_many[10k,{mode}]"] = measure(
+            lambda: list(analyzer.analyze_many(job_description, candidates, top_k=20, scoring=mode)),
+            runs, candidates=len(candidates)
+        )
+
+
+def run_http_benchmarks(args: argparse.Namespace, results: Dict) -> None:
+    """Benchmark the API endpoints through the Flask test client."""
+    import main
+
+    client = main.app.test_client()
+    skills = main.resume_analyzer.skill_matcher.skills
+    pdf = make_resume_pdf(skills, pages=max(args.pages), seed=4)
+    job_description = make_job_description(skills, seed=5)
+
+    def upload():
+        response = client.post(
+            "/upload_resume", data={"file": (io.BytesIO(pdf), "resume.pdf")},
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response
+
+    candidate_skills = upload().get_json()["candidate_skills"]
+
+    def analyze():
+        response = client.post(
+            "/analyze", json={"candidate_skills": candidate_skills, "job_description": job_description}
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    results["http:/upload_resume"] = measure(upload, args.runs, bytes=len(pdf))
+    results["http:/analyze"] = measure(analyze, args.runs * 5)
+
+    if main.extraction_pool is not None:
+        main.extraction_pool.shutdown()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _multipart(field: str, filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8") + content + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _load_test(send: Callable[[], None], requests: int, concurrency: int) -> Dict:
+    def timed(_):
+        start = time.perf_counter()
+        send()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed, range(requests)))
+    return summarize(latencies, elapsed=time.perf_counter() - start, concurrency=concurrency)
+
+
+def run_gunicorn_benchmarks(args: argparse.Namespace, results: Dict) -> None:
+    """Load test /upload_resume and /analyze on a local gunicorn server."""
+    from services.resume_analyzer import ResumeAnalyzer
+
+    skills = ResumeAnalyzer().skill_matcher.skills
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "--preload",
+         "--bind", f"127.0.0.1:{port}", "--workers", str(args.gunicorn_workers)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f"{base_url}/health", timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.2)
+
+        pdf = make_resume_pdf(skills, pages=max(args.pages), seed=6)
+        upload_body, upload_type = _multipart("file", "resume.pdf", pdf)
+        analyze_body = json.dumps({
+            "candidate_skills": skills[:20],
+            "job_description": make_job_description(skills, seed=7)
+        }).encode("utf-8")
+
+        def post(path: str, body: bytes, content_type: str) -> None:
+            request = urllib.request.Request(
+                base_url + path, data=body, headers={"Content-Type": content_type}
+            )
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+
+        results["gunicorn:/upload_resume"] = _load_test(
+            lambda: post("/upload_resume", upload_body, upload_type), args.requests, args.concurrency
+        )
+        results["gunicorn:/analyze"] = _load_test(
+            lambda: post("/analyze", analyze_body, "application/json"), args.requests * 5, args.concurrency
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+SUITES = {
+    "stages": run_stage_benchmarks,
+    "http": run_http_benchmarks,
+    "gunicorn": run_gunicorn_benchmarks
+}
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run (repeatable, default: stages and http)")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20],
+                        help="synthetic PDF sizes in pages")
+    parser.add_argument("--requests", type=int, default=50, help="requests per gunicorn load test")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent gunicorn clients")
+    parser.add_argument("--gunicorn-workers", type=int, default=2)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed median slowdown before failing (default 0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    # Measure real extraction work, not cache hits
+    os.environ.setdefault("EXTRACTION_CACHE_BYTES", "0")
+
+    benchmarks: Dict[str, Dict] = {}
+    for suite in args.suite or ["stages", "http"]:
+        SUITES[suite](args, benchmarks)
+
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": benchmarks
+    }
+
+    for name, stats in benchmarks.items():
+        print(f"{name:40s} p50 {stats['p50_ms']:10.3f} ms   p95 {stats['p95_ms']:10.3f} ms   "
+              f"{stats['ops_per_sec']:10.2f} ops/s")
+
+    if args.output:
+        save_results(args.output, results)
+
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
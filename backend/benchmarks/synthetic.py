@@ -0,0 +1,280 @@
+"""
+Synthetic resume generator for benchmarks.
+
+Builds PDF and DOCX resumes of configurable size entirely offline. PDFs are
+written by hand (one Helvetica text stream per page) so no PDF library is
+needed; DOCX files use python-docx.
+"""
+
+import io
+import random
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+
+
+FILLER_WORDS = (
+    "designed built led delivered improved maintained migrated scaled owned reviewed "
+    "team platform service pipeline customers latency reliability features product "
+    "architecture production analytics reporting integration performance tooling"
+).split()
+
+SECTION_HEADINGS = ["SUMMARY", "EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION", "INTERESTS"]
+
+SYLLABLES = "ka lo mi ne ra tu zo vi pe sa do ri fu ga xe by qu ho le ma".split()
+SKILL_SUFFIXES = ["", "", "", "JS", "DB", "Cloud", "Studio", "ML", "Ops", "Framework", "CI", "SQL"]
+
+
+def make_lines(skills: List[str], lines: int, rng: random.Random,
+               skills_per_line: float = 0.3) -> List[str]:
+    """
+    Generate resume-like lines of text sprinkled with skills.
+
+    Args:
+        skills: Skill names to mention
+        lines: Number of lines
+        rng: Random source
+        skills_per_line: Average number of skills per line
+
+    Returns:
+        List of lines
+    """
+    text_lines = []
+    for index in range(lines):
+        if index % 12 == 0:
+            text_lines.append(SECTION_HEADINGS[(index // 12) % len(SECTION_HEADINGS)])
+            continue
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(6, 12))]
+        if skills and rng.random() < skills_per_line:
+            words.insert(rng.randrange(len(words)), rng.choice(skills))
+        text_lines.append(" ".join(words).capitalize())
+    return text_lines
+
+
+def _escape_pdf_text(line: str) -> bytes:
+    encoded = line.encode("latin-1", "replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Build a PDF with one text stream per page.
+
+    Args:
+        pages: Lines of text for each page
+
+    Returns:
+        PDF file content as bytes
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    # Every page is two objects (content, page) and the page tree follows them
+    pages_id = font_id + 2 * len(pages) + 1
+
+    page_ids = []
+    for lines in pages:
+        operations = b" ".join(b"(" + _escape_pdf_text(line) + b") '" for line in lines)
+        stream = b"BT /F1 10 Tf 50 760 Td 13 TL " + operations + b" ET"
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    add(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog_id, xref_offset)
+    )
+    return output.getvalue()
+
+
+# A floating text box as Word writes it: DrawingML with a VML fallback that
+# repeats the same text
+_TEXT_BOX_XML = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing>'
+    '<wp:anchor distT="0" distB="0" distL="0" distR="0" simplePos="0" relativeHeight="1" '
+    'behindDoc="0" locked="0" layoutInCell="1" allowOverlap="1">'
+    '<wp:simplePos x="0" y="0"/><wp:positionH relativeFrom="column"><wp:posOffset>0</wp:posOffset>'
+    '</wp:positionH><wp:positionV relativeFrom="paragraph"><wp:posOffset>0</wp:posOffset></wp:positionV>'
+    '<wp:extent cx="1828800" cy="914400"/><wp:wrapSquare wrapText="bothSides"/>'
+    '<wp:docPr id="100" name="Text Box 1"/><a:graphic><a:graphicData '
+    'uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"><wps:wsp>'
+    '<wps:cNvSpPr txBox="1"/><wps:spPr/><wps:txbx><w:txbxContent>{paragraphs}</w:txbxContent>'
+    '</wps:txbx><wps:bodyPr/></wps:wsp></a:graphicData></a:graphic></wp:anchor></w:drawing>'
+    '</mc:Choice><mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>{paragraphs}'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def make_docx(paragraphs: List[str], table_rows: Optional[List[List[str]]] = None,
+              header: Optional[List[str]] = None, text_box: Optional[List[str]] = None) -> bytes:
+    """
+    Build a DOCX document.
+
+    Args:
+        paragraphs: Body paragraphs
+        table_rows: Optional table (e.g. a skills grid) appended after them
+        header: Optional page header paragraphs
+        text_box: Optional paragraphs of a text box anchored to the first
+            body paragraph
+
+    Returns:
+        DOCX file content as bytes
+    """
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+
+    if table_rows:
+        table = document.add_table(rows=len(table_rows), cols=max(len(row) for row in table_rows))
+        for row_index, row in enumerate(table_rows):
+            for column_index, cell in enumerate(row):
+                table.cell(row_index, column_index).text = cell
+
+    if header:
+        header_part = document.sections[0].header
+        header_part.paragraphs[0].text = header[0]
+        for paragraph in header[1:]:
+            header_part.add_paragraph(paragraph)
+
+    if text_box:
+        box_paragraphs = "".join(
+            f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(paragraph)}</w:t></w:r></w:p>"
+            for paragraph in text_box
+        )
+        anchor = document.paragraphs[0] if document.paragraphs else document.add_paragraph()
+        anchor._p.append(parse_xml(_TEXT_BOX_XML.format(paragraphs=box_paragraphs)))
+
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def make_resume_pdf(skills: List[str], pages: int = 2, lines_per_page: int = 50, seed: int = 0) -> bytes:
+    """
+    Build a synthetic PDF resume.
+
+    Args:
+        skills: Skill names to mention
+        pages: Number of pages
+        lines_per_page: Lines of text per page
+        seed: Random seed, for reproducible output
+
+    Returns:
+        PDF file content as bytes
+    """
+    rng = random.Random(seed)
+    return make_pdf([make_lines(skills, lines_per_page, rng) for _ in range(pages)])
+
+
+def make_resume_docx(skills: List[str], paragraphs: int = 100, skills_table: bool = True,
+                     seed: int = 0, header: bool = False, text_box: bool = False) -> bytes:
+    """
+    Build a synthetic DOCX resume.
+
+    Args:
+        skills: Skill names to mention
+        paragraphs: Number of body paragraphs
+        skills_table: Append a skills grid table, as many real resumes do
+        seed: Random seed, for reproducible output
+        header: Put a line mentioning skills in the page header
+        text_box: Put a sidebar text box listing skills next to the body
+
+    Returns:
+        DOCX file content as bytes
+    """
+    rng = random.Random(seed)
+    table_rows = None
+    if skills_table and skills:
+        grid = rng.sample(skills, min(12, len(skills)))
+        table_rows = [grid[index:index + 4] for index in range(0, len(grid), 4)]
+    header_lines = None
+    if header and skills:
+        header_lines = [f"Jane Doe - {', '.join(rng.sample(skills, min(3, len(skills))))}"]
+    box_lines = rng.sample(skills, min(6, len(skills))) if text_box and skills else None
+    return make_docx(make_lines(skills, paragraphs, rng), table_rows, header_lines, box_lines)
+
+
+def make_job_description(skills: List[str], required: int = 10, words: int = 300, seed: int = 0) -> str:
+    """
+    Build a synthetic job description.
+
+    Args:
+        skills: Skill names to pick requirements from
+        required: Number of distinct skills mentioned
+        words: Approximate length in words
+        seed: Random seed, for reproducible output
+
+    Returns:
+        Job description text
+    """
+    rng = random.Random(seed)
+    wanted = rng.sample(skills, min(required, len(skills)))
+    lines = make_lines(wanted, max(1, words // 9), rng, skills_per_line=0.5)
+    return "We are hiring. Requirements: " + ", ".join(wanted) + ".\n" + "\n".join(lines)
+
+
+def make_taxonomy(skills: int, categories: int = 50, aliases_per_skill: float = 0.5,
+                  seed: int = 0) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Build a large synthetic skills taxonomy, in the format of data/skills.json
+    and data/skill_aliases.json.
+
+    Args:
+        skills: Number of canonical skills
+        categories: Number of categories
+        aliases_per_skill: Average number of aliases per skill
+        seed: Random seed, for reproducible output
+
+    Returns:
+        Tuple of (skills by category, aliases by canonical skill)
+    """
+    rng = random.Random(seed)
+    used = set()
+
+    def fresh_name() -> str:
+        while True:
+            word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+            name = f"{word} {rng.choice(SKILL_SUFFIXES)}".strip()
+            key = "".join(name.lower().split())
+            if key not in used:
+                used.add(key)
+                return name
+
+    names = [fresh_name() for _ in range(skills)]
+    skills_database: Dict[str, List[str]] = {f"category_{index}": [] for index in range(categories)}
+    for name in names:
+        skills_database[f"category_{rng.randrange(categories)}"].append(name)
+
+    aliases: Dict[str, List[str]] = {}
+    for _ in range(int(skills * aliases_per_skill)):
+        aliases.setdefault(rng.choice(names), []).append(fresh_name())
+    return skills_database, aliases
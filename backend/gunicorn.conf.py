@@ -0,0 +1,54 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory:
+
+    gunicorn app.main:app --bind 0.0.0.0:8000
+    gunicorn app.asgi:app -k uvicorn.workers.UvicornWorker
+
+The app is imported and warmed up in the master (see services.warmup), then
+its heap is frozen out of garbage collection before workers are forked.
+Workers start warm, and the collector never writes to the pages they
+share with the master, which would otherwise copy them one by one. Set
+GUNICORN_PRELOAD=false to import and warm up in each worker instead.
+"""
+
+import gc
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+if preload_app:
+    # A collection while the app loads frees objects between long-lived
+    # ones; later allocations would land in those holes on shared pages
+    gc.disable()
+
+
+def when_ready(server):
+    """Warm up in the master, then freeze everything allocated so far."""
+    if not server.cfg.preload_app:
+        # --no-preload on the command line overrides GUNICORN_PRELOAD
+        gc.enable()
+        return
+    try:
+        from app.main import analyzer_warm_up
+
+        timings = analyzer_warm_up.run()
+    finally:
+        # Workers must not inherit a disabled collector, even if warming up failed
+        gc.freeze()
+        gc.enable()
+    server.log.info(
+        "Warmed up in %.0f ms, froze %d objects", sum(timings.values()) * 1000, gc.get_freeze_count()
+    )
+
+
+def pre_fork(server, worker):
+    # Replacement workers fork later; objects the master created meanwhile
+    # are frozen too
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    """Warm up workers that did not inherit a warm master; a no-op otherwise."""
+    from app.main import analyzer_warm_up
+
+    analyzer_warm_up.run()
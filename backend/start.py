@@ -8,7 +8,7 @@ import os
 import sys
 
 def main():
-    """Main function to start the FastAPI server"""
+    """Main function to start the async (ASGI) server"""
     
     # Add the current directory to Python path
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -17,20 +17,24 @@ def main():
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
     reload = os.getenv("RELOAD", "true").lower() == "true"
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
     
     print(f"🚀 Starting AI Resume Analyzer Backend...")
     print(f"📍 Host: {host}")
     print(f"🔌 Port: {port}")
     print(f"🔄 Reload: {reload}")
-    print(f"📖 API Docs: http://{host}:{port}/docs")
+    print(f"👷 Workers: {1 if reload else workers}")
     print(f"🔍 Health Check: http://{host}:{port}/health")
     
-    # Start the server
+    # Start the server; uvicorn waits for open requests on shutdown, then the
+    # app drains background jobs (ASYNC_SHUTDOWN_TIMEOUT)
     uvicorn.run(
-        "app.main:app",
+        "app.asgi:app",
         host=host,
         port=port,
         reload=reload,
+        workers=None if reload else workers,
+        timeout_graceful_shutdown=float(os.getenv("ASYNC_SHUTDOWN_TIMEOUT", "30")),
         log_level="info"
     )
 
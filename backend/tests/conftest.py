@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app imports its modules as top-level utils/services packages
+sys.path.insert(0, os.path.join(BACKEND_DIR, "app"))
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope="session")
+def analyzer():
+    from services.resume_analyzer import ResumeAnalyzer
+
+    return ResumeAnalyzer()
+
+
+@pytest.fixture(scope="session")
+def matcher(analyzer):
+    return analyzer.taxonomy.matcher
+
+
+@pytest.fixture
+def scoring_analyzer(analyzer):
+    from services.resume_analyzer import ResumeAnalyzer
+
+    # Fresh skill statistics, so weighted scores do not depend on other tests
+    return ResumeAnalyzer(taxonomy_manager=analyzer.taxonomy_manager)
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    state = tmp_path_factory.mktemp("state")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name, value in {
+            "EXTRACTION_WORKERS": "0", "SINGLE_FLIGHT_PATH": "", "UPLOAD_MAX_PAGES": "20",
+            "JOB_DB_PATH": str(state / "jobs.sqlite3"), "JD_STORE_PATH": str(state / "jds.sqlite3"),
+        }.items():
+            monkeypatch.setenv(name, value)
+        from app.main import app
+    return app.test_client()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def asgi(client):
+    # The client fixture configures the environment app.main reads on import
+    from app import asgi
+
+    return asgi
+
+
+def call(app, method, path, body=b"", headers=()):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = {"body": b"", "chunks": 0}
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message.get("body"):
+            response["body"] += message["body"]
+            response["chunks"] += 1
+
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": b"", "http_version": "1.1",
+        "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+    }
+    asyncio.run(app(scope, receive, send))
+    return response
+
+
+def post_json(app, path, payload):
+    return call(app, "POST", path, json.dumps(payload).encode(), [("content-type", "application/json")])
+
+
+def test_oversized_upload_reports_the_limit_checked(asgi):
+    limit = asgi.app.max_body_bytes
+    response = call(asgi.app, "POST", "/upload_resume",
+                    headers=[("content-type", "multipart/form-data; boundary=x"),
+                             ("content-length", str(limit + 1))])
+    assert response["status"] == 413
+    assert json.loads(response["body"]) == {"error": f"Request body is larger than {limit} bytes"}
+
+
+@pytest.mark.parametrize("payload", [
+    {"candidates": [["Python"]]},
+    {"job_description": "Python", "candidates": []},
+    {"job_description": "Python", "candidates": [["Python"], "Python"]},
+    {"job_description": "Python", "candidates": [{"candidate_skill_ids": [0]}]},
+    {"job_description": "Python", "candidates": [["Python"]], "top_k": 0},
+    {"job_description": "Python", "candidates": [["Python"]], "scoring": "cosine"},
+])
+def test_batch_validation_matches_flask(asgi, client, payload):
+    expected = client.post("/analyze/batch", json=payload)
+    response = post_json(asgi.app, "/analyze/batch", payload)
+    assert response["status"] == expected.status_code
+    assert json.loads(response["body"]) == expected.get_json()
+
+
+@pytest.mark.parametrize("payload", [
+    {"job_description": "Python"},
+    {"candidate_skills": ["Python"]},
+    {"candidate_skills": ["Python"], "job_description": "Python", "skill_sections": ["x"]},
+])
+def test_analyze_validation_matches_flask(asgi, client, payload):
+    expected = client.post("/analyze", json=payload)
+    response = post_json(asgi.app, "/analyze", payload)
+    assert response["status"] == expected.status_code
+    assert json.loads(response["body"]) == expected.get_json()
+
+
+def test_batch_streams_lines_in_chunks(asgi, client):
+    payload = {"job_description": "Python, Docker and AWS",
+               "candidates": [["Python"] if index % 2 else ["Docker", "AWS"] for index in range(600)]}
+    response = post_json(asgi.app, "/analyze/batch", payload)
+    assert response["status"] == 200
+    assert response["chunks"] == 3
+    lines = [json.loads(line) for line in response["body"].decode().splitlines()]
+    expected = client.post("/analyze/batch", json=payload).get_data(as_text=True)
+    assert lines == [json.loads(line) for line in expected.splitlines()]
+
+
+def test_wsgi_write_callable_is_sent_first(asgi):
+    def legacy_app(environ, start_response):
+        write = start_response("200 OK", [("Content-Type", "text/plain")])
+        write(b"hello ")
+        return [b"world"]
+
+    response = call(asgi.AsyncApp(legacy_app), "GET", "/legacy")
+    assert (response["status"], response["body"]) == (200, b"hello world")
@@ -0,0 +1,52 @@
+import pytest
+
+from services.scoring import SCORING_MODES
+
+JOB_DESCRIPTION = "We need Python, Docker, Kubernetes and AWS. Python experience is a must; Python daily."
+CANDIDATES = [
+    ["Python", "Docker"],
+    ["Java"],
+    ["Python", "Docker", "Kubernetes", "AWS"],
+    ["Docker"],
+    [],
+]
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_batch_matches_single_analysis(scoring_analyzer, scoring):
+    single = [scoring_analyzer.analyze_match(skills, JOB_DESCRIPTION, scoring=scoring) for skills in CANDIDATES]
+    ranked = list(scoring_analyzer.analyze_many(JOB_DESCRIPTION, CANDIDATES, scoring=scoring))
+
+    assert sorted(result["candidate_index"] for result in ranked) == list(range(len(CANDIDATES)))
+    assert [result["rank"] for result in ranked] == list(range(1, len(CANDIDATES) + 1))
+    scores = [result["score"] for result in ranked]
+    assert scores == sorted(scores, reverse=True)
+    for result in ranked:
+        expected = single[result["candidate_index"]]
+        assert result["score"] == pytest.approx(expected["score"])
+        assert result["matched_skills"] == expected["matched_skills"]
+        assert result["missing_skills"] == expected["missing_skills"]
+
+
+def test_batch_top_k(scoring_analyzer):
+    ranked = list(scoring_analyzer.analyze_many(JOB_DESCRIPTION, CANDIDATES, top_k=2))
+    assert [result["candidate_index"] for result in ranked] == [2, 0]
+
+
+@pytest.mark.parametrize("candidate", ["Python", 5, None, {"candidate_skills": "Python"},
+                                       {"candidate_skills": [1, 2]}])
+def test_batch_rejects_malformed_candidates(client, candidate):
+    response = client.post("/analyze/batch", json={"job_description": "Python and Docker",
+                                                   "candidates": [["Python"], candidate]})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_batch_ranks_candidates(client):
+    response = client.post("/analyze/batch", json={"job_description": "Python and Docker",
+                                                   "candidates": [["Python"], {"id": "b", "candidate_skills":
+                                                                               ["Python", "Docker"]}]})
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert [line.count('"candidate_id"') for line in lines] == [1, 1]
+    assert '"candidate_id":"b"' in lines[0].replace(" ", "")
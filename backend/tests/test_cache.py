@@ -0,0 +1,87 @@
+import pytest
+
+from benchmarks.synthetic import make_docx
+from services import resume_analyzer
+from services.resume_analyzer import ResumeAnalyzer
+from utils import cache
+from utils.cache import ExtractionCache, LRUCache, SQLiteCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.time and time.monotonic as seen by the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_bytes=30)
+    lru.set("a", 1, 10)
+    lru.set("b", 2, 10)
+    lru.set("c", 3, 10)
+    assert lru.get("a") == 1
+    lru.set("d", 4, 10)
+    assert lru.get("b") is None
+    assert [lru.get(key) for key in "acd"] == [1, 3, 4]
+    assert lru.current_bytes == 30
+    assert lru.evictions == 1
+
+
+def test_lru_skips_values_larger_than_the_bound():
+    lru = LRUCache(max_bytes=10)
+    lru.set("big", "x", 11)
+    assert lru.get("big") is None
+    assert lru.current_bytes == 0
+
+
+def test_lru_entries_expire(clock):
+    lru = LRUCache(max_bytes=100, ttl=60)
+    lru.set("a", 1, 10)
+    clock[0] += 59
+    assert lru.get("a") == 1
+    clock[0] += 2
+    assert lru.get("a") is None
+    assert lru.current_bytes == 0
+
+
+def test_sqlite_cache_round_trip_and_expiry(tmp_path, clock):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    disk.set("key", {"skills": ["Python"], "count": 2})
+    assert disk.get("key") == {"skills": ["Python"], "count": 2}
+    clock[0] += 61
+    assert disk.get("key") is None
+    assert disk.get("missing") is None
+
+
+def test_extraction_cache_tiers_and_versions(tmp_path):
+    path = str(tmp_path / "extractions.sqlite3")
+    matches = [(0, 0, 6), (3, 10, 16, 0.9)]
+    first = ExtractionCache(disk_path=path)
+    first.set(b"%PDF", ".pdf", "v1", ["Python", "Docker"], "Python Docker", matches)
+    assert first.get(b"%PDF", ".PDF", "v1") == (["Python", "Docker"], "Python Docker", matches)
+    assert first.get(b"%PDF", ".pdf", "v2") is None
+    assert first.get(b"%PDF-other", ".pdf", "v1") is None
+
+    # Another worker finds the entry on disk and then holds it in memory
+    second = ExtractionCache(disk_path=path)
+    assert second.get(b"%PDF", ".pdf", "v1") == (["Python", "Docker"], "Python Docker", matches)
+    assert second.get(b"%PDF", ".pdf", "v1") is not None
+    assert (second.disk_hits, second.memory_hits, second.misses) == (1, 1, 0)
+
+
+def test_analyzer_extracts_each_document_once(analyzer, monkeypatch):
+    calls = []
+    iter_text = resume_analyzer.iter_text_from_file
+    monkeypatch.setattr(resume_analyzer, "iter_text_from_file",
+                        lambda *args, **kwargs: calls.append(args[1]) or iter_text(*args, **kwargs))
+    cached = ResumeAnalyzer(taxonomy_manager=analyzer.taxonomy_manager, extraction_cache=ExtractionCache())
+    document = make_docx(["Python and Docker"])
+
+    first = cached.extract_resume(document, ".docx")
+    second = cached.extract_resume(document, ".docx")
+    assert calls == [".docx"]
+    assert second.skills == first.skills == ["Python", "Docker"]
+    assert second.evidence == first.evidence
+    assert cached.extraction_cache.memory_hits == 1
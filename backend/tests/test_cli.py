@@ -0,0 +1,83 @@
+import io
+import json
+import tarfile
+import zipfile
+
+from app import cli
+from app.cli import Checkpoint, iter_inputs
+from benchmarks.synthetic import make_resume_docx, make_resume_pdf
+
+
+def write_inputs(root):
+    """A directory of resumes, with a zip and a tar archive nested inside."""
+    pdf = make_resume_pdf(["Python", "Docker"], pages=1)
+    docx = make_resume_docx(["Kubernetes"], paragraphs=5)
+    (root / "a.pdf").write_bytes(pdf)
+    (root / "notes.txt").write_text("not a resume")
+    nested = root / "nested"
+    nested.mkdir()
+    with zipfile.ZipFile(nested / "batch.zip", "w") as archive:
+        archive.writestr("b.docx", docx)
+        # The same bytes as a.pdf under another name
+        archive.writestr("copy.pdf", pdf)
+    with tarfile.open(nested / "batch.tar.gz", "w:gz") as archive:
+        content = make_resume_pdf(["Go"], pages=1, seed=1)
+        info = tarfile.TarInfo("c.pdf")
+        info.size = len(content)
+        archive.addfile(info, io.BytesIO(content))
+
+
+def ingest(path, output, *extra):
+    return cli.main(["ingest", str(path), "--output", str(output), "--workers", "1", "--quiet",
+                     "--snapshot-dir", str(output.parent / "snapshots"), *extra])
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_iter_inputs_walks_directories_and_archives(tmp_path):
+    write_inputs(tmp_path)
+    sources = [item.source for item in iter_inputs(str(tmp_path))]
+    assert [source.split(str(tmp_path))[-1] for source in sources] == [
+        "/a.pdf", "/notes.txt", "/nested/batch.tar.gz:c.pdf", "/nested/batch.zip:b.docx",
+        "/nested/batch.zip:copy.pdf",
+    ]
+
+
+def test_checkpoint_reloads_added_hashes(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    checkpoint = Checkpoint(path)
+    checkpoint.add(["aa", "bb"])
+    checkpoint.close()
+    assert Checkpoint(path).hashes == {"aa", "bb"}
+
+
+def test_ingest_writes_each_file_once_and_resumes(tmp_path, capsys):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    write_inputs(inputs)
+    output = tmp_path / "skills.jsonl"
+
+    assert ingest(inputs, output) == 0
+    records = read_records(output)
+    # notes.txt is ignored and copy.pdf is a duplicate of a.pdf
+    assert {record["source"].split("/")[-1]: sorted(record["skills"]) for record in records} == {
+        "a.pdf": ["Docker", "Python"], "batch.tar.gz:c.pdf": ["Go"], "batch.zip:b.docx": ["Kubernetes"],
+    }
+    assert all(record["error"] is None and "text" not in record for record in records)
+    assert "Ingested 3 files" in capsys.readouterr().out
+
+    # A second run finds every file in the checkpoint and writes nothing
+    assert ingest(inputs, output) == 0
+    assert len(read_records(output)) == 3
+    assert "Ingested 0 files" in capsys.readouterr().out
+
+
+def test_ingest_records_unreadable_files_as_errors(tmp_path):
+    (tmp_path / "broken.pdf").write_bytes(b"%PDF-1.4 not really")
+    output = tmp_path / "skills.jsonl"
+    assert ingest(tmp_path / "broken.pdf", output, "--text") == 0
+    [record] = read_records(output)
+    assert record["format"] == "pdf" and record["skills"] == [] and record["error"]
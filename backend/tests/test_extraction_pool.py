@@ -0,0 +1,45 @@
+import time
+import types
+
+import pytest
+
+from benchmarks.synthetic import make_docx
+from utils import extraction_pool, extraction_worker
+from utils.extraction_pool import ExtractionPool, ExtractionTimeoutError
+
+
+def stall_or_extract(file_content, file_extension, options):
+    """Worker task that never finishes on b"stall" and extracts anything else."""
+    if file_content == b"stall":
+        time.sleep(3600)
+    return extraction_worker.extract_text(file_content, file_extension, options)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Workers import this module to find the task, just as they import extraction_worker
+    monkeypatch.setattr(extraction_pool, "extraction_worker", types.SimpleNamespace(extract_text=stall_or_extract))
+    pool = ExtractionPool(max_workers=1, max_queue=1, timeout=1.0)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def wait_for_idle(pool, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while pool.pending_jobs and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return pool.pending_jobs
+
+
+def test_timed_out_job_is_stopped_and_frees_its_slot(pool):
+    document = make_docx(["Python"])
+    assert "Python" in pool.extract_text(document, ".docx", timeout=30.0)
+    workers = list(pool._executor._processes.values())
+
+    with pytest.raises(ExtractionTimeoutError):
+        pool.extract_text(b"stall", ".pdf")
+    assert wait_for_idle(pool) == 0
+    assert not any(worker.is_alive() for worker in workers)
+
+    # The only slot is free again and a fresh pool serves the next job
+    assert "Python" in pool.extract_text(document, ".docx", timeout=30.0)
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from services.taxonomy import DEFAULT_ALIASES_PATH, DEFAULT_SKILLS_PATH, TaxonomyManager
+from utils.flat_matcher import FlatSkillMatcher
+
+FILLER = "built and shipped services with the team, then wrote docs.".split()
+
+
+@pytest.fixture(scope="module")
+def mapped(tmp_path_factory):
+    snapshot_dir = str(tmp_path_factory.mktemp("snapshots"))
+    return TaxonomyManager(DEFAULT_SKILLS_PATH, DEFAULT_ALIASES_PATH, snapshot_dir=snapshot_dir, mapped=True).get()
+
+
+@pytest.fixture(scope="module")
+def corpus(matcher):
+    rng = random.Random(1)
+    names = list(matcher.skills) + ["K8s", "sklearn", "ASP.NET Core"]
+    return [
+        " ".join(rng.choice(names) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(60))
+        for _ in range(20)
+    ]
+
+
+def test_mapped_taxonomy_matches_like_compiled_one(mapped, matcher, corpus):
+    assert isinstance(mapped.matcher, FlatSkillMatcher)
+    assert list(mapped.matcher.skills) == list(matcher.skills)
+    for text in corpus:
+        assert list(mapped.matcher.iter_matches(text)) == list(matcher.iter_matches(text))
+
+
+@pytest.mark.parametrize("query", ["find_skill_ids", "count_skill_ids", "find_skills", "find_skills_by_category"])
+def test_shared_queries_agree(mapped, matcher, corpus, query):
+    for text in corpus:
+        assert getattr(mapped.matcher, query)(text) == getattr(matcher, query)(text)
+
+
+def test_queries_follow_iter_matches(matcher):
+    text = "Docker, then Python and docker again; K8s."
+    assert matcher.find_skill_ids(text) == [matcher.skill_id(name) for name in ("Docker", "Python", "Kubernetes")]
+    assert matcher.count_skill_ids(text) == {
+        matcher.skill_id("Docker"): 2, matcher.skill_id("Python"): 1, matcher.skill_id("Kubernetes"): 1
+    }
+    assert matcher.find_skills_by_category("Docker and Python") == {
+        "devops_tools": ["Docker"], "programming_languages": ["Python"]
+    }
@@ -0,0 +1,79 @@
+import pytest
+
+from benchmarks.synthetic import make_docx
+from services.resume_analyzer import ResumeAnalyzer
+from utils.fuzzy_matcher import FuzzyMatcher, allowed_distance, edit_distance
+
+
+@pytest.fixture(scope="module")
+def fuzzy(analyzer):
+    return analyzer.taxonomy.fuzzy_matcher
+
+
+def skill(matcher, found):
+    return None if found is None else matcher.skills[found[0]]
+
+
+def test_typos_resolve_to_the_skill(fuzzy, matcher):
+    assert skill(matcher, fuzzy.lookup("kubernets")) == "Kubernetes"
+    assert fuzzy.lookup("kubernets")[1] < 1.0
+
+
+def test_words_split_apart_resolve_to_the_skill(fuzzy, matcher):
+    [(skill_id, start, end, confidence)] = fuzzy.iter_matches("Ran Postgre SQL in production")
+    assert matcher.skills[skill_id] == "PostgreSQL"
+    assert (start, end) == (4, 15)
+
+
+@pytest.mark.parametrize("text", ["Vue js", "VueJS", "vue-js"])
+def test_dotted_skill_variants_resolve_to_the_skill(fuzzy, matcher, text):
+    assert [matcher.skills[match[0]] for match in fuzzy.iter_matches(text)] == ["Vue.js"]
+
+
+@pytest.mark.parametrize("word", ["the", "principles", "ubernetes", "dockr"])
+def test_ordinary_and_distant_words_do_not_match(fuzzy, word):
+    assert fuzzy.lookup(word) is None
+
+
+def test_exact_matches_are_not_repeated(fuzzy, matcher):
+    text = "Python and Kubernets"
+    assert [match[:3] for match in fuzzy.iter_matches(text, list(matcher.iter_matches(text)))] == [
+        (matcher.skill_id("Kubernetes"), 11, 20)
+    ]
+
+
+def test_confidence_falls_with_the_edits_needed(fuzzy, matcher):
+    joined = fuzzy.lookup("Postgre SQL")
+    typo = fuzzy.lookup("javscript")
+    transposed = fuzzy.lookup("kuberentes")
+    assert [skill(matcher, found) for found in (joined, typo, transposed)] == ["PostgreSQL", "JavaScript", "Kubernetes"]
+    assert 1.0 > joined[1] > typo[1] and typo[1] == transposed[1]
+
+
+def test_typos_can_be_turned_off():
+    fuzzy = FuzzyMatcher([("Kubernetes", 0)], max_distance=0)
+    assert fuzzy.lookup("kubernets") is None
+    assert fuzzy.lookup("kuber netes")[0] == 0
+
+
+def test_ties_are_left_unmatched():
+    fuzzy = FuzzyMatcher([("Kotlinx", 0), ("Kotliny", 1)])
+    assert fuzzy.lookup("kotlinz") is None
+    assert fuzzy.lookup("kotlinx")[0] == 0
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("kubernetes", "kubernets", 2) == 1
+    assert edit_distance("kubernetes", "docker", 2) > 2
+    assert allowed_distance(3) <= allowed_distance(12)
+
+
+def test_fuzzy_matching_is_opt_in(analyzer):
+    document = make_docx(["Deployed services on Kubernets with Postgre SQL and Python."])
+    assert analyzer.extract_resume(document, ".docx").skills == ["Python"]
+
+    fuzzy_analyzer = ResumeAnalyzer(taxonomy_manager=analyzer.taxonomy_manager, fuzzy_matching=True)
+    extraction = fuzzy_analyzer.extract_resume(document, ".docx")
+    assert extraction.skills == ["Kubernetes", "PostgreSQL", "Python"]
+    span = extraction.evidence[0]["spans"][0]
+    assert (span["text"], span["confidence"]) == ("Kubernets", 0.9)
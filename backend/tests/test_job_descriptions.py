@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from services.job_descriptions import JobDescriptionStore, job_description_id
+from utils import cache
+from utils.cache import SQLiteCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.time as seen by the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def test_sqlite_cache_deletes_expired_rows_on_write(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    disk = SQLiteCache(path, ttl=60)
+    for index in range(50):
+        disk.set(f"old-{index}", index)
+    clock[0] += 61
+    # A new process prunes on its first write
+    SQLiteCache(path, ttl=60).set("new", 1)
+    assert rows(path) == 1
+
+
+def test_sqlite_cache_keeps_newest_max_entries(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    disk = SQLiteCache(path, max_entries=10)
+    for index in range(101):
+        clock[0] += 1
+        disk.set(f"key-{index}", index)
+    assert rows(path) == 10
+    assert disk.get("key-100") == 100
+    assert disk.get("key-90") is None
+
+
+def test_job_description_store_is_bounded(tmp_path, clock):
+    path = str(tmp_path / "jds.sqlite3")
+    store = JobDescriptionStore(path, ttl=60, max_entries=5)
+    jd_id = store.register("Need  Python and Docker")
+    assert jd_id == job_description_id("need python and DOCKER")
+    assert store.get(jd_id) == "Need  Python and Docker"
+    # The store prunes on its first write and then every 100 writes
+    for index in range(100):
+        clock[0] += 1
+        store.register(f"job description {index}")
+    assert rows(path) == 5
+    assert store.get(jd_id) is None
+
+
+def test_registered_job_descriptions_expire(tmp_path, clock):
+    store = JobDescriptionStore(str(tmp_path / "jds.sqlite3"), ttl=60)
+    jd_id = store.register("Need Python")
+    clock[0] += 61
+    assert store.get(jd_id) is None
+
+
+def test_unknown_jd_id_is_not_found(client):
+    response = client.post("/analyze", json={"candidate_skills": ["Python"], "jd_id": "0" * 16})
+    assert response.status_code == 404
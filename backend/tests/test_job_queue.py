@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from services import job_queue
+from services.job_queue import DONE, FAILED, QUEUED, JobQueueFullError, JobRunner, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_job_runs_to_done(store):
+    runner = JobRunner(store)
+    stages = []
+
+    def job(report, value):
+        report(0.5, "halfway")
+        stages.append(store.get(job_id)["stage"])
+        return {"value": value}
+
+    job_id = runner.submit(job, 42)
+    final = runner.wait(job_id, timeout=5)
+    assert stages == ["halfway"]
+    assert final["status"] == DONE
+    assert final["progress"] == 1.0
+    assert final["result"] == {"value": 42}
+    assert runner.pending_jobs == 0
+
+
+def test_failing_job_records_its_error(store):
+    runner = JobRunner(store)
+
+    def job(report):
+        raise ValueError("unreadable document")
+
+    final = runner.wait(runner.submit(job), timeout=5)
+    assert final["status"] == FAILED
+    assert final["error"] == "unreadable document"
+    assert runner.pending_jobs == 0
+
+
+def test_watch_ends_with_the_finished_state(store):
+    runner = JobRunner(store)
+    job_id = runner.submit(lambda report: {"ok": True})
+    states = list(runner.watch(job_id, timeout=5, poll_interval=0.01))
+    assert states[-1]["status"] == DONE
+
+
+def test_watch_resumes_after_a_seen_state(store):
+    runner = JobRunner(store)
+    job_id = runner.submit(lambda report: {"ok": True})
+    final = runner.wait(job_id, timeout=5)
+    # A caller that already saw the finished state gets nothing, at once
+    assert list(runner.watch(job_id, timeout=5, since=final["updated_at"])) == []
+    assert list(runner.watch(job_id, timeout=5, since=final["updated_at"] - 1)) == [final]
+
+
+def test_job_events_reconnect_and_stop(client):
+    from app.main import job_runner
+
+    job_id = job_runner.submit(lambda report: {"ok": True})
+    final = job_runner.wait(job_id, timeout=5)
+
+    body = client.get(f"/jobs/{job_id}/events").get_data(as_text=True)
+    assert body.startswith("retry: ")
+    assert f"id: {final['updated_at']!r}\nevent: done\n" in body
+
+    response = client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": repr(final["updated_at"])})
+    assert response.status_code == 204
+
+
+def test_long_poll_is_capped(client, monkeypatch):
+    from app import main
+
+    job_id = main.job_runner.submit(lambda report: threading.Event().wait(1))
+    monkeypatch.setattr(main, "max_poll_seconds", 0.2)
+    response = client.get(f"/jobs/{job_id}?wait=60")
+    assert response.status_code == 200
+    assert response.get_json()["status"] != DONE
+
+
+def test_queue_is_bounded(store):
+    runner = JobRunner(store, max_workers=1, max_pending=1)
+    release = threading.Event()
+    job_id = runner.submit(lambda report: release.wait(5))
+    with pytest.raises(JobQueueFullError):
+        runner.submit(lambda report: None)
+    release.set()
+    assert runner.wait(job_id, timeout=5)["status"] == DONE
+    assert runner.pending_jobs == 0
+
+
+def test_failed_submission_releases_its_slot(store):
+    runner = JobRunner(store, max_pending=1)
+
+    class ShutDownExecutor:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+    runner._get_executor = ShutDownExecutor
+    with pytest.raises(RuntimeError):
+        runner.submit(lambda report: None)
+    assert runner.pending_jobs == 0
+    with pytest.raises(RuntimeError):
+        runner.submit(lambda report: None)
+
+
+def test_jobs_of_exited_processes_fail(store):
+    # Jobs registered by a worker process that has since exited
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from services.job_queue import JobStore\n"
+        "store = JobStore(sys.argv[2]); print(store.create()); print(store.create())\n"
+    )
+    orphaned = subprocess.run(
+        [sys.executable, "-c", script, os.path.dirname(os.path.dirname(job_queue.__file__)), store.path],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    assert store.get(orphaned[0])["status"] == FAILED
+    JobRunner(store)
+    assert store.get(orphaned[1])["status"] == FAILED
+    assert "restart" in store.get(orphaned[1])["error"]
+
+
+def test_stale_jobs_fail_after_max_age(store):
+    job_id = store.create()
+    assert store.fail_orphaned(max_age=3600) == 0
+    assert store.get(job_id)["status"] == QUEUED
+    assert store.fail_orphaned(max_age=-1) == 1
+    assert store.get(job_id)["status"] == FAILED
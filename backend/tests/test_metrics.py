@@ -0,0 +1,59 @@
+import os
+
+from utils.metrics import (
+    Histogram, Metrics, finish_request_timings, server_timing_header, start_request_timings
+)
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert (histogram.count, histogram.total) == (4, 56.5)
+
+
+def test_render_is_cumulative_and_labelled_by_pid():
+    metrics = Metrics(prefix="test")
+    metrics.observe_stage("extract", 0.003)
+    metrics.observe_stage("extract", 0.2)
+    metrics.observe_size("pages", 3)
+    metrics.count_error("upload", ValueError("bad"))
+    metrics.register_collector(lambda: {"cache_hits": 7})
+
+    lines = metrics.render().splitlines()
+    pid = os.getpid()
+    assert f'test_stage_seconds_bucket{{stage="extract",pid="{pid}",le="0.005"}} 1' in lines
+    assert f'test_stage_seconds_bucket{{stage="extract",pid="{pid}",le="+Inf"}} 2' in lines
+    assert f'test_input_size_count{{kind="pages",pid="{pid}"}} 1' in lines
+    assert f'test_errors_total{{stage="upload",type="ValueError",pid="{pid}"}} 1' in lines
+    assert f'test_cache_hits{{pid="{pid}"}} 7.0' in lines
+
+
+def test_request_timings_feed_the_server_timing_header():
+    metrics = Metrics()
+    metrics.observe_stage("outside", 1.0)
+    token = start_request_timings()
+    with metrics.timed("match"):
+        pass
+    metrics.observe_stage("match", 0.002)
+    timings = finish_request_timings(token)
+
+    assert [stage for stage, _ in timings] == ["match", "match"]
+    header = server_timing_header([("match", 0.001), ("match", 0.002)], 0.01)
+    assert header == "match;dur=3.00, total;dur=10.00"
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "# TYPE resume_analyzer_stage_seconds histogram" in response.get_data(as_text=True)
+
+
+def test_server_timing_header_is_opt_in(client, monkeypatch):
+    from app import main
+
+    assert "Server-Timing" not in client.get("/skills").headers
+    monkeypatch.setattr(main, "server_timing", True)
+    assert "total;dur=" in client.get("/skills").headers["Server-Timing"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from services.scoring import SCORING_MODES, SkillStats, WeightedScorer
+
+JOB_DESCRIPTION = "We need Python, Docker, Kubernetes and AWS. Python experience is a must; Python daily."
+CANDIDATES = [
+    ["Python", "Docker"],
+    ["Java"],
+    ["Python", "Docker", "Kubernetes", "AWS"],
+    ["Docker"],
+    [],
+]
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_full_and_empty_matches(scoring_analyzer, scoring):
+    assert scoring_analyzer.analyze_match(CANDIDATES[2], JOB_DESCRIPTION, scoring=scoring)["score"] == 100.0
+    assert scoring_analyzer.analyze_match(["Java"], JOB_DESCRIPTION, scoring=scoring)["score"] == 0.0
+
+
+def test_bm25_saturates_repeated_mentions(matcher):
+    scorer = WeightedScorer(SkillStats())
+    skill_ids = np.array([matcher.skill_id("Python"), matcher.skill_id("Docker")])
+    weights = scorer.weights(matcher, skill_ids, np.array([3, 1]), "bm25")
+    # A skill mentioned three times counts more, but less than three times as much
+    assert weights[1] < weights[0] < 3 * weights[1]
+
+
+def test_bm25_weighs_rare_skills_higher(matcher):
+    stats = SkillStats()
+    for index in range(20):
+        stats.add_document(f"resume-{index}", ["Python"] + (["Docker"] if index < 2 else []))
+    scorer = WeightedScorer(stats)
+    skill_ids = np.array([matcher.skill_id("Python"), matcher.skill_id("Docker")])
+    weights = scorer.weights(matcher, skill_ids, np.array([1, 1]), "bm25")
+    assert weights[1] > weights[0]
+
+
+def test_unknown_scoring_mode_is_rejected(matcher):
+    with pytest.raises(ValueError):
+        WeightedScorer(SkillStats()).weights(matcher, np.array([0]), np.array([1]), "cosine")
+
+
+def test_in_memory_stats_remember_a_bounded_number_of_documents():
+    stats = SkillStats(max_recent=3)
+    assert stats.add_document("a", ["Python"])
+    assert not stats.add_document("a", ["Python"])
+    for name in "bcd":
+        stats.add_document(name, ["Docker"])
+    assert len(stats._recent) == 3
+    # Forgotten documents count again
+    assert stats.add_document("a", ["Python"])
+    assert stats.snapshot()[:2] == ({"python": 2, "docker": 3}, 5)
+
+
+def test_idf_weights_are_cached_until_the_stats_change(matcher):
+    stats = SkillStats()
+    scorer = WeightedScorer(stats)
+    skill_ids = np.array([matcher.skill_id("Python")])
+    first = scorer.weights(matcher, skill_ids, np.array([1]), "tfidf")
+    assert scorer._idf_cache["tfidf"][0] == stats.version
+    stats.add_document("resume", ["Docker"])
+    assert scorer.weights(matcher, skill_ids, np.array([1]), "tfidf")[0] > first[0]
+    assert scorer._idf_cache["tfidf"][0] == stats.version
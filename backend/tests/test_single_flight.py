@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import stat
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_coalesces_within_process_by_default():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", compute, shared=True)))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.local_followers < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["result"] * 4 and calls == [1]
+    assert flight.stats()["shared"] is False
+
+
+def test_shared_file_is_private(tmp_path):
+    directory = tmp_path / "flights"
+    SingleFlight(str(directory / "single-flight.sqlite3"))
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(directory / "single-flight.sqlite3").st_mode) == 0o600
+
+    open_directory = tmp_path / "open"
+    open_directory.mkdir()
+    open_directory.chmod(0o777)
+    with pytest.raises(PermissionError):
+        SingleFlight(str(open_directory / "single-flight.sqlite3"))
+
+
+def wait_behind_owner(path, reload):
+    """Run one shared call in an owner while a second instance waits for it."""
+    # Two instances on one file claim keys like two worker processes
+    owner, waiter = SingleFlight(path, poll_interval=0.001), SingleFlight(path, poll_interval=0.001)
+    started, blocked, release = threading.Event(), threading.Event(), threading.Event()
+    claim = waiter._claim
+
+    def claim_or_block(key):
+        claimed = claim(key)
+        if not claimed:
+            blocked.set()
+        return claimed
+
+    waiter._claim = claim_or_block
+
+    def extract():
+        started.set()
+        release.wait(5)
+        return "extracted text"
+
+    thread = threading.Thread(target=owner.do, args=("key", extract), kwargs={"shared": True})
+    thread.start()
+    started.wait(5)
+    results = []
+    waiting = threading.Thread(target=lambda: results.append(
+        waiter.do("key", lambda: "computed again", shared=True, reload=reload)
+    ))
+    waiting.start()
+    blocked.wait(5)
+    release.set()
+    thread.join()
+    waiting.join()
+    return results[0], waiter
+
+
+def test_shared_waiters_reload_instead_of_reading_the_file(tmp_path):
+    path = str(tmp_path / "flights" / "single-flight.sqlite3")
+    result, waiter = wait_behind_owner(path, reload=lambda: "cached text")
+    assert result == "cached text" and waiter.shared_followers == 1
+
+    with sqlite3.connect(path) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        assert tables == ["flights"]
+        assert conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 0
+
+
+def test_shared_waiters_compute_when_nothing_to_reload(tmp_path):
+    # E.g. the owner failed, or the extraction cache is per worker
+    result, waiter = wait_behind_owner(str(tmp_path / "single-flight.sqlite3"), reload=lambda: None)
+    assert result == "computed again" and waiter.shared_followers == 0
@@ -0,0 +1,113 @@
+import random
+import re
+
+import pytest
+
+from services.taxonomy import DEFAULT_SKILLS_PATH, load_source
+from utils.skill_matcher import SkillMatcher, normalize_tokens
+from utils.text_preprocessor import extract_skills_from_text, get_stopwords
+
+FILLER = ("experienced engineer built reliable services team delivered projects on time "
+          "improved latency customers reporting platform mentoring").split()
+
+
+def baseline_tokens(text):
+    """The clean_text, remove_stopwords and word_tokenize chain SkillMatcher replaced."""
+    text = re.sub(r'\s+', ' ', re.sub(r'[^a-zA-Z0-9\s]', ' ', text.lower())).strip()
+    stopwords = get_stopwords()
+    text = ' '.join(word for word in re.findall(r'\w+|[^\w\s]', text) if word not in stopwords)
+    return re.findall(r'\w+|[^\w\s]', text)
+
+
+def baseline_extract(text, skills_database):
+    """The token-at-a-time scan extract_skills_from_text used before SkillMatcher."""
+    all_skills = {skill.lower() for skills in skills_database.values() for skill in skills}
+    found = []
+    for token in baseline_tokens(text):
+        if token.lower() in all_skills:
+            for skills in skills_database.values():
+                for skill in skills:
+                    if skill.lower() == token.lower():
+                        found.append(skill)
+                        break
+    unique = []
+    for skill in found:
+        if skill not in unique:
+            unique.append(skill)
+    return unique
+
+
+def single_word_skills(skills_database):
+    """Skills the baseline could match: one alphanumeric word that is not a stopword."""
+    stopwords = get_stopwords()
+    return sorted({
+        skill for skills in skills_database.values() for skill in skills
+        if skill.isalnum() and skill.isascii() and skill.lower() not in stopwords
+    })
+
+
+def golden_corpus(skills, documents=50, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        words = []
+        for _ in range(rng.randint(20, 80)):
+            word = rng.choice(skills) if rng.random() < 0.2 else rng.choice(FILLER)
+            words.append(word.upper() if rng.random() < 0.1 else word)
+        corpus.append(" ".join(words) + ".")
+    return corpus
+
+
+@pytest.fixture(scope="module")
+def skills_database():
+    return load_source(DEFAULT_SKILLS_PATH)[0]
+
+
+def test_single_word_skills_match_baseline(skills_database):
+    matcher = SkillMatcher(skills_database)
+    for text in golden_corpus(single_word_skills(skills_database)):
+        assert matcher.find_skills(text) == baseline_extract(text, skills_database)
+
+
+def test_matches_multi_word_and_punctuated_skills(skills_database):
+    text = "Built with Spring Boot, Ruby on Rails, C++, Vue.js and GitHub Actions; also Python."
+    assert extract_skills_from_text(text, skills_database) == [
+        "Spring Boot", "Ruby on Rails", "C++", "Vue.js", "GitHub Actions", "Python"
+    ]
+
+
+def test_longest_alias_wins(skills_database):
+    matcher = SkillMatcher(skills_database)
+    assert matcher.find_skills("Spring Boot services") == ["Spring Boot"]
+
+
+def test_match_offsets_point_into_text(skills_database):
+    matcher = SkillMatcher(skills_database)
+    text = "Ops: Docker and  GitHub   Actions, then C++."
+    found = [(matcher.skills[skill_id], text[start:end]) for skill_id, start, end in matcher.iter_matches(text)]
+    assert found == [("Docker", "Docker"), ("GitHub Actions", "GitHub   Actions"), ("C++", "C++")]
+
+
+def test_normalize_tokens_keeps_plus_and_hash():
+    assert normalize_tokens("C++, C# and F#.") == ["c++", "c#", "and", "f#"]
+
+
+def test_normalize_tokens_keeps_dots_inside_words():
+    assert normalize_tokens("ASP.NET and .NET 8 on Fly.io, see Monday.com. Python 3.11.") == [
+        "asp.net", "and", ".net", "8", "on", "fly.io", "see", "monday.com", "python", "3.11"
+    ]
+
+
+def test_dotted_skills_match_whole(skills_database):
+    matcher = SkillMatcher(skills_database)
+    text = "Shipped ASP.NET Core APIs on Fly.io, planned in Monday.com, chat on Rocket.Chat."
+    assert matcher.find_skills(text) == ["ASP.NET", "Fly.io", "Monday.com", "Rocket.Chat"]
+
+
+@pytest.mark.parametrize("text", [
+    "Migrated the .NET monolith, then the asp net pages.",
+    "Announced on monday. Com tools were fly. Io latency was fine.",
+    "Installed guard rails on the scikit repo mirror.",
+])
+def test_pieces_of_dotted_skills_do_not_match(matcher, text):
+    assert matcher.find_skills(text) == []
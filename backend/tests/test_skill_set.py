@@ -0,0 +1,58 @@
+import pytest
+
+from services.scoring import SCORING_MODES, encode_candidates
+from utils.skill_set import SkillSet
+
+JOB_DESCRIPTION = "We need Python, Docker, Kubernetes and AWS. Python experience is a must; Python daily."
+CANDIDATES = [["Python", "Docker"], ["Java"], ["Python", "Docker", "Kubernetes", "AWS"], []]
+
+
+def test_set_operations():
+    a, b = SkillSet.from_ids([0, 3, 9]), SkillSet.from_ids([3, 4])
+    assert (a & b).ids() == [3]
+    assert (a | b).ids() == [0, 3, 4, 9]
+    assert (a - b).ids() == [0, 9]
+    assert 9 in a and 4 not in a and len(a) == 3
+    assert not SkillSet() and a == SkillSet.from_ids([9, 0, 3]) and hash(a) == hash(SkillSet(a.bits))
+
+
+def test_serialized_forms_round_trip():
+    skills = SkillSet.from_ids([1, 8, 200])
+    assert len(skills.to_bytes()) == 26
+    assert SkillSet.from_bytes(skills.to_bytes(32)) == skills
+    assert SkillSet.from_base64(skills.to_base64(), size=201) == skills
+
+
+@pytest.mark.parametrize("build", [
+    lambda: SkillSet(-1),
+    lambda: SkillSet.from_ids([True]),
+    lambda: SkillSet.from_ids([5], size=5),
+    lambda: SkillSet.from_base64(SkillSet.from_ids([5]).to_base64(), size=5),
+    lambda: SkillSet.from_base64("not base64!"),
+])
+def test_invalid_sets_are_rejected(build):
+    with pytest.raises(ValueError):
+        build()
+
+
+def test_names_follow_the_vocabulary(matcher):
+    skills = SkillSet.from_names(["docker", "Python", "Nonexistent skill"], matcher)
+    assert sorted(skills.names(matcher.skills)) == ["Docker", "Python"]
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_skill_ids_score_like_names(scoring_analyzer, scoring):
+    matcher = scoring_analyzer.taxonomy.matcher
+    for skills in CANDIDATES:
+        by_name = scoring_analyzer.analyze_match(skills, JOB_DESCRIPTION, scoring=scoring)
+        by_id = scoring_analyzer.analyze_match(SkillSet.from_names(skills, matcher), JOB_DESCRIPTION, scoring=scoring)
+        assert by_id["score"] == by_name["score"]
+        assert by_id["matched_skill_ids"] == [matcher.skill_id(skill) for skill in by_name["matched_skills"]]
+
+
+def test_encode_candidates_accepts_names_and_skill_sets(matcher):
+    names = ["Docker", "Python", "Nonexistent skill"]
+    indptr, indices = encode_candidates(matcher, [names, SkillSet.from_names(names, matcher), []])
+    assert list(indptr) == [0, 2, 4, 4]
+    assert sorted(indices[0:2]) == sorted(indices[2:4]) == sorted([matcher.skill_id("Docker"),
+                                                                   matcher.skill_id("Python")])
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from services import taxonomy
+from services.taxonomy import (
+    DEFAULT_ALIASES_PATH, DEFAULT_SKILLS_PATH, TaxonomyError, TaxonomyManager, load_snapshot
+)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    skills_path = str(tmp_path / "skills.json")
+    aliases_path = str(tmp_path / "aliases.json")
+    shutil.copy(DEFAULT_SKILLS_PATH, skills_path)
+    shutil.copy(DEFAULT_ALIASES_PATH, aliases_path)
+    return skills_path, aliases_path
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    return str(tmp_path / "snapshots")
+
+
+def snapshot_path(manager):
+    return os.path.join(manager.snapshot_dir, f"taxonomy-{manager.current.version}.bin")
+
+
+def test_snapshot_dir_is_created_private(sources, snapshot_dir):
+    manager = TaxonomyManager(*sources, snapshot_dir=snapshot_dir)
+    assert os.stat(snapshot_dir).st_mode & 0o777 == 0o700
+    assert os.path.exists(snapshot_path(manager))
+
+
+def test_shared_snapshot_dir_is_refused(sources, snapshot_dir):
+    os.makedirs(snapshot_dir)
+    os.chmod(snapshot_dir, 0o777)
+    manager = TaxonomyManager(*sources, snapshot_dir=snapshot_dir, mapped=True)
+    assert manager.snapshot_dir is None and not manager.mapped
+    assert os.listdir(snapshot_dir) == []
+
+
+def test_tampered_snapshot_is_rejected_and_recompiled(sources, snapshot_dir):
+    path = snapshot_path(TaxonomyManager(*sources, snapshot_dir=snapshot_dir))
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(TaxonomyError, match="checksum"):
+        load_snapshot(path)
+
+    manager = TaxonomyManager(*sources, snapshot_dir=snapshot_dir, mapped=True)
+    assert manager.get().matcher.find_skills("Python") == ["Python"]
+    load_snapshot(path)
+
+
+def test_snapshot_must_hold_the_version_in_its_name(sources, snapshot_dir):
+    path = snapshot_path(TaxonomyManager(*sources, snapshot_dir=snapshot_dir))
+    with pytest.raises(TaxonomyError, match="expected 0123456789abcdef"):
+        load_snapshot(path, expected_version="0123456789abcdef")
+
+
+def test_reload_compiles_in_the_background(sources, snapshot_dir, monkeypatch):
+    skills_path, aliases_path = sources
+    manager = TaxonomyManager(skills_path, aliases_path, snapshot_dir=snapshot_dir, reload_interval=0.01)
+    before = manager.get()
+    compiling = threading.Event()
+    compile_taxonomy = taxonomy.compile_taxonomy
+    monkeypatch.setattr(taxonomy, "compile_taxonomy",
+                        lambda *args: compiling.wait(10) and compile_taxonomy(*args))
+    with open(skills_path) as f:
+        skills = json.load(f)
+    skills["languages_new"] = ["Zig"]
+    with open(skills_path, "w") as f:
+        json.dump(skills, f)
+    time.sleep(0.02)
+
+    # The request that notices the change is served the old version at once
+    assert manager.get() is before
+    compiling.set()
+    deadline = time.monotonic() + 10
+    while manager.current is before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.get().matcher.find_skills("Zig and Python") == ["Zig", "Python"]
+    assert manager.reload_count == 1
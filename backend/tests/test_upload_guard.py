@@ -0,0 +1,101 @@
+import io
+import zipfile
+
+import pytest
+
+from benchmarks.synthetic import make_docx, make_resume_pdf
+from services.resume_analyzer import ResumeAnalyzer
+from utils.upload_guard import DocumentTooLargeError, UploadGuard, pdf_page_count
+
+
+def zip_package(entries):
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as package:
+        for name, data in entries:
+            package.writestr(name, data)
+    return output.getvalue()
+
+
+@pytest.fixture(scope="module")
+def long_pdf():
+    return make_resume_pdf(["Python", "Docker"], pages=30)
+
+
+def test_pdf_page_count(long_pdf):
+    assert pdf_page_count(long_pdf) == 30
+    assert pdf_page_count(b"not a pdf") is None
+
+
+def test_pdf_with_too_many_pages_is_rejected(long_pdf):
+    guard = UploadGuard(max_pages=20, fast_pages=10)
+    with pytest.raises(DocumentTooLargeError, match="30 pages"):
+        guard.inspect(long_pdf, ".pdf")
+    assert guard.stats() == {"rejected": 1, "degraded": 0}
+
+
+def test_long_pdf_is_degraded(long_pdf):
+    guard = UploadGuard(max_pages=50, fast_pages=10)
+    inspection = guard.inspect(long_pdf, ".PDF")
+    assert (inspection.pages, inspection.degraded) == (30, True)
+    assert not guard.inspect(make_resume_pdf(["Python"], pages=2), ".pdf").degraded
+    assert guard.stats() == {"rejected": 0, "degraded": 1}
+
+
+def test_oversized_file_is_rejected():
+    with pytest.raises(DocumentTooLargeError, match="larger than 100 bytes"):
+        UploadGuard(max_bytes=100).inspect(b"x" * 101, ".docx")
+
+
+def test_docx_zip_bomb_is_rejected():
+    bomb = zip_package([("word/document.xml", b"<" + b"a" * (20 * 1024 * 1024) + b">")])
+    assert len(bomb) < 100 * 1024
+    with pytest.raises(DocumentTooLargeError, match="compressed"):
+        UploadGuard().inspect(bomb, ".docx")
+    with pytest.raises(DocumentTooLargeError, match="expands to"):
+        UploadGuard(max_uncompressed_bytes=1024 * 1024, max_compression_ratio=10 ** 6).inspect(bomb, ".docx")
+
+
+def test_docx_with_too_many_entries_is_rejected():
+    package = zip_package([(f"word/media/{index}.xml", b"<a/>") for index in range(20)])
+    with pytest.raises(DocumentTooLargeError, match="20 entries"):
+        UploadGuard(max_zip_entries=10).inspect(package, ".docx")
+
+
+def test_ordinary_documents_pass():
+    guard = UploadGuard()
+    docx = make_docx(["Python and Docker"] * 200)
+    assert guard.inspect(docx, ".docx").uncompressed_bytes > 0
+    # Not a zip at all: left for extraction to report
+    assert guard.inspect(b"plain text", ".docx").uncompressed_bytes is None
+    assert guard.stats() == {"rejected": 0, "degraded": 0}
+
+
+def test_analyzer_applies_the_guard(analyzer, long_pdf):
+    guarded = ResumeAnalyzer(taxonomy_manager=analyzer.taxonomy_manager,
+                             upload_guard=UploadGuard(max_pages=50, fast_pages=5))
+    extraction = guarded.extract_resume(long_pdf, ".pdf")
+    assert max(span["page"] for item in extraction.evidence for span in item["spans"]) == 5
+
+    strict = ResumeAnalyzer(taxonomy_manager=analyzer.taxonomy_manager, upload_guard=UploadGuard(max_pages=20))
+    with pytest.raises(DocumentTooLargeError):
+        strict.extract_resume(long_pdf, ".pdf")
+
+
+def upload(client, name, data):
+    return client.post("/upload_resume", data={"file": (io.BytesIO(data), name)},
+                       content_type="multipart/form-data")
+
+
+def test_upload_limits(client):
+    assert upload(client, "cv.pdf", make_resume_pdf(["Python"], pages=2)).status_code == 200
+
+    response = upload(client, "long.pdf", make_resume_pdf(["Python"], pages=30))
+    assert response.status_code == 413
+    assert "30 pages" in response.get_json()["error"]
+
+    bomb = zip_package([("word/document.xml", b"<" + b"a" * (20 * 1024 * 1024) + b">")])
+    response = upload(client, "bomb.docx", bomb)
+    assert response.status_code == 413
+
+    response = upload(client, "huge.pdf", b"%PDF-1.4\n" + b"0" * (11 * 1024 * 1024))
+    assert response.status_code == 413
@@ -0,0 +1,44 @@
+import gc
+import os
+import runpy
+from types import SimpleNamespace
+
+import pytest
+
+from services.warmup import warm_up_analyzer
+from utils.metrics import metrics
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+
+def histograms():
+    return [line for line in metrics.render().splitlines() if "_stage_seconds" in line or "_input_size" in line]
+
+
+def test_warm_up_leaves_metrics_untouched(analyzer):
+    with metrics.timed("upload_resume"):
+        pass
+    before = histograms()
+    timings = warm_up_analyzer(analyzer)
+    assert {"stopwords", "taxonomy", "pdf", "docx", "analysis"} <= set(timings)
+    assert histograms() == before
+
+
+def test_failed_warm_up_still_reenables_gc(client, monkeypatch):
+    from app.main import analyzer_warm_up
+
+    def fail():
+        raise RuntimeError("warm-up failed")
+
+    monkeypatch.setattr(analyzer_warm_up, "run", fail)
+    monkeypatch.setenv("GUNICORN_PRELOAD", "true")
+    server = SimpleNamespace(cfg=SimpleNamespace(preload_app=True), log=SimpleNamespace(info=print))
+    try:
+        config = runpy.run_path(GUNICORN_CONF)
+        assert not gc.isenabled()
+        with pytest.raises(RuntimeError):
+            config["when_ready"](server)
+        assert gc.isenabled()
+    finally:
+        gc.enable()
+        gc.unfreeze()